@@ -1,52 +1,816 @@
 """
 Модуль для ведения дневника тренировок с использованием графического интерфейса на основе Tkinter.
+
+NumPy и Plotly загружаются не при запуске, а в фоновом потоке после появления окна (или при
+первом использовании), поэтому окно появляется быстрее. Отчет о длительности этапов запуска
+выводится при запуске с флагом --startup-timing. Флаг --diagnostics включает замеры времени
+горячих участков и окно диагностики, а --profile-dir — профилирование фоновых операций под cProfile.
 """
 
-import csv
-import json
-import tkinter as tk
-from datetime import datetime
-from tkinter import ttk, Toplevel, messagebox, filedialog
+import time
+
+# Момент начала запуска приложения для отчета о длительности этапов запуска
+STARTUP_STARTED = time.perf_counter()
+
+import argparse  # noqa: E402
+import sys  # noqa: E402
+import threading  # noqa: E402
+import tkinter as tk  # noqa: E402
+from datetime import datetime  # noqa: E402
+from tkinter import ttk, Toplevel, messagebox, filedialog  # noqa: E402
+
+# Импорт виджета календаря (календари входят в главное окно, поэтому он нужен сразу)
+from tkcalendar import DateEntry  # noqa: E402
+
+# Модель записи, хранилище журнала тренировок и репозиторий записей в памяти
+# (модули journal_analytics и journal_charts, использующие NumPy и Plotly, загружаются позже)
+from journal_backends import open_storage  # noqa: E402
+from journal_binary import BINARY_EXTENSION  # noqa: E402
+from journal_cache import LRUCache  # noqa: E402
+from journal_core import (LEGACY_DATA_FILE, day_range, export_records, import_records, journal_path,  # noqa: E402
+                          stats_table)
+from journal_files import available_compressions  # noqa: E402
+from journal_model import (DAY_FORMAT, SECONDS_PER_DAY, TrainingRecord, datetime_to_timestamp,  # noqa: E402
+                           format_timestamp, format_weight, parse_repetitions, parse_weight)
+from journal_profiling import instrumentation, span  # noqa: E402
+from journal_progression import ExerciseProgress, describe_records  # noqa: E402
+from journal_repository import TrainingRepository  # noqa: E402
+from journal_stats import PERIOD_DAY, PERIOD_MONTH, PERIOD_WEEK  # noqa: E402
+from journal_tasks import TaskScheduler  # noqa: E402
+
+# Момент окончания импорта модулей, необходимых для появления окна
+IMPORTS_FINISHED = time.perf_counter()
+
+# Варианты группировки статистики по периодам
+STATS_PERIODS = {
+    "За все время": None,
+    "По дням": PERIOD_DAY,
+    "По неделям": PERIOD_WEEK,
+    "По месяцам": PERIOD_MONTH,
+}
+
+# Формат отображения начала периода в таблице статистики
+PERIOD_FORMATS = {
+    PERIOD_DAY: '%d.%m.%Y',
+    PERIOD_WEEK: 'нед. с %d.%m.%Y',
+    PERIOD_MONTH: '%m.%Y',
+}
+
+# Количество графиков прогресса, хранимых в кэше
+FIGURE_CACHE_SIZE = 8
+
+# Интервал проверки изменений журнала другими процессами, мс
+WATCH_INTERVAL_MS = 1000
+
+
+def data_file_types():
+    """
+    Типы файлов для диалогов экспорта и импорта: CSV и резервные копии, в том числе сжатые
+    (сжатие zstd предлагается, только если установлена библиотека zstandard).
 
-# Импорт библиотеки Plotly для создания интерактивных графиков
-import plotly.graph_objs as go
-import plotly.io as pio
-from plotly.subplots import make_subplots
-# Импорт виджета календаря
-from tkcalendar import DateEntry
+    Returns:
+        list: Пары (описание, шаблоны имен файлов).
+    """
+    def patterns(extension):
+        return " ".join(f"*{extension}{compression}" for compression in ('', *available_compressions()))
 
-# Файл для сохранения данных о тренировках
-data_file = 'training_log.json'
+    return [("CSV files", patterns('.csv')), ("Backup files", patterns(BINARY_EXTENSION)), ("All files", "*.*")]
 
 
-def load_data():
+class LazyRecordTable:
     """
-    Загрузка данных о тренировках из файла.
+    Таблица записей о тренировках с ограниченным окном строк, сдвигаемым при прокрутке.
 
-    Returns:
-        list: Список словарей с данными о тренировках.
+    В таблице одновременно находится не больше MAX_PAGES страниц строк подряд. При прокрутке
+    к концу добавляется следующая страница, а первая удаляется; при прокрутке к началу —
+    наоборот. Поэтому окно с историей открывается одинаково быстро, а количество строк в
+    Treeview и занимаемая ими память не растут с размером журнала.
     """
-    try:
-        # Попытка открыть файл с данными о тренировках для чтения
-        with open(data_file, 'r') as file:
-            # Загрузка данных из файла в формате JSON
-            return json.load(file)
-    except (FileNotFoundError, json.JSONDecodeError):
-        # Если файл не найден или данные в файле некорректны, возвращаем пустой список
-        return []
 
+    # Количество строк, добавляемых в таблицу за один раз
+    PAGE_SIZE = 200
+
+    # Наибольшее количество страниц, одновременно находящихся в таблице
+    MAX_PAGES = 5
+
+    # Доля прокрутки, после которой подгружается следующая страница (предыдущая — до 1 - PREFETCH_THRESHOLD)
+    PREFETCH_THRESHOLD = 0.8
+
+    def __init__(self, parent, records):
+        """
+        Создание таблицы.
+
+        Args:
+            parent (tk.Widget): Родительский виджет.
+            records (list): Записи TrainingRecord в порядке отображения.
+        """
+        self.records = records
+        # Окно показанных записей: позиции первой показанной записи и следующей за последней
+        self.first = 0
+        self.loaded = 0
+        # Идентификаторы удаленных записей и измененные записи; список записей при этом не изменяется,
+        # а строки окна заполняются с их учетом
+        self.deleted = set()
+        self.updated = {}
+        # Признак запланированного сдвига окна (чтобы не сдвигать его несколько раз за одну прокрутку)
+        self.shift_scheduled = False
+
+        self.frame = ttk.Frame(parent)
+
+        # Создание таблицы для отображения данных
+        self.tree = ttk.Treeview(self.frame, columns=("Дата", "Упражнение", "Вес", "Повторения"), show="headings")
+
+        # Установка заголовков столбцов
+        self.tree.heading('Дата', text="Дата")
+        self.tree.heading('Упражнение', text="Упражнение")
+        self.tree.heading('Вес', text="Вес")
+        self.tree.heading('Повторения', text="Повторения")
+
+        # Полоса прокрутки; при прокрутке к краю окно строк сдвигается
+        self.scrollbar = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self.on_scroll)
+
+        self.tree.pack(side=tk.LEFT, expand=True, fill=tk.BOTH)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        # Надпись с диапазоном показанных записей
+        self.status_label = ttk.Label(parent)
+
+        self.load_more()
+
+    def pack(self, **kwargs):
+        """
+        Размещение таблицы и надписи о количестве записей в родительском виджете.
+        """
+        self.status_label.pack(side=tk.BOTTOM, anchor=tk.W, padx=5)
+        self.frame.pack(**kwargs)
+
+    def on_scroll(self, first, last):
+        """
+        Обработка прокрутки: обновление полосы прокрутки и сдвиг окна строк у его краев.
+
+        Args:
+            first (str): Доля таблицы до первой видимой строки.
+            last (str): Доля таблицы до последней видимой строки.
+        """
+        self.scrollbar.set(first, last)
+        if self.shift_scheduled:
+            return
+        if float(last) >= self.PREFETCH_THRESHOLD and self.loaded < len(self.records):
+            self.shift_scheduled = True
+            self.tree.after_idle(self.load_more)
+        elif float(first) <= 1 - self.PREFETCH_THRESHOLD and self.first > 0:
+            self.shift_scheduled = True
+            self.tree.after_idle(self.load_previous)
+
+    def page_rows(self, start, end):
+        """
+        Записи страницы с учетом изменений и удалений.
+
+        Args:
+            start (int): Позиция первой записи в списке.
+            end (int): Позиция после последней записи.
+
+        Returns:
+            list: Записи TrainingRecord для добавления в таблицу.
+        """
+        return [self.updated.get(record.id, record) for record in self.records[start:end]
+                if record.id not in self.deleted]
+
+    def remove_rows(self, start, end):
+        """
+        Удаление из таблицы строк записей с заданными позициями.
+
+        Args:
+            start (int): Позиция первой записи в списке.
+            end (int): Позиция после последней записи.
+
+        Returns:
+            int: Количество удаленных строк.
+        """
+        iids = [str(record.id) for record in self.records[start:end] if self.tree.exists(str(record.id))]
+        self.tree.delete(*iids)
+        return len(iids)
+
+    def keep_position(self, top_row, shift):
+        """
+        Восстановление видимой части таблицы после добавления или удаления строк сверху.
+
+        Args:
+            top_row (int): Номер первой видимой строки до изменения.
+            shift (int): Количество строк, добавленных (положительное) или удаленных (отрицательное) сверху.
+        """
+        rows = len(self.tree.get_children())
+        if rows:
+            self.tree.yview_moveto(max(top_row + shift, 0) / rows)
+
+    def load_more(self):
+        """
+        Добавление в таблицу следующей страницы записей и удаление первой, если окно переполнено.
+        """
+        self.shift_scheduled = False
+        end = min(self.loaded + self.PAGE_SIZE, len(self.records))
+        top_row = round(self.tree.yview()[0] * len(self.tree.get_children()))
+        with span('table.fill'):
+            for record in self.page_rows(self.loaded, end):
+                # Идентификатор строки совпадает с идентификатором записи
+                self.tree.insert('', tk.END, iid=str(record.id), values=record.display_values())
+            self.loaded = end
+            if self.loaded - self.first > self.MAX_PAGES * self.PAGE_SIZE:
+                removed = self.remove_rows(self.first, self.first + self.PAGE_SIZE)
+                self.first += self.PAGE_SIZE
+                self.keep_position(top_row, -removed)
+        self.update_status()
+
+    def load_previous(self):
+        """
+        Добавление в начало таблицы предыдущей страницы записей и удаление последней, если окно переполнено.
+        """
+        self.shift_scheduled = False
+        start = max(self.first - self.PAGE_SIZE, 0)
+        top_row = round(self.tree.yview()[0] * len(self.tree.get_children()))
+        with span('table.fill'):
+            rows = self.page_rows(start, self.first)
+            for position, record in enumerate(rows):
+                self.tree.insert('', position, iid=str(record.id), values=record.display_values())
+            self.first = start
+            end = self.first + self.MAX_PAGES * self.PAGE_SIZE
+            if self.loaded > end:
+                self.remove_rows(end, self.loaded)
+                self.loaded = end
+            self.keep_position(top_row, len(rows))
+        self.update_status()
+
+    def update_status(self):
+        """
+        Обновление надписи с диапазоном показанных записей.
+        """
+        text = f"Показаны записи {self.first + 1}–{self.loaded} из {len(self.records)}"
+        if self.deleted:
+            text += f" (удалено: {len(self.deleted)})"
+        self.status_label['text'] = text
+
+    def replace_records(self, records):
+        """
+        Замена записей таблицы после изменения журнала другим процессом.
+
+        Заново заполняется только окно показанных строк, поэтому обновление не зависит
+        от количества записей; выделенная строка и положение прокрутки сохраняются.
+
+        Args:
+            records (list): Записи TrainingRecord в порядке отображения.
+        """
+        pages = max((self.loaded - self.first + self.PAGE_SIZE - 1) // self.PAGE_SIZE, 1)
+        selection = self.tree.selection()
+        position = self.tree.yview()[0]
+        self.tree.delete(*self.tree.get_children())
+        self.records = records
+        self.deleted = set()
+        self.updated = {}
+        # Окно остается на тех же страницах, а если записей стало меньше — сдвигается к концу списка
+        last_start = max(len(records) - 1, 0) // self.PAGE_SIZE * self.PAGE_SIZE
+        self.first = min(self.first, max(last_start - (pages - 1) * self.PAGE_SIZE, 0))
+        self.loaded = self.first
+        for _ in range(pages):
+            if self.loaded >= len(records):
+                break
+            self.load_more()
+        self.update_status()
+        kept = [iid for iid in selection if self.tree.exists(iid)]
+        if kept:
+            self.tree.selection_set(kept)
+        self.tree.yview_moveto(position)
+
+    def selected_id(self):
+        """
+        Идентификатор записи в выбранной строке таблицы.
+
+        Returns:
+            int: Идентификатор записи или None, если строка не выбрана.
+        """
+        selection = self.tree.selection()
+        return int(selection[0]) if selection else None
+
+    def update_row(self, record):
+        """
+        Обновление строки таблицы после изменения записи.
 
-def save_data(data):
+        Args:
+            record (TrainingRecord): Новое состояние записи.
+        """
+        # Измененная запись запоминается, чтобы строка не вернулась к старым значениям при сдвиге окна
+        self.updated[record.id] = record
+        if self.tree.exists(str(record.id)):
+            self.tree.item(str(record.id), values=record.display_values())
+
+    def delete_row(self, entry_id):
+        """
+        Удаление строки таблицы после удаления записи.
+
+        Список записей не изменяется: удаленная запись запоминается и пропускается при сдвиге окна.
+
+        Args:
+            entry_id (int): Идентификатор записи.
+        """
+        self.deleted.add(entry_id)
+        if self.tree.exists(str(entry_id)):
+            self.tree.delete(str(entry_id))
+        self.update_status()
+
+
+class ExerciseAutocomplete:
     """
-    Сохранение данных о тренировках в файл.
+    Автодополнение названия упражнения в поле ввода.
 
-    Args:
-        data (list): Список словарей с данными о тренировках.
+    По мере ввода поле дополняется наиболее часто используемым упражнением, название которого
+    начинается с введенного текста (дополненная часть выделена и заменяется при продолжении
+    ввода), а выпадающий список содержит остальные подсказки. Подсказки ищутся по словарю
+    упражнений репозитория после короткой паузы в вводе.
+    """
+
+    # Пауза в вводе перед поиском подсказок, мс
+    DELAY_MS = 150
+
+    # Клавиши выбора из выпадающего списка, после которых подсказки не обновляются
+    NAVIGATION_KEYS = ('Up', 'Down', 'Return', 'KP_Enter', 'Escape', 'Tab')
+
+    # Клавиши удаления, после которых поле не дополняется
+    DELETE_KEYS = ('BackSpace', 'Delete')
+
+    def __init__(self, combobox, repository):
+        """
+        Подключение автодополнения к полю ввода.
+
+        Args:
+            combobox (ttk.Combobox): Поле ввода названия упражнения.
+            repository (TrainingRepository): Репозиторий записей со словарем упражнений.
+        """
+        self.combobox = combobox
+        self.repository = repository
+        # Отложенный поиск подсказок и признак дополнения поля после него
+        self._pending = None
+        self._complete = False
+        combobox.bind('<KeyRelease>', self.on_key_release, add='+')
+        combobox.bind('<Destroy>', self.on_destroy, add='+')
+
+    def on_key_release(self, event):
+        """
+        Отложенный поиск подсказок после нажатия клавиши: при быстром вводе поиск выполняется один раз.
+
+        Args:
+            event (tk.Event): Событие клавиатуры.
+        """
+        if event.keysym in self.NAVIGATION_KEYS:
+            return
+        self._complete = event.keysym not in self.DELETE_KEYS and event.char.isprintable() and bool(event.char)
+        if self._pending is not None:
+            self.combobox.after_cancel(self._pending)
+        self._pending = self.combobox.after(self.DELAY_MS, self.suggest)
+
+    def on_destroy(self, event):
+        """
+        Отмена отложенного поиска при закрытии поля ввода.
+
+        Args:
+            event (tk.Event): Событие закрытия.
+        """
+        if self._pending is not None:
+            self.combobox.after_cancel(self._pending)
+            self._pending = None
+
+    def suggest(self):
+        """
+        Поиск подсказок по введенному тексту и дополнение поля лучшей из них.
+        """
+        self._pending = None
+        text = self.combobox.get()
+        # Выделенная часть — предыдущее дополнение, а не введенный текст
+        if self.combobox.selection_present():
+            text = text[:self.combobox.index(tk.SEL_FIRST)]
+        suggestions = self.repository.suggest_exercises(text)
+        self.combobox['values'] = suggestions
+        if not (self._complete and text and suggestions):
+            return
+        best = suggestions[0]
+        if len(best) > len(text):
+            # Название записывается так, как оно хранится в журнале, а дополненная часть выделяется
+            self.combobox.delete(0, tk.END)
+            self.combobox.insert(0, best)
+            self.combobox.icursor(len(text))
+            self.combobox.selection_range(len(text), tk.END)
+
+
+class ProgressWindow:
+    """
+    Окно с индикатором прогресса длительной операции и кнопкой отмены.
+
+    Прогресс сообщается из фонового потока методом report, а отображается в главном
+    потоке методом refresh, поэтому виджеты Tkinter не используются из других потоков.
+    """
+
+    def __init__(self, root, title):
+        """
+        Создание окна прогресса.
+
+        Args:
+            root (tk.Tk): Основное окно приложения.
+            title (str): Заголовок окна.
+        """
+        self.window = Toplevel(root)
+        self.window.title(title)
+        self.window.resizable(False, False)
+        # Событие отмены, которое проверяет фоновая операция
+        self.cancel_event = threading.Event()
+        # Последняя доля выполнения, сообщенная фоновым потоком
+        self.fraction = 0.0
+
+        self.label = ttk.Label(self.window, text="Выполняется...")
+        self.label.pack(padx=10, pady=5)
+
+        self.progressbar = ttk.Progressbar(self.window, length=300, maximum=100)
+        self.progressbar.pack(padx=10, pady=5)
+
+        self.cancel_button = ttk.Button(self.window, text="Отмена", command=self.cancel)
+        self.cancel_button.pack(pady=5)
+        self.window.protocol("WM_DELETE_WINDOW", self.cancel)
+
+    def report(self, done, total):
+        """
+        Сообщение о прогрессе (может вызываться из фонового потока).
+
+        Args:
+            done (int): Выполненный объем работы.
+            total (int): Общий объем работы.
+        """
+        self.fraction = done / total if total else 1.0
+
+    def refresh(self):
+        """
+        Отображение последнего сообщенного прогресса (вызывается в главном потоке).
+        """
+        self.progressbar['value'] = self.fraction * 100
+        self.label['text'] = f"Выполнено: {self.fraction:.0%}"
+
+    def cancel(self):
+        """
+        Запрос отмены операции.
+        """
+        self.cancel_event.set()
+        self.label['text'] = "Отмена..."
+        self.cancel_button.state(['disabled'])
+
+    def close(self):
+        """
+        Закрытие окна прогресса.
+        """
+        self.window.destroy()
+
+
+class StartupTimer:
+    """
+    Замер длительности этапов запуска приложения.
+
+    Этапы могут завершаться в разных потоках (загрузка журнала, фоновая загрузка библиотек);
+    отчет выводится, когда завершены все ожидаемые фоновые этапы.
+    """
+
+    def __init__(self, started, enabled=False, parts=0):
+        """
+        Инициализация замера.
+
+        Args:
+            started (float): Момент начала запуска (time.perf_counter).
+            enabled (bool): Выводить ли отчет.
+            parts (int): Количество фоновых этапов, после завершения которых выводится отчет.
+        """
+        self.started = started
+        self.enabled = enabled
+        self.stages = []
+        self._remaining = parts
+        self._lock = threading.Lock()
+
+    def record(self, name, start, end=None):
+        """
+        Учет этапа запуска.
+
+        Args:
+            name (str): Название этапа.
+            start (float): Момент начала этапа.
+            end (float): Момент окончания этапа (по умолчанию — текущий момент).
+        """
+        end = time.perf_counter() if end is None else end
+        with self._lock:
+            self.stages.append((name, start - self.started, end - start))
+
+    def part_done(self):
+        """
+        Завершение одного из фоновых этапов; после завершения последнего выводится отчет.
+        """
+        with self._lock:
+            self._remaining -= 1
+            finished = self._remaining == 0
+        if finished and self.enabled:
+            self.report()
+
+    def report(self, file=None):
+        """
+        Вывод отчета о длительности этапов запуска.
+
+        Args:
+            file (io.TextIOBase): Поток вывода (по умолчанию sys.stderr).
+        """
+        file = sys.stderr if file is None else file
+        print("Этапы запуска (начало, длительность, мс):", file=file)
+        for name, offset, duration in sorted(self.stages, key=lambda stage: stage[1]):
+            print(f"  {offset * 1000:8.1f} {duration * 1000:8.1f}  {name}", file=file)
+
+
+class DiagnosticsWindow:
+    """
+    Окно диагностики: время горячих участков и счетчики, обновляемые раз в секунду.
+    """
+
+    # Интервал обновления таблиц, мс
+    REFRESH_INTERVAL_MS = 1000
+
+    # Каталог профилей cProfile, если он не задан параметром --profile-dir
+    DEFAULT_PROFILE_DIR = 'profiles'
+
+    def __init__(self, root):
+        """
+        Создание окна диагностики.
+
+        Args:
+            root (tk.Tk): Основное окно приложения.
+        """
+        self.window = Toplevel(root)
+        self.window.title("Диагностика")
+        # Каталог профилей, используемый при включении профилирования из окна
+        self.profile_dir = instrumentation.profile_dir or self.DEFAULT_PROFILE_DIR
+
+        # Таблица интервалов замера времени
+        self.spans_tree = ttk.Treeview(self.window, columns=("Участок", "Вызовов", "Всего, мс", "Среднее, мс",
+                                                             "Макс., мс", "Последний, мс"), show="headings")
+        for column in self.spans_tree['columns']:
+            self.spans_tree.heading(column, text=column)
+        self.spans_tree.pack(expand=True, fill=tk.BOTH, padx=5, pady=5)
+
+        # Таблица счетчиков
+        self.counters_tree = ttk.Treeview(self.window, columns=("Счетчик", "Значение"), show="headings", height=6)
+        for column in self.counters_tree['columns']:
+            self.counters_tree.heading(column, text=column)
+        self.counters_tree.pack(fill=tk.X, padx=5, pady=5)
+
+        buttons_frame = ttk.Frame(self.window)
+        buttons_frame.pack(side=tk.BOTTOM, fill=tk.X)
+        ttk.Button(buttons_frame, text="Сбросить", command=self.reset).pack(side=tk.LEFT, padx=5, pady=5)
+        ttk.Button(buttons_frame, text="Сохранить в файл", command=self.save).pack(side=tk.LEFT, padx=5, pady=5)
+
+        # Профилирование фоновых операций и обработки их результатов под cProfile
+        self.profile_var = tk.BooleanVar(value=instrumentation.profile_dir is not None)
+        ttk.Checkbutton(buttons_frame, text=f"Профилировать операции (cProfile, каталог {self.profile_dir})",
+                        variable=self.profile_var, command=self.toggle_profiling).pack(side=tk.LEFT, padx=5)
+
+        self.refresh()
+
+    def refresh(self):
+        """
+        Обновление таблиц текущими замерами (повторяется, пока окно открыто).
+        """
+        if not self.window.winfo_exists():
+            return
+        snapshot = instrumentation.snapshot()
+        self.spans_tree.delete(*self.spans_tree.get_children())
+        for name, stats in snapshot['spans'].items():
+            self.spans_tree.insert('', tk.END, values=(name, stats['count'], f"{stats['total_ms']:.1f}",
+                                                       f"{stats['avg_ms']:.2f}", f"{stats['max_ms']:.2f}",
+                                                       f"{stats['last_ms']:.2f}"))
+        self.counters_tree.delete(*self.counters_tree.get_children())
+        for name, value in snapshot['counters'].items():
+            self.counters_tree.insert('', tk.END, values=(name, f"{value:,}".replace(',', ' ')))
+        self.window.after(self.REFRESH_INTERVAL_MS, self.refresh)
+
+    def reset(self):
+        """
+        Сброс накопленных замеров.
+        """
+        instrumentation.reset()
+        self.refresh()
+
+    def save(self):
+        """
+        Сохранение замеров в JSON файл.
+        """
+        file_path = filedialog.asksaveasfilename(parent=self.window, defaultextension=".json",
+                                                 filetypes=[("JSON files", "*.json")])
+        if not file_path:
+            return
+        try:
+            instrumentation.dump(file_path)
+        except OSError as error:
+            messagebox.showerror("Ошибка", f"Не удалось сохранить замеры: {error}", parent=self.window)
+
+    def toggle_profiling(self):
+        """
+        Включение или выключение профилирования операций под cProfile.
+        """
+        instrumentation.profile_dir = self.profile_dir if self.profile_var.get() else None
+
+
+class SessionEntryWindow:
     """
-    # Открываем файл для записи данных о тренировках
-    with open(data_file, 'w', encoding='utf-8') as file:
-        # Сериализуем данные в формат JSON и записываем их в файл с отступами для лучшей читаемости
-        json.dump(data, file, indent=4, ensure_ascii=False)
+    Окно ввода тренировки: подходы накапливаются в таблице и сохраняются в журнал одной пачкой.
+
+    Ввод подхода проверяется сразу, ошибки показываются в строке состояния окна, а не в отдельном
+    окне сообщения, поэтому стоимость одного подхода постоянна. При сохранении все подходы
+    добавляются в репозиторий одной операцией (одна запись на диск), а список упражнений
+    главного окна обновляется один раз.
+    """
+
+    def __init__(self, app):
+        """
+        Создание окна ввода тренировки.
+
+        Args:
+            app (TrainingLogApp): Приложение, в журнал которого сохраняются подходы.
+        """
+        self.app = app
+        self.repository = app.repository
+        # Подготовленные подходы: идентификатор строки таблицы -> запись без идентификатора
+        self.staged = {}
+        # Состояние рекордов упражнений с учетом подготовленных подходов
+        self.progress = {}
+
+        self.window = Toplevel(app.root)
+        self.window.title("Ввод тренировки")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        # Поля ввода подхода
+        fields_frame = ttk.Frame(self.window)
+        fields_frame.pack(fill=tk.X, padx=5, pady=5)
+        ttk.Label(fields_frame, text="Упражнение:").grid(column=0, row=0, sticky=tk.W, padx=5)
+        self.exercise_entry = ttk.Combobox(fields_frame)
+        self.exercise_autocomplete = ExerciseAutocomplete(self.exercise_entry, self.repository)
+        self.exercise_entry.grid(column=1, row=0, sticky=tk.EW, padx=5)
+        ttk.Label(fields_frame, text="Вес:").grid(column=2, row=0, sticky=tk.W, padx=5)
+        self.weight_entry = ttk.Entry(fields_frame, width=8)
+        self.weight_entry.grid(column=3, row=0, padx=5)
+        ttk.Label(fields_frame, text="Повторения:").grid(column=4, row=0, sticky=tk.W, padx=5)
+        self.repetitions_entry = ttk.Entry(fields_frame, width=6)
+        self.repetitions_entry.grid(column=5, row=0, padx=5)
+        fields_frame.columnconfigure(1, weight=1)
+
+        # Кнопки работы с подготовленными подходами
+        buttons_frame = ttk.Frame(self.window)
+        buttons_frame.pack(fill=tk.X, padx=5)
+        ttk.Button(buttons_frame, text="Добавить подход (Enter)",
+                   command=self.stage_entry).pack(side=tk.LEFT, padx=5, pady=5)
+        ttk.Button(buttons_frame, text="Повторить последний (Ctrl+R)",
+                   command=self.repeat_last).pack(side=tk.LEFT, padx=5, pady=5)
+        ttk.Button(buttons_frame, text="Удалить подход (Delete)",
+                   command=self.remove_selected).pack(side=tk.LEFT, padx=5, pady=5)
+
+        # Таблица подготовленных подходов
+        self.tree = ttk.Treeview(self.window, columns=("Время", "Упражнение", "Вес", "Повторения", "Рекорд"),
+                                 show="headings", height=12)
+        for column in self.tree['columns']:
+            self.tree.heading(column, text=column)
+        self.tree.pack(expand=True, fill=tk.BOTH, padx=5, pady=5)
+
+        # Строка состояния: ошибки ввода и количество подходов
+        self.status_label = ttk.Label(self.window, text="Подходов: 0")
+        self.status_label.pack(fill=tk.X, padx=5)
+
+        save_frame = ttk.Frame(self.window)
+        save_frame.pack(side=tk.BOTTOM, fill=tk.X)
+        ttk.Button(save_frame, text="Сохранить тренировку (Ctrl+S)",
+                   command=self.save).pack(side=tk.LEFT, padx=5, pady=5)
+        ttk.Button(save_frame, text="Отмена", command=self.close).pack(side=tk.LEFT, padx=5, pady=5)
+
+        # Быстрый ввод с клавиатуры
+        for entry in (self.weight_entry, self.repetitions_entry):
+            entry.bind('<Return>', lambda event: self.stage_entry())
+        self.window.bind('<Control-r>', lambda event: self.repeat_last())
+        self.window.bind('<Control-s>', lambda event: self.save())
+        self.tree.bind('<Delete>', lambda event: self.remove_selected())
+        self.exercise_entry.focus_set()
+
+    def stage_entry(self):
+        """
+        Проверка введенного подхода и добавление его в таблицу.
+        """
+        exercise = self.exercise_entry.get().strip()
+        if not (exercise and self.weight_entry.get() and self.repetitions_entry.get()):
+            self.status_label['text'] = "Все поля должны быть заполнены!"
+            return
+        try:
+            weight = parse_weight(self.weight_entry.get())
+            repetitions = parse_repetitions(self.repetitions_entry.get())
+        except ValueError:
+            self.status_label['text'] = "Вес и количество повторений должны быть неотрицательными числами!"
+            return
+        self.stage(exercise, weight, repetitions)
+        # Упражнение и вес сохраняются для следующего подхода, повторения выделяются для замены
+        self.repetitions_entry.focus_set()
+        self.repetitions_entry.selection_range(0, tk.END)
+
+    def repeat_last(self):
+        """
+        Добавление копии последнего подготовленного подхода.
+        """
+        if not self.staged:
+            self.status_label['text'] = "Нет подходов для повтора"
+            return
+        last = self.staged[self.tree.get_children()[-1]]
+        self.stage(last.exercise, last.weight, last.repetitions)
+
+    def stage(self, exercise, weight, repetitions):
+        """
+        Добавление подхода в таблицу с текущими датой и временем и отметкой личных рекордов.
+
+        Args:
+            exercise (str): Название упражнения.
+            weight (float): Вес.
+            repetitions (int): Количество повторений.
+        """
+        timestamp = datetime_to_timestamp(datetime.now().replace(microsecond=0))
+        record = TrainingRecord(None, timestamp, exercise, weight, repetitions)
+        item = self.tree.insert('', tk.END, values=(format_timestamp(timestamp, '%H:%M:%S'), exercise,
+                                                    format_weight(weight), repetitions, self.flag(record)))
+        self.staged[item] = record
+        self.tree.see(item)
+        self.update_status()
+
+    def flag(self, record):
+        """
+        Рекорды, которые устанавливает подход с учетом журнала и предыдущих подготовленных подходов.
+
+        Args:
+            record (TrainingRecord): Подготовленный подход.
+
+        Returns:
+            str: Описание рекордов или пустая строка.
+        """
+        progress = self.progress.get(record.exercise)
+        if progress is None:
+            progress = self.repository.exercise_progress(record.exercise) or ExerciseProgress()
+            self.progress[record.exercise] = progress
+        achieved = progress.check(record)
+        progress.add(record)
+        return describe_records(achieved)
+
+    def remove_selected(self):
+        """
+        Удаление выбранных подходов из таблицы с пересчетом отметок рекордов.
+        """
+        selected = self.tree.selection()
+        if not selected:
+            return
+        for item in selected:
+            self.tree.delete(item)
+            del self.staged[item]
+        # Отметки оставшихся подходов зависят от удаленных, поэтому пересчитываются по порядку
+        self.progress = {}
+        for item in self.tree.get_children():
+            self.tree.set(item, 'Рекорд', self.flag(self.staged[item]))
+        self.update_status()
+
+    def update_status(self):
+        """
+        Отображение количества подготовленных подходов и рекордов.
+        """
+        records = sum(1 for item in self.tree.get_children() if self.tree.set(item, 'Рекорд'))
+        self.status_label['text'] = f"Подходов: {len(self.staged)}, с личными рекордами: {records}"
+
+    def save(self):
+        """
+        Сохранение подготовленных подходов в журнал одной пачкой и закрытие окна.
+        """
+        if not self.staged:
+            self.status_label['text'] = "Нет подходов для сохранения"
+            return
+        records = [self.staged[item] for item in self.tree.get_children()]
+        count = sum(1 for item in self.tree.get_children() if self.tree.set(item, 'Рекорд'))
+        # Одна операция репозитория: одна блокировка и одна запись на диск в фоне
+        with span('session.save'):
+            added = self.repository.add_many(records)
+        self.staged = {}
+        # Обновление главного окна один раз за тренировку
+        self.app.update_exercise_filter_combobox()
+        message = f"Сохранено подходов: {len(added)}"
+        if count:
+            message += f"\nПодходов с личными рекордами: {count}"
+        messagebox.showinfo("Успешно", message, parent=self.app.root)
+        self.window.destroy()
+
+    def close(self):
+        """
+        Закрытие окна; несохраненные подходы теряются только после подтверждения.
+        """
+        if self.staged and not messagebox.askyesno(
+                "Ввод тренировки", "Закрыть окно без сохранения подходов?", parent=self.window):
+            return
+        self.window.destroy()
 
 
 class TrainingLogApp:
@@ -54,19 +818,74 @@ class TrainingLogApp:
     Класс для создания графического интерфейса приложения для ведения дневника тренировок.
     """
 
-    def __init__(self, root):
+    def __init__(self, root, timer=None, storage=None):
         """
         Инициализация приложения.
 
         Args:
             root (tk.Tk): Основное окно приложения.
+            timer (StartupTimer): Замер длительности этапов запуска.
+            storage: Хранилище журнала (по умолчанию выбирается по пути journal_path(): журнал JSON Lines,
+                база данных SQLite или журнал по периодам; данные файла старого формата переносятся
+                в журнал при первой загрузке).
         """
+        started = time.perf_counter()
+        self.timer = timer if timer is not None else StartupTimer(started, parts=2)
         # Привязка основного окна приложения к атрибуту класса
         self.root = root
         # Установка заголовка окна
         root.title("Дневник тренировок")
+        # Хранилище, через которое выполняются все операции чтения и записи (выбирается по расширению файла)
+        if storage is None:
+            storage = open_storage(journal_path(), legacy_path=LEGACY_DATA_FILE)
+        # Репозиторий записей в памяти; все окна работают с ним
+        self.repository = TrainingRepository(storage)
+        # Планировщик операций, выполняемых в фоновых потоках
+        self.tasks = TaskScheduler(root, on_busy_changed=self.on_busy_changed)
+        # Кэш построенных графиков прогресса
+        self.figure_cache = LRUCache(FIGURE_CACHE_SIZE, name='figures')
+        # Версия набора упражнений, показанного в фильтре (список обновляется только при ее изменении)
+        self.exercise_list_version = None
+        # Открытые окна записей и статистики, обновляемые при изменении журнала другим процессом:
+        # имя окна -> функция обновления
+        self.open_views = {}
+        # Номер версии чужих изменений, уже показанных в окнах
+        self.external_version = 0
+        # Запись несохраненных изменений при закрытии окна
+        root.protocol("WM_DELETE_WINDOW", self.on_close)
         # Создание виджетов для ввода и отображения данных
         self.create_widgets()
+        # Список упражнений, сохраненный при прошлом закрытии, показывается сразу, без чтения журнала
+        self.exercise_filter_combobox['values'] = self.repository.saved_exercises() or []
+        self.timer.record("создание окна", started)
+        # Однократная загрузка журнала в фоне; до ее завершения кнопки недоступны
+        self.set_actions_enabled(False)
+        load_started = time.perf_counter()
+        self.tasks.submit(lambda cancel_event: self.repository.load(),
+                          lambda result, error: self.on_loaded(result, error, load_started), name='load')
+        # После первой отрисовки окна библиотеки для статистики и графиков загружаются в фоне
+        root.after_idle(self.on_first_idle)
+
+    def on_first_idle(self):
+        """
+        Первая отрисовка окна: запуск фоновой загрузки NumPy и Plotly.
+        """
+        self.timer.record("первая отрисовка окна", self.timer.started)
+        threading.Thread(target=self.prewarm, name='journal-prewarm', daemon=True).start()
+
+    def prewarm(self):
+        """
+        Загрузка NumPy и Plotly в фоновом потоке, чтобы первый просмотр статистики и графика не ждал их.
+        """
+        start = time.perf_counter()
+        import journal_analytics  # noqa: F401
+        self.timer.record("фоновая загрузка NumPy", start)
+        start = time.perf_counter()
+        from journal_charts import build_progress_figure
+        # Построение пустого графика загружает модули Plotly, которые подключаются при первом обращении
+        build_progress_figure({})
+        self.timer.record("фоновая загрузка Plotly", start)
+        self.timer.part_done()
 
     def create_widgets(self):
         """
@@ -76,7 +895,9 @@ class TrainingLogApp:
         self.exercise_label = ttk.Label(self.root, text="Упражнение:")  # Создание метки для поля "Упражнение"
         self.exercise_label.grid(column=0, row=0, sticky=tk.W, padx=5, pady=5)  # Размещение метки в сетке
 
-        self.exercise_entry = ttk.Entry(self.root)  # Создание поля ввода для "Упражнение"
+        # Создание поля ввода для "Упражнение" с подсказками по началу названия
+        self.exercise_entry = ttk.Combobox(self.root)
+        self.exercise_autocomplete = ExerciseAutocomplete(self.exercise_entry, self.repository)
         self.exercise_entry.grid(column=1, row=0, sticky=tk.EW, padx=5, pady=5)  # Размещение поля ввода в сетке
 
         self.weight_label = ttk.Label(self.root, text="Вес:")  # Создание метки для поля "Вес"
@@ -133,7 +954,6 @@ class TrainingLogApp:
         # Загрузка уникальных названий упражнений для выпадающего списка
         self.exercise_filter_combobox = ttk.Combobox(self.root, state="readonly")
         self.exercise_filter_combobox.grid(column=1, row=7, sticky=tk.EW, padx=5, pady=5)
-        self.update_exercise_filter_combobox()
 
         self.filter_button = ttk.Button(self.root, text="Отфильтровать и посмотреть записи",
                                         command=self.apply_filters)  # Создание кнопки для применения фильтра
@@ -149,20 +969,172 @@ class TrainingLogApp:
                                           command=self.view_progress)  # Создание кнопки для просмотра прогресса
         self.progress_button.grid(column=1, row=9)  # Размещение кнопки в сетке
 
+        # Кнопка для ввода тренировки пачкой подходов
+        self.session_button = ttk.Button(self.root, text="Ввод тренировки",
+                                         command=lambda: SessionEntryWindow(self))  # Создание кнопки для ввода подходов
+        self.session_button.grid(column=0, row=10, pady=5)  # Размещение кнопки в сетке
+
+        # Кнопка для просмотра личных рекордов
+        self.records_button = ttk.Button(self.root, text="Личные рекорды",
+                                         command=self.view_personal_records)  # Создание кнопки для просмотра рекордов
+        self.records_button.grid(column=1, row=10, pady=5)  # Размещение кнопки в сетке
+
+        # Индикатор выполнения фоновых операций (показывается, только пока они выполняются)
+        self.busy_label = ttk.Label(self.root, text="Выполняется...")
+        self.busy_label.grid(column=0, row=11, sticky=tk.W, padx=5, pady=5)
+        self.busy_bar = ttk.Progressbar(self.root, mode='indeterminate')
+        self.busy_bar.grid(column=1, row=11, sticky=tk.EW, padx=5, pady=5)
+        self.busy_label.grid_remove()
+        self.busy_bar.grid_remove()
+
+        # Кнопка окна диагностики (только при запуске с флагом --diagnostics или --profile-dir)
+        if instrumentation.enabled:
+            self.diagnostics_button = ttk.Button(self.root, text="Диагностика",
+                                                 command=lambda: DiagnosticsWindow(self.root))
+            self.diagnostics_button.grid(column=0, row=12, columnspan=2, pady=5)
+
+        # Кнопки, недоступные до загрузки журнала
+        self.action_buttons = [self.add_button, self.view_button, self.export_button, self.import_button,
+                               self.filter_button, self.stats_button, self.progress_button, self.records_button,
+                               self.session_button]
+
+    def set_actions_enabled(self, enabled):
+        """
+        Включение или отключение кнопок действий.
+
+        Args:
+            enabled (bool): True — кнопки доступны, False — недоступны.
+        """
+        for button in self.action_buttons:
+            button.state(['!disabled'] if enabled else ['disabled'])
+
+    def on_loaded(self, result, error, started):
+        """
+        Завершение загрузки журнала: включение кнопок и заполнение списка упражнений.
+
+        Args:
+            result: Не используется.
+            error (Exception): Ошибка загрузки или None.
+            started (float): Момент начала загрузки.
+        """
+        self.timer.record("загрузка журнала", started)
+        self.timer.part_done()
+        if error is not None:
+            messagebox.showerror("Ошибка", f"Не удалось загрузить журнал тренировок: {error}")
+            return
+        self.set_actions_enabled(True)
+        self.update_exercise_filter_combobox()
+        # Записи файла старого формата, которые не удалось перенести в журнал
+        skipped = getattr(self.repository.storage, 'migration_skipped', None)
+        if skipped:
+            messagebox.showwarning("Перенос журнала", "\n".join(skipped))
+        # Наблюдение за изменениями журнала другими процессами (другим окном приложения, скриптом)
+        self.external_version = self.repository.external_version
+        self.root.after(WATCH_INTERVAL_MS, self.watch_journal)
+
+    def watch_journal(self):
+        """
+        Периодическая проверка изменений журнала другими процессами.
+
+        Проверка без изменений стоит одного запроса сведений о файле; найденные изменения
+        читаются в фоне с того места, до которого журнал уже прочитан, и применяются к данным
+        в памяти, после чего открытые окна обновляются.
+        """
+        if self.repository.external_version != self.external_version:
+            # Чужие изменения уже применены фоновой записью
+            self.on_journal_changed()
+        elif self.repository.has_external_changes():
+            self.tasks.submit(lambda cancel_event: self.repository.refresh_if_changed(), self.on_journal_checked,
+                              key='watch', name='watch')
+        self.root.after(WATCH_INTERVAL_MS, self.watch_journal)
+
+    def on_journal_checked(self, changed, error):
+        """
+        Завершение чтения чужих изменений журнала.
+
+        Args:
+            changed (bool): Признак изменения данных в памяти (None при ошибке).
+            error (Exception): Ошибка чтения или None (проверка повторится через WATCH_INTERVAL_MS).
+        """
+        if error is None and self.repository.external_version != self.external_version:
+            self.on_journal_changed()
+
+    def on_journal_changed(self):
+        """
+        Обновление списка упражнений и открытых окон после изменений журнала другим процессом.
+        """
+        self.external_version = self.repository.external_version
+        self.update_exercise_filter_combobox()
+        for refresh in list(self.open_views.values()):
+            refresh()
+
+    def register_view(self, window, refresh):
+        """
+        Регистрация окна, обновляемого при изменении журнала другим процессом, до его закрытия.
+
+        Args:
+            window (tk.Toplevel): Окно.
+            refresh (callable): Функция обновления окна.
+        """
+        name = str(window)
+        self.open_views[name] = refresh
+        # Событие Destroy приходит и для вложенных виджетов, учитывается только закрытие самого окна
+        window.bind('<Destroy>', lambda event: self.open_views.pop(name, None) if event.widget is window else None,
+                    add='+')
+
+    def on_busy_changed(self, count):
+        """
+        Отображение индикатора выполнения фоновых операций.
+
+        Args:
+            count (int): Количество выполняемых операций.
+        """
+        if count:
+            self.busy_label['text'] = f"Выполняется операций: {count}"
+            if not self.busy_bar.winfo_ismapped():
+                self.busy_label.grid()
+                self.busy_bar.grid()
+                self.busy_bar.start()
+                self.root.config(cursor='watch')
+        elif self.busy_bar.winfo_ismapped():
+            self.busy_bar.stop()
+            self.busy_label.grid_remove()
+            self.busy_bar.grid_remove()
+            self.root.config(cursor='')
+
+    def on_close(self):
+        """
+        Закрытие приложения с записью несохраненных изменений на диск.
+        """
+        # Отмена фоновых операций и ожидание завершения уже начатых
+        self.tasks.shutdown()
+        try:
+            self.repository.close()
+        except Exception as error:
+            # Окно закрывается и в случае ошибки, иначе приложение нельзя было бы закрыть
+            messagebox.showerror("Ошибка", f"Не удалось сохранить изменения: {error}")
+        finally:
+            self.root.destroy()
+
     def update_exercise_filter_combobox(self):
         """
-        Обновление выпадающего списка упражнений на основе данных из файла.
+        Обновление выпадающего списка упражнений по словарю упражнений репозитория.
+
+        Список заменяется, только если набор упражнений изменился (появилось новое упражнение
+        или удален последний подход упражнения), а не после каждого добавления записи.
         """
-        data = load_data()
-        exercises = sorted(set(entry['exercise'] for entry in data))
-        self.exercise_filter_combobox['values'] = exercises
+        version = self.repository.exercises_version
+        if version == self.exercise_list_version:
+            return
+        self.exercise_list_version = version
+        self.exercise_filter_combobox['values'] = self.repository.exercises()
 
     def add_entry(self):
         """
         Добавление новой записи о тренировке.
         """
-        # Получение текущей даты и времени в формате строки
-        date = datetime.now().strftime('%d.%m.%Y %H:%M:%S')
+        # Получение текущей даты и времени (с точностью до секунды) в виде временной метки
+        timestamp = datetime_to_timestamp(datetime.now().replace(microsecond=0))
 
         # Получение значения из поля ввода упражнения
         exercise = self.exercise_entry.get()
@@ -179,22 +1151,22 @@ class TrainingLogApp:
             messagebox.showerror("Ошибка", "Все поля должны быть заполнены!")
             return
 
-        # Создание словаря с данными о тренировке
-        entry = {
-            'date': date,
-            'exercise': exercise,
-            'weight': weight,
-            'repetitions': repetitions
-        }
+        try:
+            # Преобразование веса и повторений в числа
+            weight = parse_weight(weight)
+            repetitions = parse_repetitions(repetitions)
+        except ValueError:
+            messagebox.showerror("Ошибка", "Вес и количество повторений должны быть неотрицательными числами!")
+            return
 
-        # Загрузка существующих данных о тренировках
-        data = load_data()
+        # Создание записи о тренировке
+        record = TrainingRecord(None, timestamp, exercise, weight, repetitions)
 
-        # Добавление новой записи в список данных
-        data.append(entry)
+        # Проверка личных рекордов по текущему состоянию рекордов упражнения (до добавления записи)
+        achieved = self.repository.check_personal_records(record)
 
-        # Сохранение обновленных данных в файл
-        save_data(data)
+        # Добавление записи в репозиторий; запись на диск выполняется в фоне
+        self.repository.add(record)
 
         # Очистка полей ввода после добавления записи
         self.exercise_entry.delete(0, tk.END)
@@ -204,70 +1176,104 @@ class TrainingLogApp:
         # Обновление выпадающего списка упражнений
         self.update_exercise_filter_combobox()
 
-        # Вывод сообщения об успешном добавлении записи
-        messagebox.showinfo("Успешно", "Запись успешно добавлена!")
+        # Вывод сообщения об успешном добавлении записи (с установленными рекордами)
+        message = "Запись успешно добавлена!"
+        if achieved:
+            message += f"\nНовый личный рекорд: {describe_records(achieved)}"
+        messagebox.showinfo("Успешно", message)
 
     def view_records(self):
         """
         Просмотр всех записей о тренировках.
         """
-        # Загрузка данных о тренировках
-        data = load_data()
+        # Получение данных о тренировках из памяти (с перечитыванием, если файл изменен извне) в фоне;
+        # записи по дате в порядке от последней к первой (индекс уже упорядочен, сортировка не нужна)
+        self.tasks.submit(lambda cancel_event: self.query_records(),
+                          lambda data, error: self.on_records_loaded("Записи тренировок", data, error, ()),
+                          key='records', name='records')
 
-        # Сортировка записей по дате в порядке от последней к первой
-        data.sort(key=lambda x: datetime.strptime(x['date'], '%d.%m.%Y %H:%M:%S'), reverse=True)
+    def query_records(self, start=None, end=None, exercise=None):
+        """
+        Выборка записей с перечитыванием журнала, если файл изменен извне (выполняется в фоновом потоке).
 
-        # Создание нового окна для отображения записей
-        records_window = Toplevel(self.root)
-        records_window.title("Записи тренировок")
+        Args:
+            start (int): Начало периода (временная метка, включительно) или None.
+            end (int): Конец периода (временная метка, не включительно) или None.
+            exercise (str): Название упражнения или None.
 
-        # Создание таблицы для отображения данных
-        tree = ttk.Treeview(records_window, columns=("Дата", "Упражнение", "Вес", "Повторения"), show="headings")
+        Returns:
+            list: Записи TrainingRecord в порядке от последней к первой.
+        """
+        self.repository.refresh_if_changed()
+        # База данных SQLite выбирает записи запросом по индексам, остальные хранилища — из индексов в памяти
+        return self.repository.filter_records(start, end, exercise)
 
-        # Установка заголовков столбцов
-        tree.heading('Дата', text="Дата")
-        tree.heading('Упражнение', text="Упражнение")
-        tree.heading('Вес', text="Вес")
-        tree.heading('Повторения', text="Повторения")
+    def on_records_loaded(self, title, records, error, query):
+        """
+        Отображение выбранных записей в новом окне.
 
-        # Заполнение таблицы данными из загруженных записей
-        for entry in data:
-            tree.insert('', tk.END, values=(entry['date'], entry['exercise'], entry['weight'], entry['repetitions']))
+        Args:
+            title (str): Заголовок окна.
+            records (list): Записи TrainingRecord в порядке от последней к первой (None при ошибке).
+            error (Exception): Ошибка выборки или None.
+            query (tuple): Параметры выборки (начало, конец, упражнение) для обновления окна.
+        """
+        if error is not None:
+            messagebox.showerror("Ошибка", f"Не удалось загрузить записи: {error}")
+            return
 
-        # Размещение таблицы в окне с растягиванием на всю доступную область
-        tree.pack(expand=True, fill=tk.BOTH)
+        # Проверка на существование записей, соответствующих фильтру
+        if not records:
+            messagebox.showinfo("Информация", "В заданный период упражнения не найдены.")
+            return
+
+        # Создание окна с таблицей записей
+        self.show_records_window(title, records, query)
+
+    def show_records_window(self, title, records, query=()):
+        """
+        Создание окна с постранично заполняемой таблицей записей и кнопками редактирования и удаления.
+
+        Args:
+            title (str): Заголовок окна.
+            records (list): Записи TrainingRecord в порядке от последней к первой.
+            query (tuple): Параметры выборки (начало, конец, упражнение), повторяемой при изменении
+                журнала другим процессом.
+        """
+        # Создание нового окна для отображения записей
+        records_window = Toplevel(self.root)
+        records_window.title(title)
 
         # Добавление кнопок для редактирования и удаления записей
-        edit_button = ttk.Button(records_window, text="Редактировать", command=lambda: self.edit_entry(tree))
+        buttons_frame = ttk.Frame(records_window)
+        buttons_frame.pack(side=tk.BOTTOM, fill=tk.X)
+
+        # Создание таблицы; в нее сразу добавляется только первая страница записей
+        table = LazyRecordTable(records_window, records)
+
+        edit_button = ttk.Button(buttons_frame, text="Редактировать", command=lambda: self.edit_entry(table))
         edit_button.pack(side=tk.LEFT, padx=5, pady=5)
 
-        delete_button = ttk.Button(records_window, text="Удалить", command=lambda: self.delete_entry(tree))
+        delete_button = ttk.Button(buttons_frame, text="Удалить", command=lambda: self.delete_entry(table))
         delete_button.pack(side=tk.LEFT, padx=5, pady=5)
 
-    def save_table_data(self, tree):
-        """
-        Сохранение данных из таблицы в файл training_log.json.
-        """
-        data = []
-        for item in tree.get_children():
-            values = tree.item(item)['values']
-            data.append({
-                'date': values[0],
-                'exercise': values[1],
-                'weight': values[2],
-                'repetitions': values[3]
-            })
+        # Размещение таблицы в окне с растягиванием на всю доступную область
+        table.pack(expand=True, fill=tk.BOTH)
 
-        save_data(data)
-        messagebox.showinfo("Успешно", "Данные успешно сохранены!")
+        # Выборка из индекса в памяти повторяется при изменении журнала другим процессом
+        self.register_view(records_window, lambda: table.replace_records(self.repository.query(*query)))
 
-    def apply_filters(self):
+    def get_filter_range(self):
         """
-        Применение фильтров по дате и упражнению.
+        Получение и проверка значений фильтров по дате и упражнению.
+
+        Returns:
+            tuple: Начало периода, конец периода (временные метки, конечная дата включается целиком)
+                и фильтр по упражнению, или None, если значения некорректны (ошибка уже показана).
         """
         # Получение значений из полей ввода дат
-        start_date_str = self.start_date_entry.get_date().strftime('%d.%m.%Y')
-        end_date_str = self.end_date_entry.get_date().strftime('%d.%m.%Y')
+        start_date_str = self.start_date_entry.get_date().strftime(DAY_FORMAT)
+        end_date_str = self.end_date_entry.get_date().strftime(DAY_FORMAT)
 
         # Получение значения из поля ввода фильтра по упражнению
         exercise_filter = self.exercise_filter_combobox.get()
@@ -275,128 +1281,144 @@ class TrainingLogApp:
         # Проверка, что оба поля даты заполнены
         if not (start_date_str and end_date_str):
             messagebox.showerror("Ошибка", "Введите начальную и конечную дату!")
-            return
+            return None
 
         try:
-            # Преобразование строк дат в объекты datetime
-            start_date = datetime.strptime(start_date_str, '%d.%m.%Y')
-            end_date = datetime.strptime(end_date_str, '%d.%m.%Y')
+            # Преобразование строк дат во временные метки
+            start_date = datetime.strptime(start_date_str, DAY_FORMAT)
+            end_date = datetime.strptime(end_date_str, DAY_FORMAT)
         except ValueError:
             messagebox.showerror("Ошибка", "Неверный формат даты! Используйте формат дд.мм.гггг.")
-            return
+            return None
 
-        # Проверка, что начальная дата не позже конечной даты
-        if start_date > end_date:
+        try:
+            # Проверка, что начальная дата не позже конечной даты
+            start, end = day_range(start_date, end_date)
+        except ValueError:
             messagebox.showerror("Ошибка", "Начальная дата не может быть позже конечной даты!")
-            return
-
-        # Загрузка данных о тренировках
-        data = load_data()
+            return None
 
-        # Фильтрация записей по дате и упражнению
-        filtered_data = [entry for entry in data if
-                         start_date.date() <= datetime.strptime(entry['date'],
-                                                                '%d.%m.%Y %H:%M:%S').date() <= end_date.date() and
-                         (not exercise_filter or entry['exercise'].lower() == exercise_filter.lower())]
+        return start, end, exercise_filter
 
-        # Сортировка записей по дате в порядке от последней к первой
-        filtered_data.sort(key=lambda x: datetime.strptime(x['date'], '%d.%m.%Y %H:%M:%S'), reverse=True)
-
-        # Проверка на существование записей, соответствующих фильтру
-        if not filtered_data:
-            messagebox.showinfo("Информация", "В заданный период упражнения не найдены.")
+    def apply_filters(self):
+        """
+        Применение фильтров по дате и упражнению.
+        """
+        filter_range = self.get_filter_range()
+        if filter_range is None:
             return
 
-        # Создание нового окна для отображения отфильтрованных записей
-        records_window = Toplevel(self.root)
-        records_window.title("Отфильтрованные записи тренировок")
-
-        # Создание таблицы для отображения данных
-        tree = ttk.Treeview(records_window, columns=("Дата", "Упражнение", "Вес", "Повторения"), show="headings")
-
-        # Установка заголовков столбцов
-        tree.heading('Дата', text="Дата")
-        tree.heading('Упражнение', text="Упражнение")
-        tree.heading('Вес', text="Вес")
-        tree.heading('Повторения', text="Повторения")
-
-        # Заполнение таблицы данными из отфильтрованных записей
-        for entry in filtered_data:
-            tree.insert('', tk.END, values=(entry['date'], entry['exercise'], entry['weight'], entry['repetitions']))
-
-        # Размещение таблицы в окне с растягиванием на всю доступную область
-        tree.pack(expand=True, fill=tk.BOTH)
-
-        # Добавление кнопок для редактирования и удаления записей
-        edit_button = ttk.Button(records_window, text="Редактировать", command=lambda: self.edit_entry(tree))
-        edit_button.pack(side=tk.LEFT, padx=5, pady=5)
-
-        delete_button = ttk.Button(records_window, text="Удалить", command=lambda: self.delete_entry(tree))
-        delete_button.pack(side=tk.LEFT, padx=5, pady=5)
+        # Выборка записей по дате и упражнению через индекс в фоне; повторное нажатие кнопки
+        # отменяет предыдущий незавершенный запрос
+        self.tasks.submit(lambda cancel_event: self.query_records(*filter_range),
+                          lambda data, error: self.on_records_loaded("Отфильтрованные записи тренировок",
+                                                                     data, error, filter_range),
+                          key='filter', name='filter')
 
     def export_to_csv(self):
         """
-        Экспорт данных в CSV файл.
+        Экспорт данных в CSV файл или в резервную копию в двоичном формате.
         """
-        # Загрузка данных о тренировках
-        data = load_data()
-
         # Открытие диалогового окна для выбора места сохранения файла
-        file_path = filedialog.asksaveasfilename(defaultextension=".csv",
-                                                 filetypes=[("CSV files", "*.csv"), ("All files", "*.*")])
+        file_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=data_file_types())
 
         if not file_path:
             return
 
-        # Запись данных в CSV файл
-        with open(file_path, mode='w', newline='') as file:
-            writer = csv.writer(file)
-            writer.writerow(["Дата", "Упражнение", "Вес", "Повторения"])  # Запись заголовков столбцов
-            for entry in data:
-                writer.writerow([entry['date'], entry['exercise'], entry['weight'], entry['repetitions']])
+        # Выбор экспортируемых записей: все или только соответствующие фильтрам
+        use_filters = messagebox.askyesnocancel(
+            "Экспорт",
+            "Экспортировать только записи, соответствующие фильтрам по дате и упражнению?\n\n"
+            "Да — только отфильтрованные записи.\n"
+            "Нет — все записи журнала.")
+        if use_filters is None:
+            return
+
+        filter_range = ()
+        if use_filters:
+            filter_range = self.get_filter_range()
+            if filter_range is None:
+                return
+
+        # Выборка и запись файла (CSV или резервная копия по расширению) выполняются в фоновом потоке
+        # с отображением прогресса
+        def work(cancel_event):
+            self.repository.refresh_if_changed()
+            return export_records(self.repository, file_path, *filter_range, progress=progress_window.report,
+                                  cancel_event=cancel_event)
 
-        messagebox.showinfo("Успешно", "Данные успешно экспортированы в CSV файл.")
+        progress_window = ProgressWindow(self.root, "Экспорт")
+        self.tasks.submit(work, self.on_export_finished, progress_window=progress_window, name='export')
+
+    def on_export_finished(self, result, error):
+        """
+        Завершение экспорта: вывод итогов.
+
+        Args:
+            result (tuple): Признак полной записи файла и количество экспортируемых записей (None при ошибке).
+            error (Exception): Ошибка экспорта или None.
+        """
+        if error is not None:
+            messagebox.showerror("Ошибка", f"Не удалось экспортировать данные: {error}")
+            return
+        completed, count = result
+        if not completed:
+            messagebox.showinfo("Информация", "Экспорт прерван, файл не сохранен.")
+        else:
+            messagebox.showinfo("Успешно", f"Данные успешно экспортированы.\nЗаписей: {count}.")
 
     def import_from_csv(self):
         """
-        Импорт данных из CSV файла.
+        Импорт данных из CSV файла или из резервной копии в двоичном формате.
         """
         # Открытие диалогового окна для выбора файла для импорта
-        file_path = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv"), ("All files", "*.*")])
+        file_path = filedialog.askopenfilename(filetypes=data_file_types())
 
         if not file_path:
             return
 
-        # Чтение данных из CSV файла
-        with open(file_path, mode='r') as file:
-            reader = csv.reader(file)
-            next(reader)  # Пропуск заголовков столбцов
-            data = []
-            for row in reader:
-                date, exercise, weight, repetitions = row
-                try:
-                    # Попытка преобразовать дату в формат %d.%m.%Y %H:%M:%S
-                    datetime.strptime(date, '%d.%m.%Y %H:%M:%S')
-                except ValueError:
-                    # Если формат даты отличается, приводим его к %d.%m.%Y %H:%M:%S
-                    date = datetime.strptime(date, '%Y-%m-%d %H:%M:%S').strftime('%d.%m.%Y %H:%M:%S')
-
-                data.append({
-                    'date': date,
-                    'exercise': exercise,
-                    'weight': weight,
-                    'repetitions': repetitions
-                })
-
-        # Сохранение импортированных данных
-        save_data(data)
+        # Выбор режима: объединение с журналом или замена журнала
+        merge = messagebox.askyesnocancel(
+            "Импорт",
+            "Объединить данные из файла с журналом?\n\n"
+            "Да — добавить новые записи, пропуская уже имеющиеся.\n"
+            "Нет — заменить журнал данными из файла.")
+        if merge is None:
+            return
+
+        # Импорт (из CSV или резервной копии по расширению) выполняется в фоновом потоке с отображением прогресса
+        progress_window = ProgressWindow(self.root, "Импорт")
+        self.tasks.submit(
+            lambda cancel_event: import_records(self.repository, file_path, merge=merge,
+                                                progress=progress_window.report, cancel_event=cancel_event),
+            self.on_import_finished, progress_window=progress_window, name='import')
 
+    def on_import_finished(self, result, error):
+        """
+        Завершение импорта из CSV файла: обновление интерфейса и вывод итогов.
+
+        Args:
+            result (ImportResult): Результат импорта (None при ошибке).
+            error (Exception): Ошибка импорта или None.
+        """
         # Обновление выпадающего списка упражнений
         self.update_exercise_filter_combobox()
 
-        messagebox.showinfo("Успешно", "Данные успешно импортированы из CSV файла.")
+        if error is not None:
+            messagebox.showerror("Ошибка", f"Не удалось импортировать данные: {error}")
+            return
+        if result.cancelled:
+            messagebox.showinfo("Информация", f"Импорт прерван. Добавлено записей: {result.added}.")
+            return
 
-    def save_changes(self, tree, edit_window, selected_item, exercise_entry, weight_entry, repetitions_entry):
+        message = f"Данные успешно импортированы.\nДобавлено записей: {result.added}."
+        if result.duplicates:
+            message += f"\nПропущено дубликатов: {result.duplicates}."
+        if result.invalid:
+            message += f"\nПропущено некорректных строк: {result.invalid}.\n" + "\n".join(result.errors)
+        messagebox.showinfo("Успешно", message)
+
+    def save_changes(self, table, edit_window, entry_id, exercise_entry, weight_entry, repetitions_entry):
         """
         Сохранение изменений в выбранной записи.
         """
@@ -408,29 +1430,44 @@ class TrainingLogApp:
             messagebox.showerror("Ошибка", "Все поля должны быть заполнены!")
             return
 
-        # Обновление данных в таблице
-        tree.item(selected_item,
-                  values=(tree.item(selected_item)['values'][0], new_exercise, new_weight, new_repetitions))
+        try:
+            # Преобразование веса и повторений в числа
+            new_weight = parse_weight(new_weight)
+            new_repetitions = parse_repetitions(new_repetitions)
+        except ValueError:
+            messagebox.showerror("Ошибка", "Вес и количество повторений должны быть неотрицательными числами!")
+            return
 
-        # Сохранение изменений в файл
-        self.save_table_data(tree)
+        # Изменение записи по идентификатору; в журнал дописывается только строка изменения
+        record = self.repository.update(entry_id, {'exercise': new_exercise, 'weight': new_weight,
+                                                   'repetitions': new_repetitions})
+        if record is None:
+            messagebox.showerror("Ошибка", "Запись не найдена: возможно, она была удалена.")
+            return
+
+        # Обновление только измененной строки таблицы
+        table.update_row(record)
+        self.update_exercise_filter_combobox()
 
         edit_window.destroy()
         messagebox.showinfo("Успешно", "Запись успешно отредактирована!")
 
-    def edit_entry(self, tree):
+    def edit_entry(self, table):
         """
         Редактирование выбранной записи.
         """
-        # Получение выбранной записи
-        selected_item = tree.selection()
-        if not selected_item:
+        # Получение идентификатора выбранной записи
+        entry_id = table.selected_id()
+        if entry_id is None:
             messagebox.showerror("Ошибка", "Выберите запись для редактирования!")
             return
 
         # Получение данных выбранной записи
-        values = tree.item(selected_item)['values']
-        date, exercise, weight, repetitions = values
+        record = self.repository.get(entry_id)
+        if record is None:
+            messagebox.showerror("Ошибка", "Запись не найдена: возможно, она была удалена.")
+            return
+        date, exercise, weight, repetitions = record.display_values()
 
         # Создание нового окна для редактирования записи
         edit_window = Toplevel(self.root)
@@ -438,8 +1475,9 @@ class TrainingLogApp:
 
         # Виджеты для редактирования данных
         ttk.Label(edit_window, text="Упражнение:").grid(row=0, column=0, padx=5, pady=5)
-        exercise_entry = ttk.Entry(edit_window)
+        exercise_entry = ttk.Combobox(edit_window)
         exercise_entry.insert(0, exercise)
+        ExerciseAutocomplete(exercise_entry, self.repository)
         exercise_entry.grid(row=0, column=1, padx=5, pady=5)
 
         ttk.Label(edit_window, text="Вес:").grid(row=1, column=0, padx=5, pady=5)
@@ -454,191 +1492,355 @@ class TrainingLogApp:
 
         # Кнопка для сохранения изменений
         save_button = ttk.Button(edit_window, text="Сохранить",
-                                 command=lambda: self.save_changes(tree, edit_window, selected_item, exercise_entry,
+                                 command=lambda: self.save_changes(table, edit_window, entry_id, exercise_entry,
                                                                    weight_entry, repetitions_entry))
         save_button.grid(row=3, columnspan=2, pady=10)
 
-    def delete_entry(self, tree):
+    def delete_entry(self, table):
         """
         Удаление выбранной записи.
         """
-        # Получение выбранной записи
-        selected_item = tree.selection()
-        if not selected_item:
+        # Получение идентификатора выбранной записи
+        entry_id = table.selected_id()
+        if entry_id is None:
             messagebox.showerror("Ошибка", "Выберите запись для удаления!")
             return
 
-        # Удаление записи из таблицы
-        tree.delete(selected_item)
+        # Удаление записи по идентификатору; в журнал дописывается только отметка об удалении
+        deleted = self.repository.delete(entry_id)
 
-        # Сохранение изменений в файл
-        self.save_table_data(tree)
+        # Удаление только этой строки из таблицы (строка убирается и тогда, когда запись уже удалена
+        # другим процессом)
+        table.delete_row(entry_id)
+        if not deleted:
+            messagebox.showerror("Ошибка", "Запись не найдена: возможно, она была удалена.")
+            return
+        self.update_exercise_filter_combobox()
 
         messagebox.showinfo("Успешно", "Запись успешно удалена!")
 
     def view_exercise_stats(self):
         """
-        Просмотр статистики по выполненным упражнениям.
+        Просмотр статистики по выполненным упражнениям за все время или по периодам.
         """
-        # Загрузка данных о тренировках
-        data = load_data()
-
-        # Словарь для хранения статистики по упражнениям
-        stats = {}
-
-        for entry in data:
-            exercise = entry['exercise']
-            weight = float(entry['weight'])
-            repetitions = int(entry['repetitions'])
-
-            if exercise not in stats:
-                stats[exercise] = {
-                    'total_weight': 0,
-                    'total_repetitions': 0,
-                    'total_sets': 0,
-                    'max_weight': 0,
-                    'max_repetitions': 0
-                }
-
-            stats[exercise]['total_weight'] += weight * repetitions
-            stats[exercise]['total_repetitions'] += repetitions
-            stats[exercise]['total_sets'] += 1
-
-            if weight > stats[exercise]['max_weight']:
-                stats[exercise]['max_weight'] = weight
-
-            if repetitions > stats[exercise]['max_repetitions']:
-                stats[exercise]['max_repetitions'] = repetitions
-
         # Создание нового окна для отображения статистики
         stats_window = Toplevel(self.root)
         stats_window.title("Статистика по упражнениям")
 
+        # Выпадающий список для выбора группировки по периодам
+        period_combobox = ttk.Combobox(stats_window, state="readonly", values=list(STATS_PERIODS))
+        period_combobox.current(0)
+        period_combobox.pack(anchor=tk.W, padx=5, pady=5)
+
         # Создание таблицы для отображения данных
-        tree = ttk.Treeview(stats_window, columns=("Упражнение", "Всего вес", "Всего повторений", "Всего подходов",
-                                                   "Макс. вес", "Макс. повторений"), show="headings")
+        tree = ttk.Treeview(stats_window, columns=("Период", "Упражнение", "Всего вес", "Всего повторений",
+                                                   "Всего подходов", "Макс. вес", "Макс. повторений",
+                                                   "Оценка 1ПМ"),
+                            show="headings")
 
         # Установка заголовков столбцов
+        tree.heading('Период', text="Период")
         tree.heading('Упражнение', text="Упражнение")
         tree.heading('Всего вес', text="Всего вес")
         tree.heading('Всего повторений', text="Всего повторений")
         tree.heading('Всего подходов', text="Всего подходов")
         tree.heading('Макс. вес', text="Макс. вес")
         tree.heading('Макс. повторений', text="Макс. повторений")
+        tree.heading('Оценка 1ПМ', text="Оценка 1ПМ")
 
-        # Заполнение таблицы данными из статистики
-        for exercise, stat in stats.items():
-            tree.insert('', tk.END, values=(exercise, stat['total_weight'], stat['total_repetitions'],
-                                            stat['total_sets'], stat['max_weight'], stat['max_repetitions']))
+        # Заполнение таблицы при выборе периода
+        period_combobox.bind("<<ComboboxSelected>>",
+                             lambda event: self.fill_stats_table(tree, STATS_PERIODS[period_combobox.get()]))
+        self.fill_stats_table(tree, None)
 
         # Размещение таблицы в окне с растягиванием на всю доступную область
         tree.pack(expand=True, fill=tk.BOTH)
 
-    def view_progress(self):
+        # Итоги поддерживаются репозиторием, поэтому при изменении журнала другим процессом
+        # таблица заполняется заново без пересчета
+        self.register_view(stats_window,
+                           lambda: self.fill_stats_table(tree, STATS_PERIODS[period_combobox.get()]))
+
+    def fill_stats_table(self, tree, period):
         """
-        Просмотр прогресса по выполненным упражнениям.
+        Заполнение таблицы статистики итогами за все время или по периодам.
+
+        Итоги поддерживаются репозиторием при каждом изменении записей, поэтому заполнение
+        не зависит от длины истории тренировок. Строки готовятся в фоне; при быстром
+        переключении периода предыдущий незавершенный запрос отменяется.
+
+        Args:
+            tree (ttk.Treeview): Таблица статистики.
+            period (str): Период группировки (PERIOD_DAY, PERIOD_WEEK, PERIOD_MONTH) или None для итогов за все время.
         """
-        # Загрузка данных о тренировках
-        data = load_data()
+        self.tasks.submit(lambda cancel_event: self.stats_rows(period),
+                          lambda rows, error: self.on_stats_ready(tree, period, rows, error),
+                          key=('stats', str(tree)), name='stats')
 
-        # Получение значений из полей ввода дат
-        start_date_str = self.start_date_entry.get_date().strftime('%d.%m.%Y')
-        end_date_str = self.end_date_entry.get_date().strftime('%d.%m.%Y')
+    def stats_rows(self, period):
+        """
+        Подготовка строк таблицы статистики (выполняется в фоновом потоке).
 
-        # Получение значения из поля ввода фильтра по упражнению
-        exercise_filter = self.exercise_filter_combobox.get()
+        Args:
+            period (str): Период группировки или None для итогов за все время.
 
-        # Проверка, что оба поля даты заполнены
-        if not (start_date_str and end_date_str):
-            messagebox.showerror("Ошибка", "Введите начальную и конечную дату!")
-            return
+        Returns:
+            list: Значения строк таблицы.
+        """
+        # Перечитывание данных, если файл изменен извне
+        self.repository.refresh_if_changed()
 
-        try:
-            # Преобразование строк дат в объекты datetime
-            start_date = datetime.strptime(start_date_str, '%d.%m.%Y')
-            end_date = datetime.strptime(end_date_str, '%d.%m.%Y')
-        except ValueError:
-            messagebox.showerror("Ошибка", "Неверный формат даты! Используйте формат дд.мм.гггг.")
+        # Итоги и оценка одноповторного максимума (по формуле Эпли) по лучшему подходу упражнения за период
+        return [('' if start is None else format_timestamp(start, PERIOD_FORMATS[period]), exercise,
+                 stat.total_weight, stat.total_repetitions, stat.total_sets, stat.max_weight, stat.max_repetitions,
+                 round(one_rep_max, 1))
+                for start, exercise, stat, one_rep_max in stats_table(self.repository, period)]
+
+    def on_stats_ready(self, tree, period, rows, error):
+        """
+        Заполнение таблицы статистики подготовленными строками.
+
+        Args:
+            tree (ttk.Treeview): Таблица статистики.
+            period (str): Период группировки или None для итогов за все время.
+            rows (list): Значения строк таблицы (None при ошибке).
+            error (Exception): Ошибка подготовки статистики или None.
+        """
+        if error is not None:
+            messagebox.showerror("Ошибка", f"Не удалось рассчитать статистику: {error}")
+            return
+        if not tree.winfo_exists():
+            # Окно статистики закрыто до завершения расчета
             return
 
-        # Проверка, что начальная дата не позже конечной даты
-        if start_date > end_date:
-            messagebox.showerror("Ошибка", "Начальная дата не может быть позже конечной даты!")
+        tree.delete(*tree.get_children())
+        # Столбец периода скрывается для итогов за все время
+        tree['displaycolumns'] = tree['columns'][1:] if period is None else tree['columns']
+
+        # Заполнение таблицы данными из статистики
+        with span('table.fill_stats'):
+            for values in rows:
+                tree.insert('', tk.END, values=values)
+
+    def view_personal_records(self):
+        """
+        Просмотр личных рекордов и трендов по упражнениям.
+        """
+        # Создание нового окна для отображения рекордов
+        records_window = Toplevel(self.root)
+        records_window.title("Личные рекорды")
+
+        # Создание таблицы для отображения данных
+        tree = ttk.Treeview(records_window, columns=("Упражнение", "Макс. вес", "Дата веса", "Лучшая оценка 1ПМ",
+                                                     "Дата 1ПМ", "Лучший объем", "Дата объема", "Тренировок",
+                                                     "Уровень 1ПМ", "Тренд 1ПМ"),
+                            show="headings")
+
+        # Установка заголовков столбцов
+        tree.heading('Упражнение', text="Упражнение")
+        tree.heading('Макс. вес', text="Макс. вес")
+        tree.heading('Дата веса', text="Дата")
+        tree.heading('Лучшая оценка 1ПМ', text="Лучшая оценка 1ПМ")
+        tree.heading('Дата 1ПМ', text="Дата")
+        tree.heading('Лучший объем', text="Лучший объем за тренировку")
+        tree.heading('Дата объема', text="Дата")
+        tree.heading('Тренировок', text="Тренировок")
+        tree.heading('Уровень 1ПМ', text="Уровень 1ПМ")
+        tree.heading('Тренд 1ПМ', text="Тренд 1ПМ, кг/нед")
+
+        # Размещение таблицы в окне с растягиванием на всю доступную область
+        tree.pack(expand=True, fill=tk.BOTH)
+
+        self.fill_records_table(tree)
+        self.register_view(records_window, lambda: self.fill_records_table(tree))
+
+    def fill_records_table(self, tree):
+        """
+        Заполнение таблицы личных рекордов (строки готовятся в фоне).
+
+        Args:
+            tree (ttk.Treeview): Таблица рекордов.
+        """
+        self.tasks.submit(lambda cancel_event: self.personal_record_rows(),
+                          lambda rows, error: self.on_personal_records_ready(tree, rows, error),
+                          key=('records', str(tree)), name='personal_records')
+
+    def personal_record_rows(self):
+        """
+        Подготовка строк таблицы личных рекордов (выполняется в фоновом потоке).
+
+        Returns:
+            list: Значения строк таблицы.
+        """
+        # Перечитывание данных, если файл изменен извне
+        self.repository.refresh_if_changed()
+
+        summary = self.repository.personal_records()
+        return [(exercise, format_weight(progress.max_weight), format_timestamp(progress.max_weight_at, DAY_FORMAT),
+                 round(progress.best_one_rep_max, 1), format_timestamp(progress.best_one_rep_max_at, DAY_FORMAT),
+                 format_weight(progress.best_volume),
+                 format_timestamp(progress.best_volume_day * SECONDS_PER_DAY, DAY_FORMAT),
+                 progress.sessions, round(progress.level, 1), round(progress.trend, 2))
+                for exercise, progress in sorted(summary.items())]
+
+    def on_personal_records_ready(self, tree, rows, error):
+        """
+        Заполнение таблицы личных рекордов подготовленными строками.
+
+        Args:
+            tree (ttk.Treeview): Таблица рекордов.
+            rows (list): Значения строк таблицы (None при ошибке).
+            error (Exception): Ошибка подготовки строк или None.
+        """
+        if error is not None:
+            messagebox.showerror("Ошибка", f"Не удалось рассчитать личные рекорды: {error}")
+            return
+        if not tree.winfo_exists():
+            # Окно рекордов закрыто до завершения расчета
             return
 
-        # Фильтрация записей по дате и упражнению
-        filtered_data = [entry for entry in data if
-                         start_date.date() <= datetime.strptime(entry['date'],
-                                                                '%d.%m.%Y %H:%M:%S').date() <= end_date.date() and
-                         (not exercise_filter or entry['exercise'].lower() == exercise_filter.lower())]
+        tree.delete(*tree.get_children())
+        with span('table.fill_records'):
+            for values in rows:
+                tree.insert('', tk.END, values=values)
 
-        # Проверка на существование записей, соответствующих фильтру
-        if not filtered_data:
-            messagebox.showinfo("Информация", "В заданный период упражнения не найдены.")
+    def view_progress(self):
+        """
+        Просмотр прогресса по выполненным упражнениям.
+        """
+        filter_range = self.get_filter_range()
+        if filter_range is None:
             return
 
-        # Словарь для хранения данных для графика
-        progress_data = {}
+        # Выборка записей и построение графика выполняются в фоне; повторное нажатие кнопки
+        # отменяет предыдущий незавершенный запрос
+        self.tasks.submit(lambda cancel_event: self.prepare_progress_figure(*filter_range, cancel_event),
+                          self.on_progress_ready, key='progress', name='progress')
 
-        for entry in filtered_data:
-            exercise = entry['exercise']
-            date_time = datetime.strptime(entry['date'], '%d.%m.%Y %H:%M:%S')
-            weight = float(entry['weight'])
-            repetitions = int(entry['repetitions'])
+    def prepare_progress_figure(self, start, end, exercise_filter, cancel_event):
+        """
+        Выборка записей и построение графика прогресса (выполняется в фоновом потоке).
 
-            if exercise not in progress_data:
-                progress_data[exercise] = {'dates': [], 'weights': [], 'repetitions': []}
+        Построенный график кэшируется по периоду, фильтру упражнения и версии данных, поэтому
+        повторный просмотр того же графика не требует выборки и построения.
 
-            progress_data[exercise]['dates'].append(date_time)
-            progress_data[exercise]['weights'].append(weight)
-            progress_data[exercise]['repetitions'].append(repetitions)
+        Args:
+            start (int): Начало периода (временная метка, включительно).
+            end (int): Конец периода (временная метка, не включительно).
+            exercise_filter (str): Название упражнения или пустая строка для всех упражнений.
+            cancel_event (threading.Event): Событие отмены построения.
+
+        Returns:
+            plotly.graph_objs.Figure: График или None, если записей нет или построение отменено.
+        """
+        # Перечитывание данных, если файл изменен извне
+        self.repository.refresh_if_changed()
+        key = (start, end, exercise_filter.lower(), self.repository.version)
+        fig = self.figure_cache.get(key)
+        if fig is not None:
+            return fig
+
+        # Выборка записей по дате и упражнению через индекс в виде столбцов в хронологическом порядке
+        columns = self.repository.columns(start, end, exercise_filter)
+
+        # Проверка на существование записей, соответствующих фильтру
+        if not len(columns) or cancel_event.is_set():
+            return None
+
+        # Ряды данных по каждому упражнению (длинные ряды прореживаются при построении графика)
+        from journal_analytics import progress_series
+        from journal_charts import build_progress_figure
+        with span('chart.build'):
+            fig = build_progress_figure(progress_series(columns))
+        self.figure_cache.put(key, fig)
+        return fig
+
+    def on_progress_ready(self, fig, error):
+        """
+        Отображение построенного графика прогресса.
+
+        Args:
+            fig (plotly.graph_objs.Figure): График или None, если записей нет.
+            error (Exception): Ошибка построения графика или None.
+        """
+        if error is not None:
+            messagebox.showerror("Ошибка", f"Не удалось построить график: {error}")
+            return
+        if fig is None:
+            messagebox.showinfo("Информация", "В заданный период упражнения не найдены.")
+            return
 
         # Создание нового окна для отображения прогресса
         progress_window = Toplevel(self.root)
         progress_window.title("Прогресс по упражнениям")
 
-        # Создание фигуры для графика
-        fig = make_subplots(specs=[[{"secondary_y": True}]])
-
-        # Отображение графика для каждого упражнения
-        for exercise, data in progress_data.items():
-            fig.add_trace(
-                go.Scatter(x=data['dates'], y=data['weights'], mode='lines+markers', name=f"{exercise} - Вес"),
-                secondary_y=False,
-            )
-            fig.add_trace(
-                go.Scatter(x=data['dates'], y=data['repetitions'], mode='lines+markers',
-                           name=f"{exercise} - Повторения"),
-                secondary_y=True,
-            )
-
-        # Настройка графика
-        fig.update_layout(
-            title='Прогресс по упражнениям',
-            xaxis_title='Дата и время',
-            legend_title='Упражнения',
-            template='plotly_white'
-        )
-
-        fig.update_yaxes(title_text="Вес", secondary_y=False)
-        fig.update_yaxes(title_text="Повторения", secondary_y=True)
-
-        # Размещение графика в окне
-        pio.show(fig, filename='progress_plot.html', auto_open=True)
-
-
-def main():
+        # Размещение графика в окне (запись HTML файла выполняется в фоне)
+        self.tasks.submit(lambda cancel_event: self.show_progress_figure(fig), self.on_figure_shown, name='chart')
+
+    @staticmethod
+    def show_progress_figure(fig):
+        """
+        Запись графика прогресса в HTML файл и открытие его в браузере (выполняется в фоновом потоке).
+
+        Args:
+            fig (plotly.graph_objs.Figure): График.
+        """
+        from journal_charts import show_figure
+        show_figure(fig, 'progress_plot.html')
+
+    def on_figure_shown(self, result, error):
+        """
+        Проверка результата записи файла графика.
+
+        Args:
+            result: Не используется.
+            error (Exception): Ошибка записи файла или None.
+        """
+        if error is not None:
+            messagebox.showerror("Ошибка", f"Не удалось открыть график: {error}")
+
+
+def main(argv=None):
     """
     Основная функция для запуска приложения.
+
+    Args:
+        argv (list): Аргументы командной строки (по умолчанию sys.argv[1:]).
     """
+    parser = argparse.ArgumentParser(description="Дневник тренировок.")
+    parser.add_argument('--startup-timing', action='store_true',
+                        help="вывести длительность этапов запуска (импорт модулей, создание окна, загрузка журнала)")
+    parser.add_argument('--diagnostics', action='store_true',
+                        help="включить замеры времени и счетчики горячих участков и окно диагностики")
+    parser.add_argument('--diagnostics-file', metavar='PATH',
+                        help="сохранить замеры в JSON файл при закрытии приложения (включает замеры)")
+    parser.add_argument('--profile-dir', metavar='DIR',
+                        help="выполнять фоновые операции под cProfile и сохранять файлы .pstats в каталог")
+    args = parser.parse_args(argv)
+    instrumentation.enabled = bool(args.diagnostics or args.diagnostics_file or args.profile_dir)
+    instrumentation.profile_dir = args.profile_dir
+    timer = StartupTimer(STARTUP_STARTED, enabled=args.startup_timing, parts=2)
+    timer.record("импорт модулей", STARTUP_STARTED, IMPORTS_FINISHED)
+
     # Создание основного окна приложения
+    start = time.perf_counter()
     root = tk.Tk()
+    timer.record("создание Tk", start)
 
     # Создание экземпляра класса TrainingLogApp с передачей ему основного окна
-    app = TrainingLogApp(root)
+    app = TrainingLogApp(root, timer)
 
     # Запуск главного цикла обработки событий Tkinter
-    root.mainloop()
+    try:
+        root.mainloop()
+    finally:
+        try:
+            # Запись накопленных изменений, если окно закрыто не кнопкой закрытия (например, по Ctrl+C);
+            # после on_close репозиторий уже закрыт, и повторное закрытие ничего не делает
+            app.repository.close()
+        finally:
+            if args.diagnostics_file:
+                instrumentation.dump(args.diagnostics_file)
 
 
 if __name__ == "__main__":
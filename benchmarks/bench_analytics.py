@@ -0,0 +1,93 @@
+"""
+Замер времени расчета итогов по упражнениям и периодам.
+
+Сравнивается перебор записей в Python (StatsAggregator.rebuild) с векторизованным расчетом
+на NumPy (journal_analytics.aggregate) на синтетических журналах разного размера; перед
+замером проверяется, что результаты совпадают.
+
+Запуск: python benchmarks/bench_analytics.py [размер ...]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_date_index import generate_records  # noqa: E402
+from journal_analytics import RecordColumns, aggregate, best_one_rep_max, weekly_volume  # noqa: E402
+from journal_stats import PERIODS, StatsAggregator  # noqa: E402
+
+# Размеры журналов по умолчанию
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+
+
+def python_aggregate(records):
+    """
+    Расчет итогов перебором записей в Python.
+    """
+    stats = StatsAggregator()
+    stats.rebuild(records)
+    return stats.totals, stats.buckets
+
+
+def numpy_aggregate(records):
+    """
+    Векторизованный расчет итогов, включая построение столбцов.
+    """
+    return aggregate(RecordColumns.from_records(records))
+
+
+def same_totals(left, right):
+    """
+    Проверка совпадения итогов (упражнение -> ExerciseStats).
+    """
+    return left.keys() == right.keys() and all(left[key].to_json() == right[key].to_json() for key in left)
+
+
+def check_identical(records):
+    """
+    Проверка, что оба способа дают одинаковые итоги.
+    """
+    totals, buckets = python_aggregate(records)
+    vector_totals, vector_buckets = numpy_aggregate(records)
+    assert same_totals(totals, vector_totals), "Итоги за все время не совпадают"
+    for period in PERIODS:
+        assert buckets[period].keys() == vector_buckets[period].keys(), f"Периоды {period} не совпадают"
+        for start, bucket in buckets[period].items():
+            assert same_totals(bucket, vector_buckets[period][start]), f"Итоги {period} {start} не совпадают"
+
+
+def run(size, repeat=3):
+    """
+    Замер времени для журнала заданного размера.
+    """
+    records = generate_records(size)
+    check_identical(records)
+    python_time = min(timeit.repeat(lambda: python_aggregate(records), number=1, repeat=repeat))
+    numpy_time = min(timeit.repeat(lambda: numpy_aggregate(records), number=1, repeat=repeat))
+    columns = RecordColumns.from_records(records)
+    derived_time = min(timeit.repeat(lambda: (best_one_rep_max(columns), weekly_volume(columns)),
+                                     number=1, repeat=repeat))
+    print(f"{size:>9} записей: Python {python_time * 1000:9.1f} мс, NumPy {numpy_time * 1000:8.1f} мс "
+          f"(x{python_time / numpy_time:.1f}), 1ПМ и недельный объем {derived_time * 1000:6.1f} мс")
+
+
+def main(argv=None):
+    """
+    Запуск замеров для размеров из командной строки или размеров по умолчанию.
+
+    Args:
+        argv (list): Аргументы командной строки (по умолчанию sys.argv[1:]).
+    """
+    parser = argparse.ArgumentParser(description="Сравнение расчета итогов перебором записей и на NumPy.")
+    parser.add_argument('sizes', type=int, nargs='*', help="размеры журналов (по умолчанию "
+                                                           + ", ".join(map(str, DEFAULT_SIZES)) + ")")
+    args = parser.parse_args(argv)
+    for size in args.sizes or DEFAULT_SIZES:
+        run(size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Замер времени выборки записей за период через индекс по дате.
+
+Сравнивается прежний способ (полный просмотр с разбором даты и последующая сортировка)
+с выборкой через индекс SortedRecordIndex на синтетических журналах разного размера.
+
+Запуск: python benchmarks/bench_date_index.py [размер ...]
+"""
+
+import argparse
+import os
+import random
+import sys
+import timeit
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from journal_index import SortedRecordIndex  # noqa: E402
+from journal_model import (DAY_FORMAT, SECONDS_PER_DAY, TrainingRecord, datetime_to_timestamp,  # noqa: E402
+                           format_timestamp)
+
+# Размеры журналов по умолчанию
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+
+# Упражнения синтетического журнала
+EXERCISES = ('Жим лежа', 'Присед', 'Становая тяга', 'Подтягивания', 'Жим стоя', 'Тяга в наклоне')
+
+# Начало синтетического журнала и средний интервал между подходами
+START = datetime_to_timestamp(datetime(2015, 1, 1))
+STEP = 600
+
+
+def generate_records(count, seed=1):
+    """
+    Генерация синтетических записей, упорядоченных по дате.
+
+    Args:
+        count (int): Количество записей.
+        seed (int): Начальное значение генератора случайных чисел.
+
+    Returns:
+        list: Записи TrainingRecord.
+    """
+    rng = random.Random(seed)
+    timestamp = START
+    records = []
+    for entry_id in range(1, count + 1):
+        timestamp += rng.randint(1, 2 * STEP)
+        records.append(TrainingRecord(entry_id, timestamp, rng.choice(EXERCISES),
+                                      float(rng.randint(20, 200)), rng.randint(1, 15)))
+    return records
+
+
+def linear_query(data, start, end, exercise):
+    """
+    Прежний способ выборки: просмотр всех записей с разбором даты и сортировка результата.
+    """
+    start_date = datetime.strptime(start, '%d.%m.%Y')
+    end_date = datetime.strptime(end, '%d.%m.%Y')
+    filtered = [entry for entry in data if
+                start_date.date() <= datetime.strptime(entry['date'], '%d.%m.%Y %H:%M:%S').date() <= end_date.date()
+                and (not exercise or entry['exercise'].lower() == exercise.lower())]
+    filtered.sort(key=lambda x: datetime.strptime(x['date'], '%d.%m.%Y %H:%M:%S'), reverse=True)
+    return filtered
+
+
+def best_time(function, repeat):
+    """
+    Минимальное время выполнения функции из нескольких запусков.
+
+    Returns:
+        float: Время в миллисекундах.
+    """
+    return min(timeit.repeat(function, number=1, repeat=repeat)) * 1000
+
+
+def run(size):
+    """
+    Замер выборки за последний месяц журнала по одному упражнению и по всем упражнениям.
+
+    Args:
+        size (int): Количество записей.
+    """
+    records = generate_records(size)
+    last_day = records[-1].timestamp // SECONDS_PER_DAY * SECONDS_PER_DAY
+    start, end = last_day - 30 * SECONDS_PER_DAY, last_day + SECONDS_PER_DAY
+
+    by_date = SortedRecordIndex(records)
+    by_exercise = {}
+    for record in records:
+        by_exercise.setdefault(record.exercise.lower(), []).append(record)
+    by_exercise = {key: SortedRecordIndex(group) for key, group in by_exercise.items()}
+
+    exercise = EXERCISES[0]
+    found = len(by_exercise[exercise.lower()].range(start, end))
+    indexed_all = best_time(lambda: by_date.range(start, end), 20)
+    indexed_one = best_time(lambda: by_exercise[exercise.lower()].range(start, end), 20)
+
+    line = f"{size:>10,} записей | найдено {found:>5} | индекс: все {indexed_all:8.3f} мс, упражнение {indexed_one:8.3f} мс"
+    if size <= 100_000:
+        # Прежний способ на миллионе записей занимает десятки секунд, поэтому замеряется только на малых размерах
+        data = [record.to_json() for record in records]
+        start_text = format_timestamp(start, DAY_FORMAT)
+        end_text = format_timestamp(end - SECONDS_PER_DAY, DAY_FORMAT)
+        assert len(linear_query(data, start_text, end_text, exercise)) == found
+        linear = best_time(lambda: linear_query(data, start_text, end_text, exercise), 3)
+        line += f" | полный просмотр {linear:10.1f} мс"
+    print(line)
+
+
+def main(argv=None):
+    """
+    Запуск замеров для размеров из командной строки или размеров по умолчанию.
+
+    Args:
+        argv (list): Аргументы командной строки (по умолчанию sys.argv[1:]).
+    """
+    parser = argparse.ArgumentParser(description="Замер выборки за период через индекс и полным просмотром.")
+    parser.add_argument('sizes', type=int, nargs='*', help="размеры журналов (по умолчанию "
+                                                           + ", ".join(map(str, DEFAULT_SIZES)) + ")")
+    args = parser.parse_args(argv)
+    for size in args.sizes or DEFAULT_SIZES:
+        run(size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,376 @@
+"""
+Набор замеров производительности основных операций дневника тренировок.
+
+На синтетических журналах разного размера (benchmarks/synthetic_journal.py) замеряются:
+    load     — загрузка журнала при запуске без сохраненных итогов (TrainingRepository.load);
+    filter   — выборка за последний год по упражнению (apply_filters);
+    stats    — итоги за все время и по неделям с оценкой максимума (view_exercise_stats);
+    progress — ряды данных графика прогресса с прореживанием (view_progress без построения графика);
+    cached   — повторные итоги и столбцы данных графика из кэша репозитория при неизменных данных;
+    import   — импорт CSV файла в пустой журнал с записью на диск (import_from_csv).
+
+Сценарии stats и progress очищают кэш выборок репозитория перед каждым запуском, поэтому
+замеряют расчет, а не поиск в кэше; попадания в кэш замеряет отдельный сценарий cached.
+
+Для каждого замера выводятся время (лучшее и медиана из нескольких запусков), пиковый объем
+выделенной памяти (tracemalloc, отдельным запуском) и пропускная способность в записях в секунду.
+Результаты сохраняются в JSON и могут сравниваться с результатами другой версии.
+
+Запуск:
+    python benchmarks/bench_suite.py [--sizes 1000 10000] [--output results.json] [--compare baseline.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic_journal import generate_records, write_journal  # noqa: E402
+from journal_analytics import downsample, progress_series  # noqa: E402
+from journal_backends import open_storage  # noqa: E402
+from journal_charts import MAX_POINTS_PER_SERIES  # noqa: E402
+from journal_core import stats_table  # noqa: E402
+from journal_csv import export_csv, import_csv  # noqa: E402
+from journal_model import SECONDS_PER_DAY  # noqa: E402
+from journal_repository import TrainingRepository  # noqa: E402
+from journal_stats import PERIOD_WEEK  # noqa: E402
+
+# Размеры журналов по умолчанию
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+
+# Версия формата файла результатов
+RESULTS_FORMAT_VERSION = 1
+
+# Замедление относительно базовых результатов, начиная с которого замер считается ухудшением
+DEFAULT_THRESHOLD = 1.2
+
+
+class Measurement:
+    """
+    Замер времени и пикового объема памяти участка кода (используется как контекстный менеджер).
+    """
+
+    def __init__(self):
+        """
+        Инициализация пустого замера.
+        """
+        # Время выполнения в секундах и пиковый прирост выделенной памяти в байтах
+        self.elapsed = None
+        self.peak_memory = None
+        self._started = None
+        self._baseline = 0
+
+    def __enter__(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            self._baseline = tracemalloc.get_traced_memory()[0]
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.elapsed = time.perf_counter() - self._started
+        if tracemalloc.is_tracing():
+            self.peak_memory = max(tracemalloc.get_traced_memory()[1] - self._baseline, 0)
+        return False
+
+
+class BenchmarkContext:
+    """
+    Синтетический журнал одного размера и загруженный из него репозиторий.
+    """
+
+    def __init__(self, size, exercises, years, seed, directory):
+        """
+        Создание журнала и CSV файла с теми же записями.
+
+        Args:
+            size (int): Количество записей.
+            exercises (int): Количество упражнений.
+            years (float): Продолжительность истории в годах.
+            seed (int): Начальное значение генератора случайных чисел.
+            directory (str): Временный каталог для файлов замера.
+        """
+        self.size = size
+        self.directory = directory
+        self.records = generate_records(size, exercises, years, seed)
+        self.journal_path = os.path.join(directory, 'journal.jsonl')
+        self.csv_path = os.path.join(directory, 'journal.csv')
+        write_journal(self.journal_path, self.records)
+        export_csv(self.csv_path, self.records)
+
+        self.exercise = self.records[0].exercise
+        last_day = self.records[-1].timestamp // SECONDS_PER_DAY * SECONDS_PER_DAY
+        self.end = last_day + SECONDS_PER_DAY
+        self.start = self.end - 365 * SECONDS_PER_DAY
+        self.repository = TrainingRepository(open_storage(self.journal_path))
+        self.repository.load()
+
+    def close(self):
+        """
+        Закрытие репозитория.
+        """
+        self.repository.close()
+
+
+def remove_sidecars(path):
+    """
+    Удаление сохраненных итогов и списка упражнений, чтобы загрузка выполнялась как при первом запуске.
+
+    Args:
+        path (str): Путь к файлу журнала.
+    """
+    storage = open_storage(path)
+    for name in ('stats', 'exercises'):
+        try:
+            os.remove(storage.sidecar_path(name))
+        except FileNotFoundError:
+            pass
+
+
+def scenario_load(context, measurement):
+    """
+    Загрузка журнала с построением индексов и расчетом итогов.
+    """
+    remove_sidecars(context.journal_path)
+    repository = TrainingRepository(open_storage(context.journal_path))
+    try:
+        with measurement:
+            repository.load()
+    finally:
+        repository.close()
+        remove_sidecars(context.journal_path)
+
+
+def scenario_filter(context, measurement):
+    """
+    Выборка записей за последний год по одному упражнению и по всем упражнениям.
+    """
+    with measurement:
+        context.repository.query(context.start, context.end, context.exercise)
+        context.repository.query(context.start, context.end)
+
+
+def scenario_stats(context, measurement):
+    """
+    Таблицы итогов за все время и по неделям (расчет без кэша).
+    """
+    context.repository.cache.clear()
+    with measurement:
+        stats_table(context.repository)
+        stats_table(context.repository, PERIOD_WEEK)
+
+
+def scenario_progress(context, measurement):
+    """
+    Ряды данных графика прогресса по всем упражнениям с прореживанием до допустимого количества точек
+    (столбцы записей строятся без кэша).
+    """
+    context.repository.cache.clear()
+    with measurement:
+        series = progress_series(context.repository.columns())
+        for timestamps, weights, repetitions in series.values():
+            downsample(timestamps, weights, MAX_POINTS_PER_SERIES)
+            downsample(timestamps, repetitions, MAX_POINTS_PER_SERIES)
+
+
+def scenario_cached(context, measurement):
+    """
+    Повторные таблицы итогов и столбцы записей при неизменных данных (попадания в кэш выборок).
+    """
+    # Заполнение кэша вне замера
+    stats_table(context.repository)
+    stats_table(context.repository, PERIOD_WEEK)
+    context.repository.columns()
+    with measurement:
+        stats_table(context.repository)
+        stats_table(context.repository, PERIOD_WEEK)
+        context.repository.columns()
+
+
+def scenario_import(context, measurement):
+    """
+    Импорт CSV файла в пустой журнал с записью изменений на диск.
+    """
+    path = os.path.join(context.directory, 'import.jsonl')
+    repository = TrainingRepository(open_storage(path))
+    repository.load()
+    try:
+        with measurement:
+            import_csv(context.csv_path, repository, merge=True)
+            repository.flush()
+    finally:
+        repository.close()
+        os.remove(path)
+        remove_sidecars(path)
+
+
+SCENARIOS = {
+    'load': scenario_load,
+    'filter': scenario_filter,
+    'stats': scenario_stats,
+    'progress': scenario_progress,
+    'cached': scenario_cached,
+    'import': scenario_import,
+}
+
+
+def run_scenario(name, context, repeat):
+    """
+    Замер одного сценария: несколько запусков для времени и отдельный запуск под tracemalloc для памяти.
+
+    Args:
+        name (str): Название сценария.
+        context (BenchmarkContext): Журнал и репозиторий.
+        repeat (int): Количество запусков для замера времени.
+
+    Returns:
+        dict: Результат замера.
+    """
+    scenario = SCENARIOS[name]
+    # Первый запуск прогревает кэши и ленивые импорты и в результаты не входит
+    scenario(context, Measurement())
+    times = []
+    for _ in range(repeat):
+        measurement = Measurement()
+        scenario(context, measurement)
+        times.append(measurement.elapsed)
+
+    measurement = Measurement()
+    tracemalloc.start()
+    try:
+        scenario(context, measurement)
+    finally:
+        tracemalloc.stop()
+
+    best = min(times)
+    return {
+        'scenario': name,
+        'size': context.size,
+        'best_ms': best * 1000,
+        'median_ms': statistics.median(times) * 1000,
+        'peak_memory_mb': measurement.peak_memory / 2 ** 20,
+        'throughput': context.size / best if best > 0 else None,
+    }
+
+
+def git_revision():
+    """
+    Текущая ревизия репозитория для подписи результатов.
+
+    Returns:
+        str: Сокращенный хеш коммита или None, если git недоступен.
+    """
+    try:
+        output = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip() or None
+
+
+def compare(results, baseline, threshold):
+    """
+    Сравнение результатов с базовыми и вывод изменения времени.
+
+    Args:
+        results (list): Результаты текущего запуска.
+        baseline (dict): Содержимое файла базовых результатов.
+        threshold (float): Замедление, начиная с которого замер считается ухудшением.
+
+    Returns:
+        int: Количество ухудшившихся замеров.
+    """
+    previous = {(item['scenario'], item['size']): item for item in baseline['results']}
+    regressions = 0
+    print(f"\nСравнение с {baseline.get('label') or baseline.get('revision') or 'базовыми результатами'}:")
+    for item in results:
+        old = previous.get((item['scenario'], item['size']))
+        if old is None:
+            continue
+        ratio = item['best_ms'] / old['best_ms'] if old['best_ms'] else float('inf')
+        mark = ''
+        if ratio >= threshold:
+            mark = '  УХУДШЕНИЕ'
+            regressions += 1
+        print(f"{item['scenario']:>8} {item['size']:>10,} | {old['best_ms']:10.2f} мс -> {item['best_ms']:10.2f} мс"
+              f" | x{ratio:5.2f}{mark}")
+    return regressions
+
+
+def main(argv=None):
+    """
+    Запуск замеров из командной строки.
+
+    Args:
+        argv (list): Аргументы командной строки (по умолчанию sys.argv[1:]).
+
+    Returns:
+        int: Код завершения (1, если есть ухудшения относительно базовых результатов).
+    """
+    parser = argparse.ArgumentParser(description="Замеры производительности дневника тренировок.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="размеры журналов")
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS), help="сценарии")
+    parser.add_argument('--exercises', type=int, default=6, help="количество упражнений")
+    parser.add_argument('--years', type=float, default=5, help="продолжительность истории в годах")
+    parser.add_argument('--seed', type=int, default=1, help="начальное значение генератора случайных чисел")
+    parser.add_argument('--repeat', type=int, default=3, help="количество запусков каждого замера")
+    parser.add_argument('--label', help="подпись результатов (по умолчанию ревизия git)")
+    parser.add_argument('--output', help="файл для сохранения результатов в JSON")
+    parser.add_argument('--compare', help="файл базовых результатов для сравнения")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="замедление, начиная с которого замер считается ухудшением")
+    args = parser.parse_args(argv)
+
+    results = []
+    for size in args.sizes:
+        directory = tempfile.mkdtemp(prefix='journal-bench-')
+        try:
+            context = BenchmarkContext(size, args.exercises, args.years, args.seed, directory)
+            try:
+                for name in args.scenarios:
+                    result = run_scenario(name, context, args.repeat)
+                    results.append(result)
+                    print(f"{name:>8} {size:>10,} | лучшее {result['best_ms']:10.2f} мс"
+                          f" | медиана {result['median_ms']:10.2f} мс | память {result['peak_memory_mb']:8.2f} МБ"
+                          f" | {result['throughput']:14,.0f} записей/с")
+            finally:
+                context.close()
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    revision = git_revision()
+    report = {
+        'format': RESULTS_FORMAT_VERSION,
+        'label': args.label or revision,
+        'revision': revision,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': {'exercises': args.exercises, 'years': args.years, 'seed': args.seed, 'repeat': args.repeat},
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+        print(f"Результаты сохранены в {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""
+Генератор синтетических журналов тренировок для замеров производительности.
+
+Записи воспроизводимы: при одинаковых параметрах и начальном значении генератора
+получается один и тот же журнал. Вес в каждом упражнении постепенно растет, поэтому
+графики прогресса и оценки максимума похожи на реальные.
+
+Запуск: python benchmarks/synthetic_journal.py ПУТЬ [--records N] [--exercises N] [--years N] [--seed N]
+"""
+
+import argparse
+import os
+import random
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from journal_backends import open_storage  # noqa: E402
+from journal_model import TrainingRecord, datetime_to_timestamp  # noqa: E402
+
+# Упражнения синтетического журнала (при большем количестве добавляются пронумерованные упражнения)
+EXERCISES = ('Жим лежа', 'Присед', 'Становая тяга', 'Подтягивания', 'Жим стоя', 'Тяга в наклоне',
+             'Выпады', 'Отжимания на брусьях', 'Подъем на бицепс', 'Французский жим')
+
+# Конец истории синтетического журнала (фиксирован, чтобы журнал не зависел от даты запуска)
+END = datetime_to_timestamp(datetime(2025, 1, 1))
+
+# Количество секунд в году
+SECONDS_PER_YEAR = 365 * 86400
+
+
+def exercise_names(count):
+    """
+    Названия упражнений синтетического журнала.
+
+    Args:
+        count (int): Количество упражнений.
+
+    Returns:
+        list: Названия упражнений.
+    """
+    names = list(EXERCISES[:count])
+    names.extend(f"Упражнение {number}" for number in range(len(names) + 1, count + 1))
+    return names
+
+
+def generate_records(count, exercises=6, years=5, seed=1):
+    """
+    Генерация синтетических записей, упорядоченных по дате.
+
+    Args:
+        count (int): Количество записей.
+        exercises (int): Количество упражнений.
+        years (float): Продолжительность истории в годах.
+        seed (int): Начальное значение генератора случайных чисел.
+
+    Returns:
+        list: Записи TrainingRecord с идентификаторами от 1.
+    """
+    rng = random.Random(seed)
+    names = exercise_names(exercises)
+    # Начальный вес и прирост веса за всю историю для каждого упражнения
+    base = [rng.randint(20, 100) for _ in names]
+    gain = [rng.randint(10, 80) for _ in names]
+    span = int(years * SECONDS_PER_YEAR)
+    start = END - span
+    timestamps = sorted(start + rng.randrange(span) for _ in range(count))
+
+    records = []
+    for entry_id, timestamp in enumerate(timestamps, 1):
+        code = rng.randrange(exercises)
+        progress = (timestamp - start) / span
+        # Вес округляется до 2,5 кг, как на блинах штанги
+        weight = round((base[code] + gain[code] * progress + rng.uniform(-10, 10)) / 2.5) * 2.5
+        records.append(TrainingRecord(entry_id, timestamp, names[code], max(weight, 2.5), rng.randint(1, 15)))
+    return records
+
+
+def write_journal(path, records):
+    """
+    Запись синтетических записей в журнал или базу данных (по расширению файла).
+
+    Args:
+        path (str): Путь к файлу журнала или базы данных.
+        records (list): Записи TrainingRecord.
+    """
+    storage = open_storage(path)
+    try:
+        storage.rewrite(records)
+    finally:
+        storage.close()
+
+
+def main(argv=None):
+    """
+    Создание синтетического журнала из командной строки.
+
+    Args:
+        argv (list): Аргументы командной строки (по умолчанию sys.argv[1:]).
+
+    Returns:
+        int: Код завершения.
+    """
+    parser = argparse.ArgumentParser(description="Создание синтетического журнала тренировок.")
+    parser.add_argument('path', help="файл журнала (.jsonl) или базы данных (.db)")
+    parser.add_argument('--records', type=int, default=10_000, help="количество записей")
+    parser.add_argument('--exercises', type=int, default=6, help="количество упражнений")
+    parser.add_argument('--years', type=float, default=5, help="продолжительность истории в годах")
+    parser.add_argument('--seed', type=int, default=1, help="начальное значение генератора случайных чисел")
+    args = parser.parse_args(argv)
+    write_journal(args.path, generate_records(args.records, args.exercises, args.years, args.seed))
+    print(f"Создан журнал {args.path}: {args.records} записей")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
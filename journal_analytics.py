@@ -0,0 +1,386 @@
+"""
+Модуль векторизованной аналитики журнала тренировок на NumPy.
+
+Записи представляются столбцами NumPy (временные метки, коды упражнений, веса, повторения),
+а итоги по упражнениям и периодам, оценка одноповторного максимума и недельный объем
+вычисляются операциями над целыми массивами (np.bincount, np.maximum.at, маски диапазонов)
+вместо перебора записей в Python. Суммы накапливаются в том же порядке, что и при переборе
+записей по дате, поэтому результаты совпадают с итогами StatsAggregator до последнего бита.
+"""
+
+import numpy as np
+
+from journal_model import SECONDS_PER_DAY
+from journal_stats import PERIOD_DAY, PERIOD_MONTH, PERIOD_WEEK, PERIODS, ExerciseStats
+
+
+class RecordColumns:
+    """
+    Записи о тренировках в виде столбцов NumPy.
+    """
+
+    __slots__ = ('timestamps', 'codes', 'weights', 'repetitions', 'exercises')
+
+    def __init__(self, timestamps, codes, weights, repetitions, exercises):
+        """
+        Инициализация столбцов.
+
+        Args:
+            timestamps (np.ndarray): Временные метки (int64).
+            codes (np.ndarray): Коды упражнений (int32) — индексы в списке exercises.
+            weights (np.ndarray): Веса (float64).
+            repetitions (np.ndarray): Повторения (int32).
+            exercises (list): Названия упражнений в порядке первого появления.
+        """
+        self.timestamps = timestamps
+        self.codes = codes
+        self.weights = weights
+        self.repetitions = repetitions
+        self.exercises = exercises
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        Построение столбцов по записям.
+
+        Args:
+            records (list): Записи TrainingRecord (порядок записей сохраняется).
+
+        Returns:
+            RecordColumns: Столбцы записей.
+        """
+        records = list(records)
+        count = len(records)
+        codes = {}
+        exercise_codes = np.fromiter((codes.setdefault(record.exercise, len(codes)) for record in records),
+                                     dtype=np.int32, count=count)
+        return cls(np.fromiter((record.timestamp for record in records), dtype=np.int64, count=count),
+                   exercise_codes,
+                   np.fromiter((record.weight for record in records), dtype=np.float64, count=count),
+                   np.fromiter((record.repetitions for record in records), dtype=np.int32, count=count),
+                   list(codes))
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def select(self, start=None, end=None):
+        """
+        Выборка записей за период по маске диапазона дат.
+
+        Args:
+            start (int): Начало периода (временная метка, включительно) или None.
+            end (int): Конец периода (временная метка, не включительно) или None.
+
+        Returns:
+            RecordColumns: Столбцы выбранных записей (с тем же списком упражнений).
+        """
+        if start is None and end is None:
+            return self
+        mask = np.ones(len(self), dtype=bool)
+        if start is not None:
+            mask &= self.timestamps >= start
+        if end is not None:
+            mask &= self.timestamps < end
+        return RecordColumns(self.timestamps[mask], self.codes[mask], self.weights[mask], self.repetitions[mask],
+                             self.exercises)
+
+
+def bucket_starts(timestamps, period):
+    """
+    Начала периодов (дней, недель с понедельника или месяцев) для массива временных меток.
+
+    Args:
+        timestamps (np.ndarray): Временные метки.
+        period (str): Период группировки.
+
+    Returns:
+        np.ndarray: Временные метки начала периодов (int64).
+    """
+    days = timestamps // SECONDS_PER_DAY
+    if period == PERIOD_DAY:
+        return days * SECONDS_PER_DAY
+    if period == PERIOD_WEEK:
+        # 1 января 1970 года — четверг, поэтому сдвиг на 3 дня дает начало недели с понедельника
+        return (days - (days + 3) % 7) * SECONDS_PER_DAY
+    if period == PERIOD_MONTH:
+        return timestamps.astype('datetime64[s]').astype('datetime64[M]').astype('datetime64[s]').astype(np.int64)
+    raise ValueError(f"Неизвестный период: {period}")
+
+
+def one_rep_max(weights, repetitions):
+    """
+    Оценка одноповторного максимума по формуле Эпли.
+
+    Args:
+        weights (np.ndarray): Веса.
+        repetitions (np.ndarray): Повторения.
+
+    Returns:
+        np.ndarray: Оценка максимума для каждого подхода (для одного повторения — сам вес, без повторений — 0).
+    """
+    estimate = weights * (1 + repetitions / 30)
+    estimate = np.where(repetitions == 1, weights, estimate)
+    return np.where(repetitions > 0, estimate, 0.0)
+
+
+def _group(keys):
+    """
+    Нумерация групп в порядке первого появления ключа.
+
+    Args:
+        keys (np.ndarray): Ключи групп для каждой записи.
+
+    Returns:
+        tuple: Номера групп для каждой записи и индексы первых записей групп.
+    """
+    unique, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    order = np.argsort(first, kind='stable')
+    # Перенумерация групп так, чтобы номер соответствовал порядку первого появления
+    rank = np.empty(len(unique), dtype=np.int64)
+    rank[order] = np.arange(len(unique))
+    return rank[inverse.ravel()], first[order]
+
+
+def _group_stats(groups, count, columns):
+    """
+    Итоги по группам записей.
+
+    Args:
+        groups (np.ndarray): Номер группы для каждой записи.
+        count (int): Количество групп.
+        columns (RecordColumns): Столбцы записей.
+
+    Returns:
+        list: ExerciseStats для каждой группы.
+    """
+    volume = columns.weights * columns.repetitions
+    # np.bincount складывает значения в порядке записей, как последовательное сложение в ExerciseStats.add
+    total_weight = np.bincount(groups, weights=volume, minlength=count)
+    total_repetitions = np.zeros(count, dtype=np.int64)
+    np.add.at(total_repetitions, groups, columns.repetitions)
+    total_sets = np.bincount(groups, minlength=count)
+    max_weight = np.zeros(count, dtype=np.float64)
+    np.maximum.at(max_weight, groups, columns.weights)
+    max_repetitions = np.zeros(count, dtype=np.int64)
+    np.maximum.at(max_repetitions, groups, columns.repetitions)
+    best = np.zeros(count, dtype=np.float64)
+    np.maximum.at(best, groups, one_rep_max(columns.weights, columns.repetitions))
+    return [ExerciseStats(*values) for values in zip(total_weight.tolist(), total_repetitions.tolist(),
+                                                     total_sets.tolist(), max_weight.tolist(),
+                                                     max_repetitions.tolist(), best.tolist())]
+
+
+def exercise_totals(columns):
+    """
+    Итоги по упражнениям.
+
+    Args:
+        columns (RecordColumns): Столбцы записей.
+
+    Returns:
+        dict: Упражнение -> ExerciseStats (в порядке первого появления упражнения).
+    """
+    if not len(columns):
+        return {}
+    groups, first = _group(columns.codes)
+    stats = _group_stats(groups, len(first), columns)
+    return {columns.exercises[code]: stat for code, stat in zip(columns.codes[first].tolist(), stats)}
+
+
+def period_totals(columns, period):
+    """
+    Итоги по упражнениям в разбивке по периодам.
+
+    Args:
+        columns (RecordColumns): Столбцы записей.
+        period (str): Период группировки.
+
+    Returns:
+        dict: Начало периода -> упражнение -> ExerciseStats.
+    """
+    if not len(columns):
+        return {}
+    starts = bucket_starts(columns.timestamps, period)
+    # Ключ группы объединяет номер периода и код упражнения
+    periods, period_first = _group(starts)
+    groups, first = _group(periods * len(columns.exercises) + columns.codes)
+    stats = _group_stats(groups, len(first), columns)
+    buckets = {start: {} for start in starts[period_first].tolist()}
+    for start, code, stat in zip(starts[first].tolist(), columns.codes[first].tolist(), stats):
+        buckets[start][columns.exercises[code]] = stat
+    return buckets
+
+
+def aggregate(columns):
+    """
+    Итоги за все время и по всем периодам в формате StatsAggregator.
+
+    Args:
+        columns (RecordColumns): Столбцы записей, упорядоченных по дате.
+
+    Returns:
+        tuple: Итоги за все время (упражнение -> ExerciseStats) и итоги по периодам
+            (период -> начало периода -> упражнение -> ExerciseStats).
+    """
+    return exercise_totals(columns), {period: period_totals(columns, period) for period in PERIODS}
+
+
+def best_one_rep_max(columns, period=None):
+    """
+    Лучшая оценка одноповторного максимума по упражнениям за все время или по периодам.
+
+    Args:
+        columns (RecordColumns): Столбцы записей.
+        period (str): Период группировки или None для оценки за все время.
+
+    Returns:
+        dict: (начало периода или None, упражнение) -> оценка максимума.
+    """
+    if not len(columns):
+        return {}
+    if period is None:
+        starts = np.zeros(len(columns), dtype=np.int64)
+    else:
+        starts = bucket_starts(columns.timestamps, period)
+    periods, _ = _group(starts)
+    groups, first = _group(periods * len(columns.exercises) + columns.codes)
+    best = np.zeros(len(first), dtype=np.float64)
+    np.maximum.at(best, groups, one_rep_max(columns.weights, columns.repetitions))
+    return {(None if period is None else start, columns.exercises[code]): value
+            for start, code, value in zip(starts[first].tolist(), columns.codes[first].tolist(), best.tolist())}
+
+
+def weekly_volume(columns):
+    """
+    Недельный объем (сумма веса, умноженного на повторения) по упражнениям.
+
+    Args:
+        columns (RecordColumns): Столбцы записей.
+
+    Returns:
+        list: Кортежи (начало недели, упражнение, объем) от последней недели к первой.
+    """
+    if not len(columns):
+        return []
+    starts = bucket_starts(columns.timestamps, PERIOD_WEEK)
+    weeks, _ = _group(starts)
+    groups, first = _group(weeks * len(columns.exercises) + columns.codes)
+    volume = np.bincount(groups, weights=columns.weights * columns.repetitions, minlength=len(first))
+    rows = [(start, columns.exercises[code], value)
+            for start, code, value in zip(starts[first].tolist(), columns.codes[first].tolist(), volume.tolist())]
+    rows.sort(key=lambda row: row[0], reverse=True)
+    return rows
+
+
+def progress_series(columns):
+    """
+    Ряды данных графика прогресса по упражнениям.
+
+    Args:
+        columns (RecordColumns): Столбцы записей, упорядоченных по дате.
+
+    Returns:
+        dict: Упражнение -> (временные метки, веса, повторения) в хронологическом порядке.
+    """
+    # Устойчивая сортировка по коду упражнения сохраняет хронологический порядок внутри упражнения
+    order = np.argsort(columns.codes, kind='stable')
+    codes = columns.codes[order]
+    bounds = np.flatnonzero(np.diff(codes)) + 1
+    series = {}
+    for chunk in np.split(order, bounds) if len(order) else []:
+        exercise = columns.exercises[columns.codes[chunk[0]]]
+        series[exercise] = (columns.timestamps[chunk], columns.weights[chunk], columns.repetitions[chunk])
+    # Упражнения перечисляются в порядке первого появления, как при переборе записей
+    return {exercise: series[exercise] for exercise in columns.exercises if exercise in series}
+
+
+def daily_max(timestamps, values):
+    """
+    Свертка ряда до одной точки в день (максимальное значение за день).
+
+    Args:
+        timestamps (np.ndarray): Временные метки в хронологическом порядке.
+        values (np.ndarray): Значения ряда.
+
+    Returns:
+        tuple: Временные метки начала дней и максимальные значения за день.
+    """
+    if not len(timestamps):
+        return timestamps, values
+    days = timestamps // SECONDS_PER_DAY
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(days)) + 1))
+    return days[starts] * SECONDS_PER_DAY, np.maximum.reduceat(values, starts)
+
+
+def lttb(x, y, threshold):
+    """
+    Выбор точек ряда алгоритмом Largest-Triangle-Three-Buckets.
+
+    Первая и последняя точки сохраняются, а из каждой из остальных корзин выбирается точка,
+    образующая наибольший треугольник с выбранной точкой предыдущей корзины и средней
+    точкой следующей, поэтому форма графика (пики и провалы) сохраняется.
+
+    Args:
+        x (np.ndarray): Координаты точек по оси X в порядке возрастания.
+        y (np.ndarray): Координаты точек по оси Y.
+        threshold (int): Количество точек после прореживания.
+
+    Returns:
+        np.ndarray: Индексы выбранных точек в порядке возрастания.
+    """
+    count = len(x)
+    if threshold >= count or threshold < 3:
+        return np.arange(count)
+    # Корзины содержат всего несколько точек (ряд уже свернут по дням), поэтому точки
+    # перебираются в Python: накладные расходы NumPy на каждую корзину были бы больше
+    xs = x.astype(np.float64).tolist()
+    ys = y.astype(np.float64).tolist()
+    # Границы корзин для всех точек, кроме первой и последней
+    edges = ((np.arange(threshold - 1) * ((count - 2) / (threshold - 2))).astype(np.int64) + 1).tolist()
+    edges[-1] = count - 1
+    selected = [0]
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        if bucket + 2 < len(edges):
+            next_start, next_end = end, edges[bucket + 2]
+        else:
+            next_start, next_end = count - 1, count
+        average_x = sum(xs[next_start:next_end]) / (next_end - next_start)
+        average_y = sum(ys[next_start:next_end]) / (next_end - next_start)
+        previous_x = xs[previous]
+        previous_y = ys[previous]
+        best_area = -1.0
+        for index in range(start, end):
+            area = abs((previous_x - average_x) * (ys[index] - previous_y)
+                       - (previous_x - xs[index]) * (average_y - previous_y))
+            if area > best_area:
+                best_area = area
+                previous = index
+        selected.append(previous)
+    selected.append(count - 1)
+    return np.array(selected, dtype=np.int64)
+
+
+def downsample(timestamps, values, max_points):
+    """
+    Прореживание ряда до заданного количества точек.
+
+    Ряд сначала сворачивается до максимума за день, а если точек все еще больше допустимого,
+    прореживается алгоритмом LTTB.
+
+    Args:
+        timestamps (np.ndarray): Временные метки в хронологическом порядке.
+        values (np.ndarray): Значения ряда.
+        max_points (int): Допустимое количество точек.
+
+    Returns:
+        tuple: Временные метки и значения прореженного ряда.
+    """
+    if len(timestamps) <= max_points:
+        return timestamps, values
+    timestamps, values = daily_max(timestamps, values)
+    if len(timestamps) <= max_points:
+        return timestamps, values
+    selected = lttb(timestamps, values, max_points)
+    return timestamps[selected], values[selected]
@@ -0,0 +1,105 @@
+"""
+Модуль выбора хранилища журнала тренировок и переноса данных между хранилищами.
+
+Хранилище выбирается по расширению файла: базы данных SQLite (.db, .sqlite, .sqlite3)
+открываются через SqliteStorage, каталоги .journal — как журнал, разбитый на файлы по годам
+или месяцам (SegmentedStorage), остальные файлы — как журнал JSON Lines.
+
+Перенос данных из одного хранилища в другое:
+    python journal_backends.py training_log.jsonl training_log.db
+    python journal_backends.py training_log.jsonl training_log.journal --segment-period month
+"""
+
+import argparse
+import os
+import sys
+
+from journal_segments import PERIOD_YEAR, SEGMENT_PERIODS, SegmentedStorage, is_segmented_path
+from journal_sqlite import SqliteStorage, is_sqlite_path
+from journal_storage import JournalStorage
+
+
+def open_storage(path, legacy_path=None, segment_period=PERIOD_YEAR):
+    """
+    Открытие хранилища журнала тренировок по пути к файлу.
+
+    Args:
+        path (str): Путь к файлу журнала, базы данных или каталогу журнала по периодам.
+        legacy_path (str): Путь к файлу старого формата JSON, который переносится в журнал JSON Lines
+            при первом открытии (для базы данных не используется, перенос выполняется функцией migrate).
+        segment_period (str): Период сегментов нового журнала по периодам (PERIOD_YEAR или PERIOD_MONTH).
+
+    Returns:
+        JournalStorage | SqliteStorage | SegmentedStorage: Хранилище.
+    """
+    if is_sqlite_path(path):
+        return SqliteStorage(path)
+    if is_segmented_path(path):
+        return SegmentedStorage(path, segment_period)
+    return JournalStorage(path, legacy_path=legacy_path)
+
+
+def migrate(source_path, target_path, overwrite=False, segment_period=PERIOD_YEAR):
+    """
+    Перенос всех записей из одного хранилища в другое с сохранением идентификаторов.
+
+    Args:
+        source_path (str): Путь к исходному журналу или базе данных.
+        target_path (str): Путь к новому журналу или базе данных.
+        overwrite (bool): Заменить данные, если целевой файл уже существует.
+        segment_period (str): Период сегментов, если целевое хранилище — журнал по периодам.
+
+    Returns:
+        int: Количество перенесенных записей.
+
+    Raises:
+        FileExistsError: Если целевой файл существует, а overwrite не задан.
+        FileNotFoundError: Если исходного файла нет.
+    """
+    if not os.path.exists(source_path):
+        raise FileNotFoundError(source_path)
+    if os.path.exists(target_path) and not overwrite:
+        raise FileExistsError(target_path)
+    source = open_storage(source_path)
+    target = open_storage(target_path, segment_period=segment_period)
+    try:
+        records = sorted(source.load(), key=lambda record: record.id)
+        target.rewrite(records)
+    finally:
+        source.close()
+        target.close()
+    return len(records)
+
+
+def main(argv=None):
+    """
+    Перенос журнала тренировок из одного хранилища в другое из командной строки.
+
+    Args:
+        argv (list): Аргументы командной строки (по умолчанию sys.argv[1:]).
+
+    Returns:
+        int: Код завершения.
+    """
+    parser = argparse.ArgumentParser(description="Перенос журнала тренировок между JSON Lines, SQLite "
+                                                 "и журналом по периодам.")
+    parser.add_argument('source', help="исходный журнал (.jsonl, .journal) или база данных (.db)")
+    parser.add_argument('target', help="новый журнал (.jsonl, .journal) или база данных (.db)")
+    parser.add_argument('--overwrite', action='store_true', help="заменить данные в существующем целевом файле")
+    parser.add_argument('--segment-period', choices=SEGMENT_PERIODS, default=PERIOD_YEAR,
+                        help="период файлов журнала .journal: год или месяц")
+    args = parser.parse_args(argv)
+    try:
+        count = migrate(args.source, args.target, overwrite=args.overwrite, segment_period=args.segment_period)
+    except FileExistsError:
+        print(f"Файл {args.target} уже существует (используйте --overwrite)", file=sys.stderr)
+        return 1
+    except FileNotFoundError:
+        print(f"Файл {args.source} не найден", file=sys.stderr)
+        return 1
+    print(f"Перенесено записей: {count}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
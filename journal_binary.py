@@ -0,0 +1,194 @@
+"""
+Модуль резервных копий журнала тренировок в двоичном столбцовом формате.
+
+Каждое поле записей хранится отдельным непрерывным массивом фиксированной ширины
+(идентификаторы, временные метки, коды упражнений, веса, повторения), а названия
+упражнений — один раз в таблице в начале файла. Такие файлы в несколько раз меньше
+CSV и читаются и записываются целыми массивами без разбора строк. Резервную копию
+можно дополнительно сжать, указав расширение .tjb.gz (или .tjb.zst).
+
+Структура файла (порядок байтов — little-endian):
+    заголовок: сигнатура (8 байт), версия (uint16), количество записей (uint64), количество упражнений (uint32);
+    таблица упражнений: для каждого упражнения длина названия (uint16) и название в UTF-8;
+    столбцы: id (int64), timestamp (int64), код упражнения (uint32), вес (float64), повторения (uint32).
+"""
+
+import struct
+import sys
+from array import array
+
+from journal_csv import IMPORT_CHUNK_SIZE, ImportResult, import_chunks
+from journal_files import TEMP_SUFFIX, compression_of, open_archive, remove_quietly, replace_file, sync_path
+from journal_model import TrainingRecord
+
+# Сигнатура и версия формата
+BINARY_MAGIC = b'TJOURNAL'
+BINARY_VERSION = 1
+
+# Расширение файлов резервных копий
+BINARY_EXTENSION = '.tjb'
+
+# Заголовок файла и длина названия упражнения
+_HEADER = struct.Struct('<8sHQI')
+_NAME_LENGTH = struct.Struct('<H')
+
+# Типы столбцов в порядке их следования в файле (код типа array и ожидаемый размер элемента)
+_COLUMNS = (('id', 'q', 8), ('timestamp', 'q', 8), ('exercise', 'I', 4), ('weight', 'd', 8), ('repetitions', 'I', 4))
+
+
+def _new_array(typecode, size):
+    """
+    Создание пустого массива с проверкой размера элемента.
+
+    Args:
+        typecode (str): Код типа array.
+        size (int): Ожидаемый размер элемента в байтах.
+
+    Returns:
+        array: Пустой массив.
+    """
+    column = array(typecode)
+    if column.itemsize != size:
+        # На платформах, где 'I' не 4 байта, используется 'L'
+        column = array('L' if typecode == 'I' else typecode)
+    if column.itemsize != size:
+        raise RuntimeError(f"Платформа не поддерживает {size}-байтовые массивы типа {typecode}")
+    return column
+
+
+def write_backup(path, records, progress=None, cancel_event=None):
+    """
+    Запись записей о тренировках в файл резервной копии.
+
+    Args:
+        path (str): Путь к файлу.
+        records (list): Записи TrainingRecord.
+        progress (callable): Функция progress(done, total), вызываемая после записи каждого столбца.
+        cancel_event (threading.Event): Событие прерывания записи.
+
+    Returns:
+        bool: True, если файл записан; False, если запись была прервана.
+    """
+    # Таблица упражнений: название -> код
+    codes = {}
+    columns = {name: _new_array(typecode, size) for name, typecode, size in _COLUMNS}
+    for record in records:
+        code = codes.get(record.exercise)
+        if code is None:
+            code = codes[record.exercise] = len(codes)
+        columns['id'].append(record.id or 0)
+        columns['timestamp'].append(record.timestamp)
+        columns['exercise'].append(code)
+        columns['weight'].append(record.weight)
+        columns['repetitions'].append(record.repetitions)
+
+    temp_path = path + TEMP_SUFFIX
+    completed = False
+    try:
+        with open_archive(temp_path, 'wb', compression_of(path)) as file:
+            file.write(_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, len(records), len(codes)))
+            for name in codes:
+                encoded = name.encode('utf-8')
+                file.write(_NAME_LENGTH.pack(len(encoded)))
+                file.write(encoded)
+            for done, (name, _, _) in enumerate(_COLUMNS, start=1):
+                if cancel_event is not None and cancel_event.is_set():
+                    return False
+                column = columns[name]
+                if sys.byteorder == 'big':
+                    column.byteswap()
+                column.tofile(file)
+                if progress is not None:
+                    progress(done, len(_COLUMNS))
+        sync_path(temp_path)
+        replace_file(temp_path, path)
+        completed = True
+    finally:
+        if not completed:
+            remove_quietly(temp_path)
+    return True
+
+
+def read_backup(path, keep_ids=True):
+    """
+    Чтение записей о тренировках из файла резервной копии.
+
+    Args:
+        path (str): Путь к файлу.
+        keep_ids (bool): Сохранить идентификаторы записей из файла (иначе записи читаются без идентификаторов).
+
+    Returns:
+        list: Записи TrainingRecord.
+
+    Raises:
+        ValueError: Если файл не является резервной копией журнала или поврежден.
+    """
+    with open_archive(path, 'rb') as file:
+        header = file.read(_HEADER.size)
+        if len(header) != _HEADER.size:
+            raise ValueError("Файл поврежден: неполный заголовок")
+        magic, version, count, exercise_count = _HEADER.unpack(header)
+        if magic != BINARY_MAGIC:
+            raise ValueError("Файл не является резервной копией дневника тренировок")
+        if version != BINARY_VERSION:
+            raise ValueError(f"Неподдерживаемая версия резервной копии: {version}")
+
+        names = []
+        for _ in range(exercise_count):
+            length_bytes = file.read(_NAME_LENGTH.size)
+            if len(length_bytes) != _NAME_LENGTH.size:
+                raise ValueError("Файл поврежден: неполная таблица упражнений")
+            (length,) = _NAME_LENGTH.unpack(length_bytes)
+            encoded = file.read(length)
+            if len(encoded) != length:
+                raise ValueError("Файл поврежден: неполная таблица упражнений")
+            names.append(encoded.decode('utf-8'))
+
+        columns = {}
+        for name, typecode, size in _COLUMNS:
+            column = _new_array(typecode, size)
+            try:
+                column.fromfile(file, count)
+            except EOFError:
+                raise ValueError("Файл поврежден: неполные данные") from None
+            if sys.byteorder == 'big':
+                column.byteswap()
+            columns[name] = column
+
+    # Коды упражнений беззнаковые, поэтому достаточно проверить верхнюю границу словаря
+    if count and max(columns['exercise']) >= len(names):
+        raise ValueError(f"Файл поврежден: код упражнения {max(columns['exercise'])} вне таблицы упражнений "
+                         f"(размер таблицы: {len(names)})")
+    if not keep_ids:
+        columns['id'] = [None] * count
+    return [TrainingRecord(entry_id or None, timestamp, names[code], weight, repetitions)
+            for entry_id, timestamp, code, weight, repetitions in zip(columns['id'], columns['timestamp'],
+                                                                       columns['exercise'], columns['weight'],
+                                                                       columns['repetitions'])]
+
+
+def import_backup(path, repository, merge=False, progress=None, cancel_event=None, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Импорт записей о тренировках из файла резервной копии.
+
+    Args:
+        path (str): Путь к файлу.
+        repository (TrainingRepository): Репозиторий записей.
+        merge (bool): True — объединить с журналом (дубликаты пропускаются), False — заменить журнал.
+        progress (callable): Функция progress(done, total), вызываемая после каждой пачки.
+        cancel_event (threading.Event): Событие прерывания импорта.
+        chunk_size (int): Количество записей в пачке.
+
+    Returns:
+        ImportResult: Результат импорта.
+    """
+    # Идентификаторы из резервной копии не переносятся: журнал назначает их заново
+    records = read_backup(path, keep_ids=False)
+    chunks = (records[start:start + chunk_size] for start in range(0, len(records), chunk_size))
+    done = [0]
+
+    def report():
+        done[0] = min(done[0] + chunk_size, len(records))
+        progress(done[0], len(records))
+
+    return import_chunks(chunks, repository, ImportResult(), merge, report if progress else None, cancel_event)
@@ -0,0 +1,109 @@
+"""
+Модуль кэша результатов с вытеснением давно не использованных значений.
+
+Кэш используется для результатов, построение которых дорого (например, графиков прогресса),
+а ключ включает версию данных репозитория, поэтому после изменения записей устаревшие
+значения просто перестают запрашиваться и со временем вытесняются.
+
+Размер кэша ограничен количеством значений и, при необходимости, их общей "стоимостью"
+(например, количеством записей в сохраненных выборках), поэтому несколько выборок за всю
+историю не занимают память без ограничения. Кэш считает попадания и промахи; при включенной
+диагностике они видны как счетчики cache.<имя>.hits и cache.<имя>.misses.
+"""
+
+import threading
+from collections import OrderedDict
+
+from journal_profiling import count
+
+
+class LRUCache:
+    """
+    Кэш фиксированного размера с вытеснением давно не использованных значений.
+    """
+
+    def __init__(self, size, max_cost=None, name=None):
+        """
+        Инициализация пустого кэша.
+
+        Args:
+            size (int): Количество хранимых значений.
+            max_cost (int): Наибольшая общая стоимость хранимых значений или None без ограничения.
+            name (str): Название кэша для счетчиков диагностики или None.
+        """
+        self.size = size
+        self.max_cost = max_cost
+        self.name = name
+        # Значения и их стоимость по ключу
+        self._values = OrderedDict()
+        self._cost = 0
+        # Количество попаданий и промахов
+        self.hits = 0
+        self.misses = 0
+        # Кэш используется из фоновых потоков
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._values)
+
+    @property
+    def cost(self):
+        """
+        Общая стоимость хранимых значений.
+
+        Returns:
+            int: Сумма стоимостей значений.
+        """
+        return self._cost
+
+    def get(self, key):
+        """
+        Получение значения из кэша.
+
+        Args:
+            key (tuple): Ключ значения.
+
+        Returns:
+            object: Значение или None, если его нет в кэше.
+        """
+        with self._lock:
+            item = self._values.get(key)
+            if item is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._values.move_to_end(key)
+        if self.name is not None:
+            count(f'cache.{self.name}.' + ('misses' if item is None else 'hits'))
+        return None if item is None else item[0]
+
+    def put(self, key, value, cost=1):
+        """
+        Сохранение значения в кэше.
+
+        Значение дороже max_cost не сохраняется, чтобы не вытеснять весь кэш.
+
+        Args:
+            key (tuple): Ключ значения.
+            value (object): Значение (не None).
+            cost (int): Стоимость значения (например, количество записей в выборке).
+        """
+        with self._lock:
+            previous = self._values.pop(key, None)
+            if previous is not None:
+                self._cost -= previous[1]
+            if self.max_cost is not None and cost > self.max_cost:
+                return
+            self._values[key] = (value, cost)
+            self._cost += cost
+            while len(self._values) > self.size or self.max_cost is not None and self._cost > self.max_cost:
+                _, (_, evicted) = self._values.popitem(last=False)
+                self._cost -= evicted
+
+    def clear(self):
+        """
+        Очистка кэша (счетчики попаданий и промахов сохраняются).
+        """
+        with self._lock:
+            self._values.clear()
+            self._cost = 0
@@ -0,0 +1,83 @@
+"""
+Модуль построения графиков прогресса по упражнениям.
+
+Длинные ряды прореживаются до заданного количества точек (свертка по дням и алгоритм LTTB),
+большие ряды отображаются через WebGL (Scattergl), а библиотека plotly.js сохраняется рядом
+с файлом графика один раз и подключается ссылкой, а не встраивается в каждый файл.
+"""
+
+import plotly.graph_objs as go
+from plotly.subplots import make_subplots
+
+from journal_analytics import downsample
+from journal_profiling import span
+
+# Допустимое количество точек в одном ряду графика
+MAX_POINTS_PER_SERIES = 2000
+
+# Количество точек, начиная с которого ряд отображается через WebGL
+WEBGL_THRESHOLD = 1000
+
+
+def _trace(timestamps, values, name):
+    """
+    Ряд графика: Scatter для небольших рядов, Scattergl для больших.
+
+    Args:
+        timestamps (np.ndarray): Временные метки.
+        values (np.ndarray): Значения.
+        name (str): Название ряда.
+
+    Returns:
+        plotly.graph_objs.Scatter | plotly.graph_objs.Scattergl: Ряд графика.
+    """
+    trace_type = go.Scattergl if len(timestamps) > WEBGL_THRESHOLD else go.Scatter
+    return trace_type(x=timestamps.astype('datetime64[s]'), y=values, mode='lines+markers', name=name)
+
+
+def build_progress_figure(series, max_points=MAX_POINTS_PER_SERIES):
+    """
+    Построение графика прогресса (вес и повторения по каждому упражнению).
+
+    Args:
+        series (dict): Упражнение -> (временные метки, веса, повторения) в хронологическом порядке.
+        max_points (int): Допустимое количество точек в одном ряду.
+
+    Returns:
+        plotly.graph_objs.Figure: График.
+    """
+    # Создание фигуры для графика
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
+
+    # Отображение графика для каждого упражнения
+    for exercise, (timestamps, weights, repetitions) in series.items():
+        fig.add_trace(_trace(*downsample(timestamps, weights, max_points), f"{exercise} - Вес"),
+                      secondary_y=False)
+        fig.add_trace(_trace(*downsample(timestamps, repetitions, max_points), f"{exercise} - Повторения"),
+                      secondary_y=True)
+
+    # Настройка графика
+    fig.update_layout(
+        title='Прогресс по упражнениям',
+        xaxis_title='Дата и время',
+        legend_title='Упражнения',
+        template='plotly_white'
+    )
+
+    fig.update_yaxes(title_text="Вес", secondary_y=False)
+    fig.update_yaxes(title_text="Повторения", secondary_y=True)
+    return fig
+
+
+def show_figure(fig, path):
+    """
+    Запись графика в HTML файл и открытие его в браузере.
+
+    Библиотека plotly.js копируется в каталог файла только при первой записи.
+
+    Args:
+        fig (plotly.graph_objs.Figure): График.
+        path (str): Путь к HTML файлу.
+    """
+    with span('chart.write'):
+        fig.write_html(path, include_plotlyjs='directory', auto_open=True)
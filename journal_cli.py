@@ -0,0 +1,342 @@
+"""
+Интерфейс командной строки дневника тренировок.
+
+Позволяет работать с журналом без графического интерфейса, например в ночных заданиях
+на сервере:
+
+    python journal_cli.py add "Жим лежа" 80 8
+    python journal_cli.py add < sets.csv
+    python journal_cli.py query --from 01.01.2024 --to 31.01.2024 --exercise "Жим лежа"
+    python journal_cli.py stats --period week --format json
+    python journal_cli.py records --exercise "Жим лежа"
+    python journal_cli.py export backup.csv
+    python journal_cli.py import backup.csv --replace
+    python journal_cli.py compact
+    python journal_cli.py --journal training_log.journal archive --before 01.01.2024
+
+Журнал задается параметром --journal или переменной окружения TRAINING_JOURNAL. Команды
+query и export не загружают журнал в память, если хранилище умеет выбирать записи само
+(база данных SQLite, журнал по периодам .journal). Параметр
+--diagnostics сохраняет замеры времени и счетчики выполнения команды в JSON файл, а
+--profile-dir — профиль cProfile в каталог.
+"""
+
+import argparse
+import csv
+import json
+import sys
+from datetime import datetime
+
+from journal_core import (day_range, export_records, import_records, journal_path, open_reader, open_repository,
+                          stats_table)
+from journal_model import (DATE_FORMAT, DAY_FORMAT, SECONDS_PER_DAY, TrainingRecord, datetime_to_timestamp,
+                           format_timestamp, format_weight)
+from journal_profiling import instrumentation
+from journal_stats import PERIODS
+
+# Форматы вывода записей и статистики
+OUTPUT_FORMATS = ('csv', 'json')
+
+# Команды, которым нужна только выборка записей (журнал не загружается в репозиторий)
+READ_ONLY_COMMANDS = ('query', 'export')
+
+# Количество записей, добавляемых в журнал одной пачкой при чтении из стандартного ввода
+# (пачки добавляются только после проверки всего ввода)
+BATCH_SIZE = 5000
+
+
+def parse_args(argv=None):
+    """
+    Разбор аргументов командной строки.
+
+    Args:
+        argv (list): Аргументы командной строки (по умолчанию sys.argv[1:]).
+
+    Returns:
+        argparse.Namespace: Разобранные аргументы.
+    """
+    parser = argparse.ArgumentParser(description="Дневник тренировок: работа с журналом из командной строки.")
+    parser.add_argument('--journal', help="файл журнала (.jsonl), базы данных (.db) или каталог журнала по периодам "
+                                          "(.journal); "
+                                          "по умолчанию TRAINING_JOURNAL или training_log.jsonl")
+    parser.add_argument('--diagnostics', metavar='PATH', help="сохранить замеры времени и счетчики в JSON файл")
+    parser.add_argument('--profile-dir', metavar='DIR', help="выполнить команду под cProfile и сохранить .pstats")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    add = commands.add_parser('add', help="добавить подход (без аргументов — пачку подходов из стандартного ввода; "
+                                          "при ошибке в любой строке не добавляется ни одна запись)")
+    add.add_argument('exercise', nargs='?', help="упражнение")
+    add.add_argument('weight', nargs='?', help="вес")
+    add.add_argument('repetitions', nargs='?', help="количество повторений")
+    add.add_argument('--date', help="дата и время в формате дд.мм.гггг чч:мм:сс (по умолчанию — текущие)")
+
+    query = commands.add_parser('query', help="вывести записи за период")
+    stats = commands.add_parser('stats', help="вывести итоги по упражнениям")
+    export = commands.add_parser('export', help="экспортировать записи в CSV файл или резервную копию (.tjb)")
+    for command in (query, stats, export):
+        command.add_argument('--from', dest='start', help="начальная дата в формате дд.мм.гггг")
+        command.add_argument('--to', dest='end', help="конечная дата в формате дд.мм.гггг (включительно)")
+    records = commands.add_parser('records', help="вывести личные рекорды и тренды по упражнениям")
+    for command in (query, export, records):
+        command.add_argument('--exercise', help="упражнение (без учета регистра)")
+    for command in (query, stats, records):
+        command.add_argument('--format', choices=OUTPUT_FORMATS, default='csv', help="формат вывода")
+    stats.add_argument('--period', choices=PERIODS, help="группировка по дням, неделям или месяцам")
+    export.add_argument('path', help="файл для экспорта")
+
+    import_command = commands.add_parser('import', help="импортировать записи из CSV файла или резервной копии")
+    import_command.add_argument('path', help="файл для импорта")
+    import_command.add_argument('--replace', action='store_true',
+                                help="заменить журнал данными из файла (по умолчанию — объединить)")
+
+    commands.add_parser('compact', help="уплотнить журнал")
+    archive = commands.add_parser('archive', help="сжать файлы прошедших периодов журнала по периодам (.journal)")
+    archive.add_argument('--before', help="сжать периоды, закончившиеся до даты дд.мм.гггг "
+                                          "(по умолчанию — все периоды до текущего)")
+    return parser.parse_args(argv)
+
+
+def read_batch(lines):
+    """
+    Чтение подходов из строк CSV: "упражнение,вес,повторения" или "дата,упражнение,вес,повторения".
+
+    Строка заголовков (как в файлах экспорта) пропускается.
+
+    Args:
+        lines (iterable): Строки ввода.
+
+    Yields:
+        TrainingRecord: Записи о тренировках без идентификаторов.
+
+    Raises:
+        ValueError: Если строка некорректна (в сообщении указывается номер строки).
+    """
+    now = datetime_to_timestamp(datetime.now().replace(microsecond=0))
+    reader = csv.reader(lines)
+    for row in reader:
+        if not row or (reader.line_num == 1 and row[0] == "Дата"):
+            continue
+        try:
+            if len(row) == 3:
+                record = TrainingRecord.parse(format_timestamp(now), *row)
+            elif len(row) == 4:
+                record = TrainingRecord.parse(*row, date_format=DATE_FORMAT)
+            else:
+                raise ValueError("ожидается 3 или 4 столбца")
+        except ValueError as error:
+            raise ValueError(f"Строка {reader.line_num}: {error}") from None
+        yield record
+
+
+def command_add(repository, args):
+    """
+    Добавление одного подхода или пачки подходов из стандартного ввода.
+    """
+    if args.exercise is None:
+        # Весь ввод проверяется до добавления первой пачки, чтобы ошибка в конце ввода
+        # не оставляла в журнале часть записей
+        try:
+            records = list(read_batch(sys.stdin))
+        except ValueError as error:
+            raise ValueError(f"{error} (записи не добавлены)") from None
+        added = 0
+        for start in range(0, len(records), BATCH_SIZE):
+            added += len(repository.add_many(records[start:start + BATCH_SIZE]))
+        print(f"Добавлено записей: {added}")
+        return 0
+    if args.weight is None or args.repetitions is None:
+        raise ValueError("Укажите упражнение, вес и количество повторений")
+    date = args.date or format_timestamp(datetime_to_timestamp(datetime.now().replace(microsecond=0)))
+    record = repository.add(TrainingRecord.parse(date, args.exercise, args.weight, args.repetitions))
+    print(f"Добавлена запись {record.id}")
+    return 0
+
+
+def command_query(repository, args):
+    """
+    Вывод записей за период в порядке от последней к первой.
+    """
+    start, end = day_range(args.start, args.end)
+    records = repository.query(start, end, args.exercise)
+    if args.format == 'json':
+        for record in records:
+            print(json.dumps(record.to_json(), ensure_ascii=False))
+    else:
+        writer = csv.writer(sys.stdout)
+        writer.writerow(["ID", "Дата", "Упражнение", "Вес", "Повторения"])
+        writer.writerows((record.id, *record.display_values()) for record in records)
+    return 0
+
+
+def command_stats(repository, args):
+    """
+    Вывод итогов по упражнениям за все время или по периодам.
+    """
+    start, end = day_range(args.start, args.end)
+    rows = stats_table(repository, args.period)
+    if start is not None or end is not None:
+        if args.period is None:
+            raise ValueError("Ограничение по датам применяется к итогам по периодам (укажите --period)")
+        rows = [row for row in rows if (start is None or row[0] >= start) and (end is None or row[0] < end)]
+    if args.format == 'json':
+        for period_start, exercise, stats, one_rep_max in rows:
+            print(json.dumps({'period': None if period_start is None else format_timestamp(period_start, DAY_FORMAT),
+                              'exercise': exercise, 'total_weight': stats.total_weight,
+                              'total_repetitions': stats.total_repetitions, 'total_sets': stats.total_sets,
+                              'max_weight': stats.max_weight, 'max_repetitions': stats.max_repetitions,
+                              'one_rep_max': round(one_rep_max, 1)}, ensure_ascii=False))
+    else:
+        writer = csv.writer(sys.stdout)
+        writer.writerow(["Период", "Упражнение", "Всего вес", "Всего повторений", "Всего подходов", "Макс. вес",
+                         "Макс. повторений", "Оценка 1ПМ"])
+        for period_start, exercise, stats, one_rep_max in rows:
+            writer.writerow(['' if period_start is None else format_timestamp(period_start, DAY_FORMAT), exercise,
+                             format_weight(stats.total_weight), stats.total_repetitions, stats.total_sets,
+                             format_weight(stats.max_weight), stats.max_repetitions, round(one_rep_max, 1)])
+    return 0
+
+
+def command_records(repository, args):
+    """
+    Вывод личных рекордов и трендов по упражнениям.
+    """
+    summary = repository.personal_records()
+    exercises = sorted(summary)
+    if args.exercise:
+        exercises = [exercise for exercise in exercises if exercise.lower() == args.exercise.lower()]
+    if args.format == 'json':
+        for exercise in exercises:
+            progress = summary[exercise]
+            print(json.dumps({'exercise': exercise, 'max_weight': progress.max_weight,
+                              'max_weight_date': format_timestamp(progress.max_weight_at),
+                              'one_rep_max': round(progress.best_one_rep_max, 1),
+                              'one_rep_max_date': format_timestamp(progress.best_one_rep_max_at),
+                              'session_volume': progress.best_volume,
+                              'session_volume_date': format_timestamp(progress.best_volume_day * SECONDS_PER_DAY,
+                                                                      DAY_FORMAT),
+                              'sessions': progress.sessions, 'level': round(progress.level, 1),
+                              'trend': round(progress.trend, 2)}, ensure_ascii=False))
+    else:
+        writer = csv.writer(sys.stdout)
+        writer.writerow(["Упражнение", "Макс. вес", "Дата", "Лучшая оценка 1ПМ", "Дата", "Лучший объем за тренировку",
+                         "Дата", "Тренировок", "Уровень 1ПМ", "Тренд 1ПМ (кг/нед)"])
+        for exercise in exercises:
+            progress = summary[exercise]
+            writer.writerow([exercise, format_weight(progress.max_weight), format_timestamp(progress.max_weight_at),
+                             round(progress.best_one_rep_max, 1), format_timestamp(progress.best_one_rep_max_at),
+                             format_weight(progress.best_volume),
+                             format_timestamp(progress.best_volume_day * SECONDS_PER_DAY, DAY_FORMAT),
+                             progress.sessions, round(progress.level, 1), round(progress.trend, 2)])
+    return 0
+
+
+def command_export(repository, args):
+    """
+    Экспорт записей в файл.
+    """
+    start, end = day_range(args.start, args.end)
+    _, count = export_records(repository, args.path, start, end, args.exercise)
+    print(f"Экспортировано записей: {count}")
+    return 0
+
+
+def command_import(repository, args):
+    """
+    Импорт записей из файла.
+    """
+    result = import_records(repository, args.path, merge=not args.replace)
+    print(f"Добавлено записей: {result.added}")
+    if result.duplicates:
+        print(f"Пропущено дубликатов: {result.duplicates}")
+    if result.invalid:
+        print(f"Пропущено некорректных строк: {result.invalid}", file=sys.stderr)
+        for message in result.errors:
+            print(message, file=sys.stderr)
+    return 0
+
+
+def command_compact(repository, args):
+    """
+    Уплотнение журнала.
+    """
+    repository.flush()
+    repository.storage.compact()
+    print("Журнал уплотнен")
+    return 0
+
+
+def command_archive(repository, args):
+    """
+    Сжатие файлов прошедших периодов журнала по периодам.
+    """
+    archive = getattr(repository.storage, 'archive', None)
+    if archive is None:
+        raise ValueError("Архивирование доступно только для журнала по периодам (.journal)")
+    before, _ = day_range(args.before, None)
+    repository.flush()
+    print(f"Сжато файлов периодов: {archive(before)}")
+    return 0
+
+
+COMMANDS = {
+    'add': command_add,
+    'query': command_query,
+    'stats': command_stats,
+    'records': command_records,
+    'export': command_export,
+    'import': command_import,
+    'compact': command_compact,
+    'archive': command_archive,
+}
+
+
+def main(argv=None):
+    """
+    Выполнение команды из командной строки.
+
+    Args:
+        argv (list): Аргументы командной строки (по умолчанию sys.argv[1:]).
+
+    Returns:
+        int: Код завершения.
+    """
+    args = parse_args(argv)
+    instrumentation.enabled = bool(args.diagnostics or args.profile_dir)
+    instrumentation.profile_dir = args.profile_dir
+    try:
+        return instrumentation.profile(args.command, run_command, args)
+    finally:
+        if args.diagnostics:
+            instrumentation.dump(args.diagnostics)
+
+
+def run_command(args):
+    """
+    Открытие журнала, выполнение команды и закрытие журнала.
+
+    Args:
+        args (argparse.Namespace): Разобранные аргументы.
+
+    Returns:
+        int: Код завершения.
+    """
+    path = args.journal or journal_path()
+    try:
+        repository = open_reader(path) if args.command in READ_ONLY_COMMANDS else open_repository(path)
+    except (OSError, ValueError) as error:
+        print(f"Ошибка: {error}", file=sys.stderr)
+        return 1
+    try:
+        return COMMANDS[args.command](repository, args)
+    except (OSError, ValueError) as error:
+        print(f"Ошибка: {error}", file=sys.stderr)
+        return 1
+    finally:
+        # Записи файла старого формата, которые не удалось перенести в журнал при открытии
+        for message in getattr(repository.storage, 'migration_skipped', ()):
+            print(message, file=sys.stderr)
+        repository.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
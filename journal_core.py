@@ -0,0 +1,220 @@
+"""
+Модуль основных операций с дневником тренировок без графического интерфейса.
+
+Открытие журнала, выборка записей за период, статистика, импорт и экспорт собраны здесь
+и используются как графическим интерфейсом, так и интерфейсом командной строки, поэтому
+пакетная обработка журнала (например, ночные задания на сервере) не требует Tkinter.
+"""
+
+import os
+from datetime import datetime
+
+from journal_backends import open_storage
+from journal_binary import BINARY_EXTENSION, import_backup, write_backup
+from journal_csv import export_csv, import_csv
+from journal_files import strip_compression
+from journal_model import DAY_FORMAT, SECONDS_PER_DAY, datetime_to_timestamp
+from journal_profiling import span
+from journal_repository import TrainingRepository
+
+# Файл старого формата, данные из которого переносятся в журнал при первом открытии
+LEGACY_DATA_FILE = 'training_log.json'
+
+# Файл журнала тренировок по умолчанию
+DEFAULT_JOURNAL_FILE = 'training_log.jsonl'
+
+# Переменная окружения, задающая файл журнала (журнал JSON Lines, база данных SQLite или каталог .journal)
+JOURNAL_ENV_VAR = 'TRAINING_JOURNAL'
+
+
+def journal_path():
+    """
+    Путь к файлу журнала: из переменной окружения TRAINING_JOURNAL или путь по умолчанию.
+
+    Returns:
+        str: Путь к файлу журнала.
+    """
+    return os.environ.get(JOURNAL_ENV_VAR, DEFAULT_JOURNAL_FILE)
+
+
+def open_repository(path=None, legacy_path=LEGACY_DATA_FILE):
+    """
+    Открытие журнала и загрузка записей в репозиторий.
+
+    Args:
+        path (str): Путь к файлу журнала (по умолчанию journal_path()).
+        legacy_path (str): Путь к файлу старого формата JSON.
+
+    Returns:
+        TrainingRepository: Загруженный репозиторий (закрывается методом close).
+    """
+    repository = TrainingRepository(open_storage(path or journal_path(), legacy_path=legacy_path))
+    repository.load()
+    return repository
+
+
+class StorageReader:
+    """
+    Выборка записей для разовых команд без загрузки всего журнала в память.
+
+    Хранилища, умеющие выбирать записи сами (база данных SQLite, журнал по периодам), отвечают
+    на запрос напрямую, а журнал JSON Lines загружается в репозиторий при первом запросе.
+    """
+
+    def __init__(self, storage):
+        """
+        Инициализация выборки.
+
+        Args:
+            storage (JournalStorage | SqliteStorage | SegmentedStorage): Хранилище.
+        """
+        self.storage = storage
+        self._repository = None
+
+    def query(self, start=None, end=None, exercise=None):
+        """
+        Выборка записей за период и по упражнению в порядке от последней к первой.
+
+        Args:
+            start (int): Начало периода (временная метка, включительно) или None.
+            end (int): Конец периода (временная метка, не включительно) или None.
+            exercise (str): Название упражнения (без учета регистра) или None для всех упражнений.
+
+        Returns:
+            list: Записи TrainingRecord, отсортированные по убыванию даты.
+        """
+        if self._repository is None:
+            with span('storage.query'):
+                records = self.storage.query(start, end, exercise)
+            if records is not None:
+                return records
+            self._repository = TrainingRepository(self.storage)
+            self._repository.load()
+        return self._repository.query(start, end, exercise)
+
+    def close(self):
+        """
+        Закрытие хранилища (или репозитория, если журнал был загружен).
+        """
+        if self._repository is not None:
+            self._repository.close()
+        else:
+            self.storage.close()
+
+
+def open_reader(path=None, legacy_path=LEGACY_DATA_FILE):
+    """
+    Открытие журнала только для выборки записей (команды вывода и экспорта).
+
+    Args:
+        path (str): Путь к файлу журнала (по умолчанию journal_path()).
+        legacy_path (str): Путь к файлу старого формата JSON.
+
+    Returns:
+        StorageReader: Выборка записей (закрывается методом close).
+    """
+    return StorageReader(open_storage(path or journal_path(), legacy_path=legacy_path))
+
+
+def day_range(start_date, end_date):
+    """
+    Границы выборки за период по датам (конечная дата включается целиком).
+
+    Args:
+        start_date (datetime | str): Начальная дата (строка в формате дд.мм.гггг) или None.
+        end_date (datetime | str): Конечная дата (строка в формате дд.мм.гггг) или None.
+
+    Returns:
+        tuple: Начало и конец периода (временные метки, конец не включительно; None, если дата не задана).
+
+    Raises:
+        ValueError: Если дата задана в неверном формате или начальная дата позже конечной.
+    """
+    if isinstance(start_date, str):
+        start_date = datetime.strptime(start_date, DAY_FORMAT)
+    if isinstance(end_date, str):
+        end_date = datetime.strptime(end_date, DAY_FORMAT)
+    if start_date is not None and end_date is not None and start_date > end_date:
+        raise ValueError("Начальная дата не может быть позже конечной даты")
+    start = None if start_date is None else datetime_to_timestamp(start_date)
+    end = None if end_date is None else datetime_to_timestamp(end_date) + SECONDS_PER_DAY
+    return start, end
+
+
+def stats_table(repository, period=None):
+    """
+    Итоги по упражнениям за все время или по периодам с оценкой одноповторного максимума.
+
+    Таблица кэшируется репозиторием до следующего изменения записей.
+
+    Args:
+        repository (TrainingRepository): Репозиторий записей.
+        period (str): Период группировки (PERIOD_DAY, PERIOD_WEEK, PERIOD_MONTH) или None для итогов за все время.
+
+    Returns:
+        list: Кортежи (начало периода или None, упражнение, ExerciseStats, оценка 1ПМ) от последнего периода к первому.
+    """
+    return repository.cached('stats', (period,), lambda: _stats_table(repository, period))
+
+
+def _stats_table(repository, period):
+    """
+    Расчет таблицы итогов (см. stats_table).
+
+    Args:
+        repository (TrainingRepository): Репозиторий записей.
+        period (str): Период группировки или None.
+
+    Returns:
+        list: Кортежи (начало периода или None, упражнение, ExerciseStats, оценка 1ПМ).
+    """
+    with span('stats.table'):
+        if period is None:
+            rows = [(None, exercise, stats) for exercise, stats in repository.exercise_stats().items()]
+        else:
+            rows = repository.period_stats(period)
+    # Лучшая оценка одноповторного максимума поддерживается в итогах вместе с остальными максимумами,
+    # поэтому таблица строится без просмотра истории
+    return [(start, exercise, stats, stats.best_one_rep_max) for start, exercise, stats in rows]
+
+
+def export_records(repository, path, start=None, end=None, exercise=None, progress=None, cancel_event=None):
+    """
+    Экспорт записей в CSV файл или в резервную копию (по расширению файла) в хронологическом порядке.
+
+    Args:
+        repository (TrainingRepository | StorageReader): Репозиторий записей или выборка из хранилища.
+        path (str): Путь к файлу (.csv или BINARY_EXTENSION, возможно с расширением сжатия .gz или .zst).
+        start (int): Начало периода или None.
+        end (int): Конец периода или None.
+        exercise (str): Название упражнения или None.
+        progress (callable): Функция progress(done, total).
+        cancel_event (threading.Event): Событие прерывания экспорта.
+
+    Returns:
+        tuple: Признак полной записи файла и количество экспортируемых записей.
+    """
+    records = repository.query(start, end, exercise)
+    records.reverse()
+    write_file = write_backup if strip_compression(path).lower().endswith(BINARY_EXTENSION) else export_csv
+    with span('export'):
+        return write_file(path, records, progress=progress, cancel_event=cancel_event), len(records)
+
+
+def import_records(repository, path, merge=True, progress=None, cancel_event=None):
+    """
+    Импорт записей из CSV файла или из резервной копии (по расширению файла).
+
+    Args:
+        repository (TrainingRepository): Репозиторий записей.
+        path (str): Путь к файлу (.csv или BINARY_EXTENSION, возможно с расширением сжатия .gz или .zst).
+        merge (bool): True — объединить с журналом (дубликаты пропускаются), False — заменить журнал.
+        progress (callable): Функция progress(done, total).
+        cancel_event (threading.Event): Событие прерывания импорта.
+
+    Returns:
+        ImportResult: Результат импорта.
+    """
+    read_file = import_backup if strip_compression(path).lower().endswith(BINARY_EXTENSION) else import_csv
+    with span('import'):
+        return read_file(path, repository, merge=merge, progress=progress, cancel_event=cancel_event)
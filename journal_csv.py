@@ -0,0 +1,328 @@
+"""
+Модуль импорта и экспорта записей о тренировках в CSV файлы.
+
+Файл читается и записывается потоком пачками строк, поэтому импорт и экспорт большого
+журнала не требуют промежуточного представления всех строк в памяти. При импорте формат
+даты определяется по первой строке и запоминается, а в режиме объединения записи, уже
+имеющиеся в журнале, пропускаются.
+"""
+
+import csv
+import locale
+import os
+
+from journal_files import TEMP_SUFFIX, compression_of, open_archive, remove_quietly, replace_file, sync_path
+from journal_model import (DATE_FORMAT, ISO_DATE_FORMAT, TrainingRecord, parse_repetitions, parse_timestamp,
+                           parse_weight, record_key)
+from journal_profiling import count
+
+# Заголовки столбцов CSV файла
+CSV_HEADER = ["Дата", "Упражнение", "Вес", "Повторения"]
+
+# Форматы даты, которые принимаются при импорте
+IMPORT_DATE_FORMATS = (DATE_FORMAT, ISO_DATE_FORMAT)
+
+# Количество строк в одной пачке импорта и экспорта
+IMPORT_CHUNK_SIZE = 5000
+EXPORT_BATCH_SIZE = 5000
+
+# Количество сообщений об ошибках, сохраняемых в результате импорта
+MAX_REPORTED_ERRORS = 20
+
+
+class _ImportCancelled(Exception):
+    """
+    Прерывание чтения пачек при замене журнала (отменяет перезапись хранилища).
+    """
+
+
+class ImportResult:
+    """
+    Результат импорта из CSV файла.
+    """
+
+    def __init__(self):
+        """
+        Инициализация пустого результата.
+        """
+        # Количество добавленных записей
+        self.added = 0
+        # Количество пропущенных дубликатов
+        self.duplicates = 0
+        # Количество пропущенных некорректных строк и первые сообщения о них
+        self.invalid = 0
+        self.errors = []
+        # Признак прерывания импорта пользователем
+        self.cancelled = False
+
+    def add_error(self, line_number, message):
+        """
+        Учет некорректной строки.
+
+        Args:
+            line_number (int): Номер строки в файле.
+            message (str): Описание ошибки.
+        """
+        self.invalid += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f"Строка {line_number}: {message}")
+
+
+class CsvRecordReader:
+    """
+    Потоковое чтение записей о тренировках из CSV файла пачками.
+    """
+
+    def __init__(self, path, result, chunk_size=IMPORT_CHUNK_SIZE):
+        """
+        Инициализация чтения.
+
+        Args:
+            path (str): Путь к CSV файлу (возможно, сжатому: .csv.gz, .csv.zst).
+            result (ImportResult): Результат импорта, в который записываются ошибки.
+            chunk_size (int): Количество строк в пачке.
+        """
+        self.path = path
+        self.result = result
+        self.chunk_size = chunk_size
+        # Размер файла и количество прочитанных байтов для отображения прогресса
+        self.total_bytes = os.path.getsize(path)
+        self.read_bytes = 0
+        # Сжатый файл, открытый под распаковкой (для подсчета прочитанных сжатых байтов)
+        self._raw = None
+        # Формат даты, определенный по первой строке
+        self.date_format = None
+        self._encoding = locale.getpreferredencoding(False)
+
+    def _lines(self, file):
+        """
+        Чтение строк файла с подсчетом прочитанных байтов.
+
+        Args:
+            file (io.BufferedReader): Файл, открытый в двоичном режиме.
+
+        Yields:
+            str: Строки файла.
+        """
+        for raw_line in file:
+            if self._raw is not None:
+                self.read_bytes = self._raw.tell()
+            else:
+                self.read_bytes += len(raw_line)
+            yield raw_line.decode(self._encoding)
+
+    def parse_date(self, text):
+        """
+        Разбор даты с использованием запомненного формата.
+
+        Args:
+            text (str): Дата и время.
+
+        Returns:
+            int: Временная метка.
+
+        Raises:
+            ValueError: Если дата не соответствует ни одному из допустимых форматов.
+        """
+        if self.date_format is not None:
+            try:
+                return parse_timestamp(text, self.date_format)
+            except ValueError:
+                pass
+        for date_format in IMPORT_DATE_FORMATS:
+            if date_format == self.date_format:
+                continue
+            try:
+                timestamp = parse_timestamp(text, date_format)
+            except ValueError:
+                continue
+            self.date_format = date_format
+            return timestamp
+        raise ValueError(f"Неверный формат даты: {text}")
+
+    def parse_row(self, row):
+        """
+        Разбор строки CSV файла в запись о тренировке.
+
+        Args:
+            row (list): Значения столбцов: дата, упражнение, вес, повторения.
+
+        Returns:
+            TrainingRecord: Запись о тренировке.
+
+        Raises:
+            ValueError: Если строка некорректна.
+        """
+        date, exercise, weight, repetitions = row
+        exercise = exercise.strip()
+        if not exercise:
+            raise ValueError("Не указано упражнение")
+        return TrainingRecord(None, self.parse_date(date), exercise, parse_weight(weight),
+                              parse_repetitions(repetitions))
+
+    def chunks(self):
+        """
+        Чтение записей пачками.
+
+        Yields:
+            list: Записи TrainingRecord из очередной пачки строк.
+        """
+        with open_archive(self.path, 'rb') as file:
+            # Прогресс сжатого файла отсчитывается по прочитанным сжатым байтам
+            self._raw = getattr(file, 'fileobj', None)
+            reader = csv.reader(self._lines(file))
+            next(reader, None)  # Пропуск заголовков столбцов
+            chunk = []
+            for row in reader:
+                if not row:
+                    continue
+                try:
+                    chunk.append(self.parse_row(row))
+                except ValueError:
+                    self.result.add_error(reader.line_num, "некорректные данные: " + ";".join(row))
+                if len(chunk) >= self.chunk_size:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+
+
+def import_chunks(chunks, repository, result, merge=False, progress=None, cancel_event=None):
+    """
+    Добавление записей, прочитанных пачками, в репозиторий.
+
+    В режиме объединения записи добавляются к журналу пачками, а записи с теми же датой,
+    упражнением, весом и повторениями, что и уже имеющиеся, пропускаются. В режиме замены
+    пачки сразу пишутся в новый файл журнала (или в транзакцию базы данных), который заменяет
+    прежний только после успешного чтения всех пачек; при прерывании журнал не изменяется.
+
+    Args:
+        chunks (iterable): Пачки записей TrainingRecord.
+        repository (TrainingRepository): Репозиторий записей.
+        result (ImportResult): Результат импорта.
+        merge (bool): True — объединить с журналом, False — заменить журнал.
+        progress (callable): Функция без аргументов, вызываемая после каждой пачки.
+        cancel_event (threading.Event): Событие прерывания импорта.
+
+    Returns:
+        ImportResult: Результат импорта.
+    """
+    if not merge:
+        return _replace_with_chunks(chunks, repository, result, progress, cancel_event)
+
+    # Ключи уже имеющихся записей для поиска дубликатов
+    known_keys = repository.record_keys()
+    for chunk in chunks:
+        if cancel_event is not None and cancel_event.is_set():
+            result.cancelled = True
+            break
+        fresh = []
+        for record in chunk:
+            key = record_key(record)
+            if key in known_keys:
+                result.duplicates += 1
+                continue
+            known_keys.add(key)
+            fresh.append(record)
+        result.added += len(repository.add_many(fresh))
+        if progress is not None:
+            progress()
+    return result
+
+
+def _replace_with_chunks(chunks, repository, result, progress=None, cancel_event=None):
+    """
+    Замена журнала записями, прочитанными пачками, без накопления всех записей в памяти.
+
+    Args:
+        chunks (iterable): Пачки записей TrainingRecord.
+        repository (TrainingRepository): Репозиторий записей.
+        result (ImportResult): Результат импорта.
+        progress (callable): Функция без аргументов, вызываемая после каждой пачки.
+        cancel_event (threading.Event): Событие прерывания импорта.
+
+    Returns:
+        ImportResult: Результат импорта.
+    """
+    imported = 0
+
+    def records():
+        nonlocal imported
+        for chunk in chunks:
+            if cancel_event is not None and cancel_event.is_set():
+                raise _ImportCancelled()
+            yield from chunk
+            imported += len(chunk)
+            if progress is not None:
+                progress()
+
+    try:
+        repository.replace_all(records())
+    except _ImportCancelled:
+        result.cancelled = True
+        return result
+    result.added = imported
+    return result
+
+
+def import_csv(path, repository, merge=False, progress=None, cancel_event=None, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Импорт записей о тренировках из CSV файла.
+
+    Args:
+        path (str): Путь к CSV файлу.
+        repository (TrainingRepository): Репозиторий записей.
+        merge (bool): True — объединить с журналом, False — заменить журнал.
+        progress (callable): Функция progress(read_bytes, total_bytes), вызываемая после каждой пачки.
+        cancel_event (threading.Event): Событие прерывания импорта.
+        chunk_size (int): Количество строк в пачке.
+
+    Returns:
+        ImportResult: Результат импорта.
+    """
+    result = ImportResult()
+    reader = CsvRecordReader(path, result, chunk_size)
+    report = None if progress is None else lambda: progress(reader.read_bytes, reader.total_bytes)
+    try:
+        return import_chunks(reader.chunks(), repository, result, merge, report, cancel_event)
+    finally:
+        count('bytes.read', reader.read_bytes)
+
+
+def export_csv(path, records, progress=None, cancel_event=None, batch_size=EXPORT_BATCH_SIZE):
+    """
+    Экспорт записей о тренировках в CSV файл пачками строк.
+
+    Файл записывается под временным именем и переименовывается после успешного завершения,
+    поэтому при ошибке или отмене существующий файл не повреждается.
+
+    Args:
+        path (str): Путь к CSV файлу.
+        records (list): Записи TrainingRecord в порядке записи в файл.
+        progress (callable): Функция progress(written, total), вызываемая после каждой пачки.
+        cancel_event (threading.Event): Событие прерывания экспорта.
+        batch_size (int): Количество строк в пачке.
+
+    Returns:
+        bool: True, если экспорт завершен; False, если он был прерван.
+    """
+    temp_path = path + TEMP_SUFFIX
+    completed = False
+    try:
+        with open_archive(temp_path, 'wt', compression_of(path), newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(CSV_HEADER)  # Запись заголовков столбцов
+            for start in range(0, len(records), batch_size):
+                if cancel_event is not None and cancel_event.is_set():
+                    return False
+                writer.writerows(record.display_values() for record in records[start:start + batch_size])
+                if progress is not None:
+                    progress(min(start + batch_size, len(records)), len(records))
+        sync_path(temp_path)
+        count('bytes.written', os.path.getsize(temp_path))
+        replace_file(temp_path, path)
+        completed = True
+    finally:
+        if not completed:
+            remove_quietly(temp_path)
+    return True
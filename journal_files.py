@@ -0,0 +1,304 @@
+"""
+Модуль надежной записи файлов.
+
+Файлы журнала, итогов, списка упражнений и экспорта записываются под временным именем,
+сбрасываются на диск (fsync) и только затем атомарно заменяют прежний файл (os.replace),
+после чего на диск сбрасывается и запись каталога. Поэтому сбой или отключение питания
+во время записи оставляют либо старый, либо новый файл целиком, но не обрезанный.
+
+Файлы экспорта и резервных копий с расширением .gz сжимаются gzip, а с расширением .zst —
+zstd (если установлена библиотека zstandard).
+
+Запись журнала несколькими процессами (два окна приложения, скрипт командной строки рядом
+с интерфейсом) согласуется рекомендательной блокировкой отдельного файла .lock
+(fcntl.flock, в Windows — msvcrt.locking).
+"""
+
+import gzip
+import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+# Суффикс временного файла, в который выполняется запись перед заменой
+TEMP_SUFFIX = '.tmp'
+
+# Суффикс файла блокировки журнала
+LOCK_SUFFIX = '.lock'
+
+# Расширения сжатых файлов
+GZIP_EXTENSION = '.gz'
+ZSTD_EXTENSION = '.zst'
+COMPRESSED_EXTENSIONS = (GZIP_EXTENSION, ZSTD_EXTENSION)
+
+# Уровень сжатия gzip: почти такое же сжатие, как на уровне 9, но заметно быстрее
+GZIP_LEVEL = 6
+
+
+def sync_file(file):
+    """
+    Сброс содержимого открытого файла на диск.
+
+    Args:
+        file (io.IOBase): Файл, открытый для записи.
+    """
+    file.flush()
+    os.fsync(file.fileno())
+
+
+def sync_directory(path):
+    """
+    Сброс на диск записи каталога (переименований и созданий файлов в нем).
+
+    На системах, где каталог нельзя открыть (Windows), ничего не делает.
+
+    Args:
+        path (str): Путь к каталогу.
+    """
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    try:
+        descriptor = os.open(path or '.', os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return
+    try:
+        os.fsync(descriptor)
+    except OSError:
+        # Некоторые файловые системы не поддерживают fsync каталога
+        pass
+    finally:
+        os.close(descriptor)
+
+
+def sync_path(path):
+    """
+    Сброс на диск уже записанного и закрытого файла.
+
+    Используется для сжатых файлов, окончание которых записывается только при закрытии.
+
+    Args:
+        path (str): Путь к файлу.
+    """
+    with open(path, 'rb') as file:
+        os.fsync(file.fileno())
+
+
+def available_compressions():
+    """
+    Виды сжатия, доступные в текущем окружении.
+
+    Returns:
+        tuple: GZIP_EXTENSION и ZSTD_EXTENSION, если установлена библиотека zstandard.
+    """
+    return COMPRESSED_EXTENSIONS if zstandard is not None else (GZIP_EXTENSION,)
+
+
+def compression_of(path):
+    """
+    Вид сжатия файла по расширению.
+
+    Args:
+        path (str): Путь к файлу.
+
+    Returns:
+        str: GZIP_EXTENSION, ZSTD_EXTENSION или None для несжатого файла.
+    """
+    lowered = path.lower()
+    for extension in COMPRESSED_EXTENSIONS:
+        if lowered.endswith(extension):
+            return extension
+    return None
+
+
+def strip_compression(path):
+    """
+    Путь без расширения сжатия (для определения формата файла: backup.csv.gz -> backup.csv).
+
+    Args:
+        path (str): Путь к файлу.
+
+    Returns:
+        str: Путь без расширения сжатия.
+    """
+    extension = compression_of(path)
+    return path[:-len(extension)] if extension else path
+
+
+def open_archive(path, mode, compression=None, newline=None):
+    """
+    Открытие файла экспорта или резервной копии с упаковкой или распаковкой.
+
+    Args:
+        path (str): Путь к файлу.
+        mode (str): Режим открытия ('rb', 'wb', 'rt', 'wt').
+        compression (str): Вид сжатия (по умолчанию определяется по расширению path).
+        newline (str): Обработка переводов строк для текстового режима.
+
+    Returns:
+        io.IOBase: Открытый файл.
+
+    Raises:
+        ValueError: Если для сжатия zstd не установлена библиотека zstandard.
+    """
+    compression = compression or compression_of(path)
+    if compression == GZIP_EXTENSION:
+        if 'b' in mode:
+            return gzip.open(path, mode, compresslevel=GZIP_LEVEL)
+        return gzip.open(path, mode, compresslevel=GZIP_LEVEL, newline=newline)
+    if compression == ZSTD_EXTENSION:
+        if zstandard is None:
+            raise ValueError("Для файлов .zst требуется библиотека zstandard")
+        if 'b' in mode:
+            return zstandard.open(path, mode)
+        return zstandard.open(path, mode, newline=newline)
+    return open(path, mode, newline=newline)
+
+
+def replace_file(temp_path, path):
+    """
+    Атомарная замена файла записанным временным файлом.
+
+    Args:
+        temp_path (str): Путь к временному файлу (уже сброшенному на диск).
+        path (str): Путь к заменяемому файлу.
+    """
+    os.replace(temp_path, path)
+    sync_directory(os.path.dirname(path))
+
+
+def remove_quietly(path):
+    """
+    Удаление файла без ошибки, если его нет.
+
+    Args:
+        path (str): Путь к файлу.
+    """
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+@contextmanager
+def atomic_write(path, mode='w', encoding=None, newline=None):
+    """
+    Запись файла целиком через временный файл, fsync и атомарную замену.
+
+    При ошибке внутри блока временный файл удаляется, а прежний файл остается без изменений.
+
+    Args:
+        path (str): Путь к файлу.
+        mode (str): Режим открытия ('w' или 'wb').
+        encoding (str): Кодировка для текстового режима.
+        newline (str): Обработка переводов строк для текстового режима.
+
+    Yields:
+        io.IOBase: Временный файл, открытый для записи.
+    """
+    temp_path = path + TEMP_SUFFIX
+    try:
+        with open(temp_path, mode, encoding=encoding, newline=newline) as file:
+            yield file
+            sync_file(file)
+        replace_file(temp_path, path)
+    except BaseException:
+        remove_quietly(temp_path)
+        raise
+
+
+class FileLock:
+    """
+    Межпроцессная рекомендательная блокировка, связанная с файлом блокировки.
+
+    Блокировка повторно входима: поток, уже владеющий ею, может захватить ее снова (например,
+    репозиторий держит блокировку на время чтения чужих изменений и записи своих, а хранилище
+    захватывает ее внутри записи). Потоки одного процесса согласуются обычной блокировкой,
+    процессы — блокировкой файла. Если платформа не поддерживает блокировку файлов,
+    согласуются только потоки.
+    """
+
+    def __init__(self, path):
+        """
+        Инициализация блокировки (файл блокировки создается при первом захвате).
+
+        Args:
+            path (str): Путь к файлу блокировки.
+        """
+        self.path = path
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._file = None
+
+    def __enter__(self):
+        self._lock.acquire()
+        if self._depth == 0:
+            try:
+                self._file = open(self.path, 'a+b')
+                self._lock_file(self._file)
+            except BaseException:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                self._lock.release()
+                raise
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        self._depth -= 1
+        if self._depth == 0:
+            try:
+                self._unlock_file(self._file)
+            finally:
+                self._file.close()
+                self._file = None
+        self._lock.release()
+        return False
+
+    @staticmethod
+    def _lock_file(file):
+        """
+        Ожидание и захват блокировки файла.
+
+        Args:
+            file (io.BufferedRandom): Открытый файл блокировки.
+        """
+        if fcntl is not None:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+        elif msvcrt is not None:
+            file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+                    return
+                except OSError:
+                    # LK_LOCK ждет около 10 секунд, после чего ожидание повторяется
+                    continue
+
+    @staticmethod
+    def _unlock_file(file):
+        """
+        Освобождение блокировки файла.
+
+        Args:
+            file (io.BufferedRandom): Открытый файл блокировки.
+        """
+        if fcntl is not None:
+            fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+        elif msvcrt is not None:
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
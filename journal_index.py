@@ -0,0 +1,234 @@
+"""
+Модуль индексов записей о тренировках.
+
+Записи хранятся упорядоченными по дате и времени, поэтому выборка за период выполняется
+двоичным поиском границ и копированием среза без полного просмотра и сортировки.
+Словарь упражнений хранит для каждого названия количество подходов и время последнего
+использования, а также отсортированный список названий для подсказок по началу названия.
+"""
+
+import heapq
+from bisect import bisect_left, bisect_right, insort
+
+# Количество подсказок упражнений по умолчанию
+SUGGESTION_LIMIT = 10
+
+
+class SortedRecordIndex:
+    """
+    Список записей, упорядоченный по временной метке.
+    """
+
+    __slots__ = ('_timestamps', '_records')
+
+    def __init__(self, records=()):
+        """
+        Инициализация индекса.
+
+        Args:
+            records (iterable): Записи TrainingRecord, уже упорядоченные по временной метке.
+        """
+        self._records = list(records)
+        self._timestamps = [record.timestamp for record in self._records]
+
+    def __len__(self):
+        return len(self._records)
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def insert(self, record):
+        """
+        Вставка записи с сохранением порядка (запись с той же меткой помещается после существующих).
+
+        Args:
+            record (TrainingRecord): Запись о тренировке.
+        """
+        timestamp = record.timestamp
+        if not self._timestamps or timestamp >= self._timestamps[-1]:
+            # Новые подходы обычно добавляются в конец, вставка в середину не нужна
+            self._timestamps.append(timestamp)
+            self._records.append(record)
+            return
+        position = bisect_right(self._timestamps, timestamp)
+        self._timestamps.insert(position, timestamp)
+        self._records.insert(position, record)
+
+    def remove(self, record):
+        """
+        Удаление записи из индекса.
+
+        Args:
+            record (TrainingRecord): Запись о тренировке (сравнивается по идентификатору).
+
+        Returns:
+            bool: True, если запись была найдена и удалена.
+        """
+        position = bisect_left(self._timestamps, record.timestamp)
+        end = bisect_right(self._timestamps, record.timestamp, position)
+        for index in range(position, end):
+            if self._records[index].id == record.id:
+                del self._timestamps[index]
+                del self._records[index]
+                return True
+        return False
+
+    def range(self, start=None, end=None):
+        """
+        Выборка записей за период в порядке от последней к первой.
+
+        Args:
+            start (int): Начало периода (временная метка, включительно) или None.
+            end (int): Конец периода (временная метка, не включительно) или None.
+
+        Returns:
+            list: Записи TrainingRecord, отсортированные по убыванию даты.
+        """
+        low = 0 if start is None else bisect_left(self._timestamps, start)
+        high = len(self._timestamps) if end is None else bisect_left(self._timestamps, end, low)
+        selected = self._records[low:high]
+        selected.reverse()
+        return selected
+
+
+class ExerciseUsage:
+    """
+    Использование упражнения: количество подходов и время последнего подхода.
+    """
+
+    __slots__ = ('count', 'last_used')
+
+    def __init__(self, count=0, last_used=None):
+        """
+        Инициализация использования упражнения.
+
+        Args:
+            count (int): Количество подходов.
+            last_used (int): Временная метка последнего подхода или None.
+        """
+        self.count = count
+        self.last_used = last_used
+
+
+class ExerciseDictionary:
+    """
+    Словарь упражнений, обновляемый при каждом изменении записей, с поиском по началу названия.
+    """
+
+    def __init__(self):
+        """
+        Инициализация пустого словаря.
+        """
+        self._usage = {}
+        # Пары (название без учета регистра, название), отсортированные для двоичного поиска по префиксу
+        self._keys = []
+        # Номер версии набора названий, увеличивается при появлении или исчезновении упражнения
+        self.version = 0
+
+    def __len__(self):
+        return len(self._usage)
+
+    def __contains__(self, exercise):
+        return exercise in self._usage
+
+    def rebuild(self, records):
+        """
+        Построение словаря по всем записям за один проход.
+
+        Args:
+            records (iterable): Записи TrainingRecord.
+        """
+        usage = {}
+        for record in records:
+            entry = usage.get(record.exercise)
+            if entry is None:
+                entry = usage[record.exercise] = ExerciseUsage()
+            entry.count += 1
+            if entry.last_used is None or record.timestamp > entry.last_used:
+                entry.last_used = record.timestamp
+        self._usage = usage
+        self._keys = sorted((name.casefold(), name) for name in usage)
+        self.version += 1
+
+    def add(self, record):
+        """
+        Учет нового подхода.
+
+        Args:
+            record (TrainingRecord): Добавленная запись.
+        """
+        entry = self._usage.get(record.exercise)
+        if entry is None:
+            entry = self._usage[record.exercise] = ExerciseUsage()
+            insort(self._keys, (record.exercise.casefold(), record.exercise))
+            self.version += 1
+        entry.count += 1
+        if entry.last_used is None or record.timestamp > entry.last_used:
+            entry.last_used = record.timestamp
+
+    def remove(self, record, source):
+        """
+        Исключение удаленного подхода.
+
+        Args:
+            record (TrainingRecord): Удаляемая запись (уже удаленная из индексов).
+            source (callable): Функция source(exercise), возвращающая оставшиеся записи упражнения
+                для пересчета времени последнего подхода.
+        """
+        entry = self._usage.get(record.exercise)
+        if entry is None:
+            return
+        entry.count -= 1
+        if entry.count <= 0:
+            del self._usage[record.exercise]
+            key = (record.exercise.casefold(), record.exercise)
+            position = bisect_left(self._keys, key)
+            if position < len(self._keys) and self._keys[position] == key:
+                del self._keys[position]
+            self.version += 1
+        elif record.timestamp >= entry.last_used:
+            entry.last_used = max((remaining.timestamp for remaining in source(record.exercise)), default=None)
+
+    def names(self):
+        """
+        Названия упражнений в алфавитном порядке без учета регистра.
+
+        Returns:
+            list: Названия упражнений.
+        """
+        return [name for _, name in self._keys]
+
+    def usage(self, exercise):
+        """
+        Использование упражнения.
+
+        Args:
+            exercise (str): Название упражнения.
+
+        Returns:
+            ExerciseUsage: Количество подходов и время последнего подхода или None, если упражнения нет.
+        """
+        return self._usage.get(exercise)
+
+    def suggest(self, prefix, limit=SUGGESTION_LIMIT):
+        """
+        Подсказки упражнений, названия которых начинаются с префикса (без учета регистра).
+
+        Границы подходящих названий находятся двоичным поиском, поэтому подсказки не требуют
+        просмотра всего словаря.
+
+        Args:
+            prefix (str): Начало названия.
+            limit (int): Максимальное количество подсказок.
+
+        Returns:
+            list: Названия упражнений от наиболее часто используемого к наименее, при равенстве —
+                от использованного последним.
+        """
+        folded = prefix.casefold()
+        low = bisect_left(self._keys, (folded,))
+        # Все ключи с префиксом меньше префикса, дополненного наибольшим символом
+        high = bisect_left(self._keys, (folded + '\U0010ffff',), low)
+        matches = (name for _, name in self._keys[low:high])
+        return heapq.nlargest(limit, matches,
+                              key=lambda name: (self._usage[name].count, self._usage[name].last_used or 0))
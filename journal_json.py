@@ -0,0 +1,53 @@
+"""
+Модуль сериализации JSON для журнала тренировок.
+
+Если установлена библиотека orjson, чтение и запись выполняются через нее (в несколько раз
+быстрее стандартного модуля json), иначе используется стандартный модуль. В обоих случаях
+JSON записывается компактно: без отступов и пробелов, с символами не-ASCII как есть (UTF-8).
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Ошибка разбора JSON (у orjson она наследуется от json.JSONDecodeError)
+JSONDecodeError = json.JSONDecodeError
+
+# Название используемой реализации (для диагностики)
+BACKEND = 'orjson' if orjson is not None else 'json'
+
+
+def loads(data):
+    """
+    Разбор JSON.
+
+    Args:
+        data (bytes | str): Текст JSON.
+
+    Returns:
+        object: Разобранное значение.
+
+    Raises:
+        JSONDecodeError: Если текст не является корректным JSON.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(value):
+    """
+    Компактная сериализация значения в JSON.
+
+    Args:
+        value (object): Значение (словари, списки, строки, числа, None).
+
+    Returns:
+        bytes: JSON в кодировке UTF-8.
+    """
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
@@ -0,0 +1,320 @@
+"""
+Модуль модели записи о тренировке.
+
+Дата и время записи хранятся как целое число секунд от начала эпохи (по "настенному" времени,
+без учета часового пояса), вес — как число с плавающей точкой, повторения — как целое число.
+Преобразование в строки и обратно выполняется только при чтении и записи файлов и при
+отображении данных в интерфейсе.
+"""
+
+import sys
+from datetime import datetime, timedelta
+
+from journal_profiling import count
+
+# Формат даты и времени в журнале, CSV файлах и интерфейсе
+DATE_FORMAT = '%d.%m.%Y %H:%M:%S'
+
+# Формат даты и времени ISO, который также принимается при импорте из CSV
+ISO_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Формат даты без времени (поля фильтрации)
+DAY_FORMAT = '%d.%m.%Y'
+
+# Количество секунд в сутках
+SECONDS_PER_DAY = 86400
+
+# Начало отсчета временных меток
+EPOCH = datetime(1970, 1, 1)
+
+
+def datetime_to_timestamp(value):
+    """
+    Преобразование даты и времени во временную метку.
+
+    Args:
+        value (datetime): Дата и время.
+
+    Returns:
+        int: Количество секунд от начала эпохи.
+    """
+    return (value - EPOCH) // timedelta(seconds=1)
+
+
+def timestamp_to_datetime(timestamp):
+    """
+    Преобразование временной метки в дату и время.
+
+    Args:
+        timestamp (int): Количество секунд от начала эпохи.
+
+    Returns:
+        datetime: Дата и время.
+    """
+    return EPOCH + timedelta(seconds=timestamp)
+
+
+def parse_timestamp(text, date_format=DATE_FORMAT):
+    """
+    Разбор строки с датой и временем во временную метку.
+
+    Args:
+        text (str): Строка с датой и временем.
+        date_format (str): Формат строки.
+
+    Returns:
+        int: Количество секунд от начала эпохи.
+
+    Raises:
+        ValueError: Если строка не соответствует формату.
+    """
+    if date_format == DATE_FORMAT and len(text) == 19 and text[2] == text[5] == '.' and text[10] == ' ':
+        # Быстрый разбор основного формата без strptime
+        try:
+            value = datetime(int(text[6:10]), int(text[3:5]), int(text[0:2]),
+                             int(text[11:13]), int(text[14:16]), int(text[17:19]))
+        except ValueError:
+            count('dates.strptime')
+            value = datetime.strptime(text, date_format)
+    elif date_format == ISO_DATE_FORMAT and len(text) == 19 and text[4] == text[7] == '-' and text[10] == ' ':
+        # Быстрый разбор формата ISO без strptime
+        try:
+            value = datetime(int(text[0:4]), int(text[5:7]), int(text[8:10]),
+                             int(text[11:13]), int(text[14:16]), int(text[17:19]))
+        except ValueError:
+            count('dates.strptime')
+            value = datetime.strptime(text, date_format)
+    else:
+        count('dates.strptime')
+        value = datetime.strptime(text, date_format)
+    return datetime_to_timestamp(value)
+
+
+def format_timestamp(timestamp, date_format=DATE_FORMAT):
+    """
+    Форматирование временной метки в строку.
+
+    Args:
+        timestamp (int): Количество секунд от начала эпохи.
+        date_format (str): Формат строки.
+
+    Returns:
+        str: Строка с датой и временем.
+    """
+    return timestamp_to_datetime(timestamp).strftime(date_format)
+
+
+def format_weight(weight):
+    """
+    Форматирование веса для отображения (без дробной части у целых значений).
+
+    Args:
+        weight (float): Вес (целый вес может быть передан и как int).
+
+    Returns:
+        str: Строковое представление веса.
+    """
+    return str(int(weight)) if float(weight).is_integer() else repr(weight)
+
+
+def parse_weight(text):
+    """
+    Разбор веса, введенного пользователем или прочитанного из файла.
+
+    Args:
+        text (str): Вес в виде строки (допускается запятая в качестве разделителя).
+
+    Returns:
+        float: Вес.
+
+    Raises:
+        ValueError: Если значение не является неотрицательным числом.
+    """
+    weight = float(str(text).strip().replace(',', '.'))
+    if not weight >= 0 or weight == float('inf'):
+        raise ValueError(f"Некорректный вес: {text}")
+    return weight
+
+
+def parse_repetitions(text):
+    """
+    Разбор количества повторений, введенного пользователем или прочитанного из файла.
+
+    Args:
+        text (str): Количество повторений в виде строки.
+
+    Returns:
+        int: Количество повторений.
+
+    Raises:
+        ValueError: Если значение не является неотрицательным целым числом.
+    """
+    repetitions = int(str(text).strip())
+    if repetitions < 0:
+        raise ValueError(f"Некорректное количество повторений: {text}")
+    return repetitions
+
+
+class TrainingRecord:
+    """
+    Запись о выполненном подходе упражнения.
+    """
+
+    __slots__ = ('id', 'timestamp', 'exercise', 'weight', 'repetitions')
+
+    def __init__(self, entry_id, timestamp, exercise, weight, repetitions):
+        """
+        Инициализация записи.
+
+        Args:
+            entry_id (int): Идентификатор записи (None для еще не сохраненной записи).
+            timestamp (int): Дата и время подхода в секундах от начала эпохи.
+            exercise (str): Название упражнения.
+            weight (float): Вес.
+            repetitions (int): Количество повторений.
+        """
+        self.id = entry_id
+        self.timestamp = timestamp
+        # Одинаковые названия упражнений хранятся в памяти в одном экземпляре
+        self.exercise = sys.intern(exercise)
+        self.weight = weight
+        self.repetitions = repetitions
+
+    @classmethod
+    def parse(cls, date, exercise, weight, repetitions, entry_id=None, date_format=DATE_FORMAT):
+        """
+        Создание записи из строковых значений (ввод пользователя, CSV файл).
+
+        Args:
+            date (str): Дата и время.
+            exercise (str): Название упражнения.
+            weight (str): Вес.
+            repetitions (str): Количество повторений.
+            entry_id (int): Идентификатор записи.
+            date_format (str): Формат даты и времени.
+
+        Returns:
+            TrainingRecord: Новая запись.
+
+        Raises:
+            ValueError: Если значения некорректны.
+        """
+        exercise = str(exercise).strip()
+        if not exercise:
+            raise ValueError("Не указано упражнение")
+        return cls(entry_id, parse_timestamp(str(date), date_format), exercise,
+                   parse_weight(weight), parse_repetitions(repetitions))
+
+    @classmethod
+    def from_json(cls, data):
+        """
+        Создание записи из словаря в формате журнала.
+
+        Args:
+            data (dict): Словарь с ключами 'id', 'date', 'exercise', 'weight', 'repetitions'.
+
+        Returns:
+            TrainingRecord: Новая запись.
+        """
+        weight = data['weight']
+        repetitions = data['repetitions']
+        # Числа из журнала используются как есть, строки (старый формат) разбираются
+        if type(weight) not in (int, float):
+            weight = parse_weight(weight)
+        if type(repetitions) is not int:
+            repetitions = parse_repetitions(repetitions)
+        return cls(data.get('id'), parse_timestamp(data['date']), data['exercise'], float(weight), repetitions)
+
+    def to_json(self):
+        """
+        Преобразование записи в словарь в формате журнала.
+
+        Returns:
+            dict: Словарь с ключами 'id', 'date', 'exercise', 'weight', 'repetitions'.
+        """
+        # Целый вес записывается без дробной части (вес может быть передан и как int)
+        weight = int(self.weight) if float(self.weight).is_integer() else self.weight
+        return {'id': self.id, 'date': self.date, 'exercise': self.exercise,
+                'weight': weight, 'repetitions': self.repetitions}
+
+    @classmethod
+    def from_row(cls, row):
+        """
+        Создание записи из строки компактного формата журнала.
+
+        Args:
+            row (list): Значения [идентификатор, временная метка, упражнение, вес, повторения].
+
+        Returns:
+            TrainingRecord: Новая запись.
+
+        Raises:
+            TypeError: Если значения имеют неверный тип.
+            ValueError: Если значения некорректны.
+        """
+        entry_id, timestamp, exercise, weight, repetitions = row
+        if type(timestamp) is not int or type(repetitions) is not int or type(exercise) is not str:
+            raise TypeError(f"Некорректная строка журнала: {row!r}")
+        return cls(entry_id, timestamp, exercise, float(weight), repetitions)
+
+    def to_row(self):
+        """
+        Преобразование записи в строку компактного формата журнала (дата хранится временной меткой).
+
+        Returns:
+            list: Значения [идентификатор, временная метка, упражнение, вес, повторения].
+        """
+        # Целый вес записывается без дробной части (вес может быть передан и как int)
+        weight = int(self.weight) if float(self.weight).is_integer() else self.weight
+        return [self.id, self.timestamp, self.exercise, weight, self.repetitions]
+
+    @property
+    def date(self):
+        """
+        Дата и время записи в виде строки.
+
+        Returns:
+            str: Дата и время в формате DATE_FORMAT.
+        """
+        return format_timestamp(self.timestamp)
+
+    def display_values(self):
+        """
+        Значения записи для отображения в таблице и экспорта в CSV.
+
+        Returns:
+            tuple: Дата, упражнение, вес и количество повторений в виде строк.
+        """
+        return self.date, self.exercise, format_weight(self.weight), str(self.repetitions)
+
+    def replace(self, **changes):
+        """
+        Создание копии записи с измененными полями.
+
+        Args:
+            **changes: Новые значения полей.
+
+        Returns:
+            TrainingRecord: Новая запись.
+        """
+        values = {name: getattr(self, name) for name in self.__slots__}
+        values.update(changes)
+        return TrainingRecord(values['id'], values['timestamp'], values['exercise'],
+                              values['weight'], values['repetitions'])
+
+    def __repr__(self):
+        return (f"TrainingRecord(id={self.id!r}, date={self.date!r}, exercise={self.exercise!r}, "
+                f"weight={self.weight!r}, repetitions={self.repetitions!r})")
+
+
+def record_key(record):
+    """
+    Ключ записи для поиска дубликатов: дата, упражнение, вес и количество повторений.
+
+    Args:
+        record (TrainingRecord): Запись о тренировке.
+
+    Returns:
+        tuple: Кортеж (timestamp, exercise, weight, repetitions).
+    """
+    return record.timestamp, record.exercise, record.weight, record.repetitions
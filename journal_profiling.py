@@ -0,0 +1,240 @@
+"""
+Модуль замеров производительности приложения.
+
+Горячие участки (загрузка и запись журнала, выборки, статистика, заполнение таблиц,
+построение графиков) обернуты в интервалы замера времени и увеличивают счетчики
+(просмотренные записи, прочитанные и записанные байты, вызовы strptime). Замеры
+выключены по умолчанию и почти ничего не стоят, пока выключены; включаются флагом
+--diagnostics. Накопленные данные показываются в окне диагностики и сохраняются в JSON.
+
+Кроме того, любую операцию можно выполнить под cProfile: если задан каталог профилей,
+результат каждого профилируемого вызова сохраняется в файл .pstats
+(просмотр: python -m pstats файл.pstats).
+"""
+
+import cProfile
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime
+
+
+class SpanStats:
+    """
+    Накопленная статистика интервалов с одним названием.
+    """
+
+    def __init__(self):
+        """
+        Инициализация пустой статистики.
+        """
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def add(self, duration):
+        """
+        Учет завершенного интервала.
+
+        Args:
+            duration (float): Длительность интервала в секундах.
+        """
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+        self.last = duration
+
+    def to_json(self):
+        """
+        Преобразование статистики в словарь для сохранения в JSON (время в миллисекундах).
+
+        Returns:
+            dict: Количество, суммарное, среднее, максимальное и последнее время.
+        """
+        return {'count': self.count, 'total_ms': self.total * 1000, 'avg_ms': self.total / self.count * 1000,
+                'max_ms': self.max * 1000, 'last_ms': self.last * 1000}
+
+
+class Span:
+    """
+    Интервал замера времени (используется как контекстный менеджер).
+    """
+
+    def __init__(self, instrumentation, name):
+        """
+        Инициализация интервала.
+
+        Args:
+            instrumentation (Instrumentation): Накопитель замеров.
+            name (str): Название интервала.
+        """
+        self.instrumentation = instrumentation
+        self.name = name
+        self._started = None
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.instrumentation.record(self.name, time.perf_counter() - self._started)
+        return False
+
+
+class NullSpan:
+    """
+    Пустой интервал, используемый, пока замеры выключены.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+# Единственный пустой интервал: при выключенных замерах новые объекты не создаются
+NULL_SPAN = NullSpan()
+
+
+class Instrumentation:
+    """
+    Накопитель интервалов и счетчиков; безопасен для использования из нескольких потоков.
+    """
+
+    def __init__(self):
+        """
+        Инициализация выключенного накопителя.
+        """
+        self.enabled = False
+        # Каталог для файлов .pstats; None — профилирование cProfile выключено
+        self.profile_dir = None
+        self._spans = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+        # cProfile допускает только один активный профилировщик, поэтому вызовы профилируются по очереди
+        self._profile_lock = threading.Lock()
+
+    def span(self, name):
+        """
+        Интервал замера времени участка кода.
+
+        Args:
+            name (str): Название интервала (например, 'repository.load').
+
+        Returns:
+            Span | NullSpan: Контекстный менеджер интервала.
+        """
+        return Span(self, name) if self.enabled else NULL_SPAN
+
+    def record(self, name, duration):
+        """
+        Учет завершенного интервала.
+
+        Args:
+            name (str): Название интервала.
+            duration (float): Длительность в секундах.
+        """
+        with self._lock:
+            stats = self._spans.get(name)
+            if stats is None:
+                stats = self._spans[name] = SpanStats()
+            stats.add(duration)
+
+    def count(self, name, amount=1):
+        """
+        Увеличение счетчика.
+
+        Args:
+            name (str): Название счетчика (например, 'bytes.read').
+            amount (int): Величина увеличения.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def snapshot(self):
+        """
+        Текущие значения интервалов и счетчиков.
+
+        Returns:
+            dict: {'spans': название -> статистика, 'counters': название -> значение}.
+        """
+        with self._lock:
+            return {'spans': {name: stats.to_json() for name, stats in sorted(self._spans.items())},
+                    'counters': dict(sorted(self._counters.items()))}
+
+    def reset(self):
+        """
+        Сброс накопленных интервалов и счетчиков.
+        """
+        with self._lock:
+            self._spans = {}
+            self._counters = {}
+
+    def dump(self, path):
+        """
+        Сохранение накопленных замеров в JSON файл.
+
+        Args:
+            path (str): Путь к файлу.
+        """
+        data = {'created': datetime.now().isoformat(timespec='seconds'), **self.snapshot()}
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(data, file, ensure_ascii=False, indent=2)
+
+    def profile(self, name, function, *args):
+        """
+        Вызов функции под cProfile с сохранением результата, если задан каталог профилей.
+
+        Args:
+            name (str): Название вызова (используется в имени файла).
+            function (callable): Вызываемая функция.
+            *args: Аргументы функции.
+
+        Returns:
+            object: Результат функции.
+        """
+        if self.profile_dir is None:
+            return function(*args)
+        with self._profile_lock:
+            profiler = cProfile.Profile()
+            try:
+                return profiler.runcall(function, *args)
+            finally:
+                os.makedirs(self.profile_dir, exist_ok=True)
+                stamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+                safe_name = re.sub(r'[^\w.-]+', '_', name)
+                profiler.dump_stats(os.path.join(self.profile_dir, f"{safe_name}-{stamp}.pstats"))
+
+
+# Общий накопитель замеров приложения
+instrumentation = Instrumentation()
+
+
+def span(name):
+    """
+    Интервал замера времени в общем накопителе.
+
+    Args:
+        name (str): Название интервала.
+
+    Returns:
+        Span | NullSpan: Контекстный менеджер интервала.
+    """
+    return instrumentation.span(name)
+
+
+def count(name, amount=1):
+    """
+    Увеличение счетчика в общем накопителе.
+
+    Args:
+        name (str): Название счетчика.
+        amount (int): Величина увеличения.
+    """
+    instrumentation.count(name, amount)
@@ -0,0 +1,374 @@
+"""
+Модуль личных рекордов и динамики прогресса по упражнениям.
+
+Личные рекорды (максимальный вес, наибольшее количество повторений с данным весом, лучшая
+оценка одноповторного максимума, наибольший объем за тренировку) и тренд оценки 1ПМ
+определяются за один проход по записям в хронологическом порядке: для каждого упражнения
+хранится только текущее состояние, а не история подходов. Подход, добавленный после
+остальных подходов упражнения, учитывается за постоянное время, поэтому новый рекорд можно
+отметить сразу при вводе. Изменение или удаление записи (как и подход задним числом)
+помечает упражнение для пересчета по его записям при следующем обращении; после загрузки
+журнала упражнения так же рассчитываются при первом обращении, а не во время загрузки.
+
+Тренировкой считаются подходы упражнения за один календарный день. Тренд — наклон прямой,
+проведенной методом наименьших квадратов через лучшие оценки 1ПМ тренировок, в кг в неделю;
+уровень — экспоненциально сглаженная оценка 1ПМ последних тренировок.
+"""
+
+from journal_model import SECONDS_PER_DAY
+
+# Виды личных рекордов
+RECORD_WEIGHT = 'weight'
+RECORD_REPETITIONS = 'repetitions'
+RECORD_ONE_REP_MAX = 'one_rep_max'
+RECORD_VOLUME = 'volume'
+
+# Названия рекордов для сообщений
+RECORD_TITLES = {
+    RECORD_WEIGHT: "максимальный вес",
+    RECORD_REPETITIONS: "больше всего повторений с этим весом",
+    RECORD_ONE_REP_MAX: "лучшая оценка 1ПМ",
+    RECORD_VOLUME: "наибольший объем за тренировку",
+}
+
+# Коэффициент экспоненциального сглаживания оценки 1ПМ по тренировкам
+LEVEL_SMOOTHING = 0.3
+
+
+def describe_records(kinds):
+    """
+    Описание установленных рекордов для сообщения пользователю.
+
+    Args:
+        kinds (list): Виды рекордов.
+
+    Returns:
+        str: Названия рекордов через запятую.
+    """
+    return ", ".join(RECORD_TITLES[kind] for kind in kinds)
+
+
+def estimate_one_rep_max(weight, repetitions):
+    """
+    Оценка одноповторного максимума одного подхода по формуле Эпли (как в journal_analytics.one_rep_max).
+
+    Args:
+        weight (float): Вес.
+        repetitions (int): Количество повторений.
+
+    Returns:
+        float: Оценка максимума (для одного повторения — сам вес, без повторений — 0).
+    """
+    if repetitions <= 0:
+        return 0.0
+    if repetitions == 1:
+        return weight
+    return weight * (1 + repetitions / 30)
+
+
+class ExerciseProgress:
+    """
+    Личные рекорды и тренд одного упражнения.
+    """
+
+    __slots__ = ('sets', 'last_timestamp', 'max_weight', 'max_weight_at', 'best_one_rep_max', 'best_one_rep_max_at',
+                 'best_volume', 'best_volume_day', 'repetitions_at', 'session_day', 'session_volume', 'session_best',
+                 'closed_sessions', 'closed_level', '_sum_x', '_sum_y', '_sum_xy', '_sum_xx')
+
+    def __init__(self):
+        """
+        Инициализация состояния упражнения без подходов.
+        """
+        self.sets = 0
+        self.last_timestamp = None
+        # Рекорды и время подходов, которыми они установлены
+        self.max_weight = 0.0
+        self.max_weight_at = None
+        self.best_one_rep_max = 0.0
+        self.best_one_rep_max_at = None
+        self.best_volume = 0.0
+        self.best_volume_day = None
+        # Вес -> (наибольшее количество повторений, время подхода)
+        self.repetitions_at = {}
+        # Текущая (последняя) тренировка: день, объем и лучшая оценка 1ПМ
+        self.session_day = None
+        self.session_volume = 0.0
+        self.session_best = 0.0
+        # Завершенные тренировки: количество, сглаженная оценка 1ПМ и суммы для наименьших квадратов
+        self.closed_sessions = 0
+        self.closed_level = None
+        self._sum_x = 0.0
+        self._sum_y = 0.0
+        self._sum_xy = 0.0
+        self._sum_xx = 0.0
+
+    def check(self, record):
+        """
+        Рекорды, которые установил бы подход (состояние не изменяется).
+
+        Первый подход упражнения и первый подход с новым весом рекордами не считаются.
+
+        Args:
+            record (TrainingRecord): Подход.
+
+        Returns:
+            list: Виды рекордов (RECORD_WEIGHT, RECORD_REPETITIONS, RECORD_ONE_REP_MAX, RECORD_VOLUME).
+        """
+        if not self.sets:
+            return []
+        achieved = []
+        if record.weight > self.max_weight:
+            achieved.append(RECORD_WEIGHT)
+        best = self.repetitions_at.get(record.weight)
+        if best is not None and record.repetitions > best[0]:
+            achieved.append(RECORD_REPETITIONS)
+        if estimate_one_rep_max(record.weight, record.repetitions) > self.best_one_rep_max:
+            achieved.append(RECORD_ONE_REP_MAX)
+        day = record.timestamp // SECONDS_PER_DAY
+        if day == self.session_day:
+            volume = self.session_volume + record.weight * record.repetitions
+            # Рекорд объема отмечается один раз — подходом, которым тренировка превзошла лучшую
+            if volume > self.best_volume and self.best_volume_day != day:
+                achieved.append(RECORD_VOLUME)
+        elif day > self.session_day and record.weight * record.repetitions > self.best_volume:
+            achieved.append(RECORD_VOLUME)
+        return achieved
+
+    def add(self, record):
+        """
+        Учет подхода, выполненного не раньше всех учтенных подходов упражнения.
+
+        Args:
+            record (TrainingRecord): Подход.
+        """
+        weight = record.weight
+        repetitions = record.repetitions
+        timestamp = record.timestamp
+        if weight > self.max_weight or self.max_weight_at is None:
+            self.max_weight = weight
+            self.max_weight_at = timestamp
+        best = self.repetitions_at.get(weight)
+        if best is None or repetitions > best[0]:
+            self.repetitions_at[weight] = (repetitions, timestamp)
+        estimate = estimate_one_rep_max(weight, repetitions)
+        if estimate > self.best_one_rep_max or self.best_one_rep_max_at is None:
+            self.best_one_rep_max = estimate
+            self.best_one_rep_max_at = timestamp
+
+        day = timestamp // SECONDS_PER_DAY
+        if day != self.session_day:
+            self._close_session()
+            self.session_day = day
+            self.session_volume = 0.0
+            self.session_best = 0.0
+        self.session_volume += weight * repetitions
+        if estimate > self.session_best:
+            self.session_best = estimate
+        if self.session_volume > self.best_volume or self.best_volume_day is None:
+            self.best_volume = self.session_volume
+            self.best_volume_day = day
+
+        self.sets += 1
+        self.last_timestamp = timestamp
+
+    def _close_session(self):
+        """
+        Учет завершенной тренировки в тренде и сглаженной оценке 1ПМ.
+        """
+        if self.session_day is None:
+            return
+        self.closed_level = self._smoothed(self.closed_level, self.session_best)
+        self.closed_sessions += 1
+        x = self.session_day / 7
+        self._sum_x += x
+        self._sum_y += self.session_best
+        self._sum_xy += x * self.session_best
+        self._sum_xx += x * x
+
+    @staticmethod
+    def _smoothed(level, value):
+        """
+        Экспоненциальное сглаживание оценки 1ПМ.
+
+        Args:
+            level (float): Сглаженное значение по предыдущим тренировкам или None.
+            value (float): Оценка очередной тренировки.
+
+        Returns:
+            float: Новое сглаженное значение.
+        """
+        return value if level is None else level + LEVEL_SMOOTHING * (value - level)
+
+    @property
+    def sessions(self):
+        """
+        Количество тренировок (дней с подходами упражнения).
+
+        Returns:
+            int: Количество тренировок, включая текущую.
+        """
+        return self.closed_sessions + (self.session_day is not None)
+
+    @property
+    def level(self):
+        """
+        Сглаженная оценка 1ПМ последних тренировок.
+
+        Returns:
+            float: Оценка или 0, если подходов нет.
+        """
+        if self.session_day is None:
+            return 0.0
+        return self._smoothed(self.closed_level, self.session_best)
+
+    @property
+    def trend(self):
+        """
+        Изменение оценки 1ПМ в кг в неделю (наклон прямой по лучшим оценкам тренировок).
+
+        Returns:
+            float: Наклон или 0, если тренировок меньше двух.
+        """
+        if self.session_day is None:
+            return 0.0
+        x = self.session_day / 7
+        count = self.closed_sessions + 1
+        sum_x = self._sum_x + x
+        sum_y = self._sum_y + self.session_best
+        sum_xy = self._sum_xy + x * self.session_best
+        sum_xx = self._sum_xx + x * x
+        denominator = count * sum_xx - sum_x * sum_x
+        if count < 2 or denominator <= 0:
+            return 0.0
+        return (count * sum_xy - sum_x * sum_y) / denominator
+
+    def copy(self):
+        """
+        Копия состояния.
+
+        Returns:
+            ExerciseProgress: Новый объект с теми же значениями.
+        """
+        clone = ExerciseProgress()
+        for name in self.__slots__:
+            setattr(clone, name, getattr(self, name))
+        clone.repetitions_at = dict(self.repetitions_at)
+        return clone
+
+
+class ProgressTracker:
+    """
+    Личные рекорды и тренды всех упражнений с пересчетом измененных упражнений при обращении.
+    """
+
+    def __init__(self):
+        """
+        Инициализация пустого состояния.
+        """
+        self._exercises = {}
+        # Упражнения, которые нужно пересчитать по их записям
+        self._stale = set()
+
+    def rebuild(self, records):
+        """
+        Расчет состояния всех упражнений за один проход.
+
+        Args:
+            records (iterable): Записи TrainingRecord в хронологическом порядке.
+        """
+        self._exercises = {}
+        self._stale = set()
+        for record in records:
+            progress = self._exercises.get(record.exercise)
+            if progress is None:
+                progress = self._exercises[record.exercise] = ExerciseProgress()
+            progress.add(record)
+
+    def reset(self, exercises):
+        """
+        Сброс состояния с отложенным расчетом: каждое упражнение рассчитывается за один проход
+        по его записям при первом обращении (загрузка журнала не тратит время на рекорды).
+
+        Args:
+            exercises (iterable): Названия всех упражнений.
+        """
+        self._exercises = {}
+        self._stale = set(exercises)
+
+    def add(self, record):
+        """
+        Учет нового подхода; подход задним числом помечает упражнение для пересчета.
+
+        Args:
+            record (TrainingRecord): Запись о тренировке.
+        """
+        exercise = record.exercise
+        if exercise in self._stale:
+            return
+        progress = self._exercises.get(exercise)
+        if progress is None:
+            progress = self._exercises[exercise] = ExerciseProgress()
+        elif record.timestamp < progress.last_timestamp:
+            self._stale.add(exercise)
+            return
+        progress.add(record)
+
+    def invalidate(self, exercise):
+        """
+        Пометка упражнения для пересчета (после изменения или удаления его записи).
+
+        Args:
+            exercise (str): Название упражнения.
+        """
+        self._stale.add(exercise)
+
+    def get(self, exercise, source):
+        """
+        Состояние упражнения с пересчетом, если оно устарело.
+
+        Args:
+            exercise (str): Название упражнения.
+            source (callable): Функция source(exercise), возвращающая записи упражнения
+                в порядке от последней к первой.
+
+        Returns:
+            ExerciseProgress: Состояние упражнения или None, если подходов нет.
+        """
+        if exercise in self._stale:
+            self._stale.discard(exercise)
+            progress = ExerciseProgress()
+            for record in reversed(source(exercise)):
+                progress.add(record)
+            if progress.sets:
+                self._exercises[exercise] = progress
+            else:
+                self._exercises.pop(exercise, None)
+        return self._exercises.get(exercise)
+
+    def check(self, record, source):
+        """
+        Рекорды, которые установил бы новый подход.
+
+        Args:
+            record (TrainingRecord): Подход.
+            source (callable): Функция source(exercise) (см. get).
+
+        Returns:
+            list: Виды рекордов.
+        """
+        progress = self.get(record.exercise, source)
+        return [] if progress is None else progress.check(record)
+
+    def summary(self, source):
+        """
+        Копии состояний всех упражнений.
+
+        Args:
+            source (callable): Функция source(exercise) (см. get).
+
+        Returns:
+            dict: Упражнение -> ExerciseProgress.
+        """
+        for exercise in list(self._stale):
+            self.get(exercise, source)
+        return {exercise: progress.copy() for exercise, progress in self._exercises.items()}
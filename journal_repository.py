@@ -0,0 +1,850 @@
+"""
+Модуль хранилища записей о тренировках в памяти.
+
+Репозиторий один раз загружает журнал при запуске приложения, обслуживает все окна из
+памяти, отслеживает несохраненные изменения и записывает их в журнал в фоновом потоке.
+Изменения, сделанные в течение короткого окна накопления, записываются одной операцией,
+а при закрытии репозитория все оставшиеся изменения записываются на диск.
+Записи индексируются по дате и по названию упражнения для быстрой выборки за период,
+а статистика по упражнениям, личные рекорды и словарь упражнений (для подсказок при вводе)
+обновляются при каждом изменении.
+
+С журналом могут одновременно работать несколько процессов (два окна приложения, скрипт
+командной строки). Перед каждой записью репозиторий под межпроцессной блокировкой журнала
+читает чужие изменения и применяет их к данным в памяти по одной операции, без повторной
+загрузки журнала; собственные еще не записанные записи, идентификаторы которых успел
+занять другой процесс, получают новые идентификаторы. Журнал перечитывается целиком,
+только если другой процесс заменил его (например, уплотнил).
+
+Дорогие производные результаты (столбцы NumPy для аналитики, таблицы статистики) кэшируются
+по виду запроса, его параметрам и версии данных: повторный запрос при неизменных данных
+возвращается из кэша, а любое изменение записей (в том числе чужое) сбрасывает кэш.
+"""
+
+import json
+import threading
+import time
+
+from journal_cache import LRUCache
+from journal_files import atomic_write
+from journal_index import SUGGESTION_LIMIT, ExerciseDictionary, SortedRecordIndex
+from journal_model import record_key
+from journal_profiling import count, span
+from journal_progression import ProgressTracker
+from journal_stats import StatsAggregator
+from journal_storage import OP_ADD, OP_DELETE, add_operation, delete_operation, update_operation
+
+# Окно накопления изменений, с, перед записью на диск: изменения, сделанные за это время
+# (например, при быстром вводе нескольких подходов подряд), записываются одной операцией
+FLUSH_DELAY = 0.5
+
+# Количество кэшируемых результатов запросов и их наибольший общий размер (в записях)
+QUERY_CACHE_SIZE = 32
+QUERY_CACHE_COST = 2000000
+
+
+class TrainingRepository:
+    """
+    Репозиторий записей о тренировках с однократной загрузкой и фоновой записью изменений.
+    """
+
+    def __init__(self, storage, flush_delay=FLUSH_DELAY):
+        """
+        Инициализация репозитория.
+
+        Args:
+            storage (JournalStorage): Хранилище журнала тренировок.
+            flush_delay (float): Окно накопления изменений перед записью на диск, с.
+        """
+        self.storage = storage
+        self.flush_delay = flush_delay
+        # Номер версии данных, увеличивается при каждом изменении
+        self.version = 0
+        # Последняя ошибка фоновой записи, если она произошла
+        self.last_error = None
+        # Номер версии чужих изменений: увеличивается, когда в память применяются изменения
+        # другого процесса (в том числе при замене идентификаторов своих записей)
+        self.external_version = 0
+
+        self._records = {}
+        # Индекс всех записей по дате и индексы по упражнениям (ключ — название в нижнем регистре)
+        self._by_date = SortedRecordIndex()
+        self._by_exercise = {}
+        # Словарь упражнений: количество подходов, время последнего подхода и поиск по началу названия
+        self._exercises = ExerciseDictionary()
+        # Итоги по упражнениям за все время и по периодам
+        self._stats = StatsAggregator()
+        # Личные рекорды и тренды по упражнениям
+        self._progress = ProgressTracker()
+        self._next_id = 1
+        self._pending = []
+        self._rewrite = False
+        self._signature = None
+        self._closed = False
+        # Признак закрытого хранилища: после close запись и повторное закрытие ничего не делают
+        self._finished = False
+        # Кэш результатов запросов и версия данных, для которой он заполнен
+        self.cache = LRUCache(QUERY_CACHE_SIZE, QUERY_CACHE_COST, name='query')
+        self._cache_version = None
+
+        # Блокировка данных в памяти и отдельная блокировка записи на диск
+        self._lock = threading.RLock()
+        self._io_lock = threading.Lock()
+        self._flush_requested = threading.Condition(self._lock)
+        self._writer = threading.Thread(target=self._writer_loop, name='journal-writer', daemon=True)
+        self._writer.start()
+
+    def load(self):
+        """
+        Загрузка всех записей из журнала в память.
+        """
+        with self._io_lock, self.storage.lock(), span('storage.load'):
+            records = self.storage.load()
+            signature = self.storage.signature()
+            next_id = self.storage.next_id
+        with self._lock:
+            self._records = {record.id: record for record in records}
+            with span('repository.index'):
+                self._build_indexes()
+            # Сохраненные итоги используются, если журнал не изменялся после их записи
+            with span('stats.rebuild'):
+                if not self._stats.load(self.storage.sidecar_path('stats'), signature):
+                    self._rebuild_stats()
+            self._next_id = next_id
+            self._pending = []
+            self._rewrite = False
+            self._signature = signature
+            self.version += 1
+
+    def _rebuild_stats(self):
+        """
+        Пересчет итогов: запросом к хранилищу, если оно умеет их вычислять, иначе по записям в памяти.
+        """
+        aggregated = self.storage.aggregate_stats()
+        if aggregated is None:
+            # Векторизованный расчет по столбцам записей, упорядоченных по дате
+            aggregated = self._aggregate()
+        self._stats.totals, self._stats.buckets = aggregated
+
+    def _aggregate(self):
+        """
+        Векторизованный расчет итогов по всем записям в памяти.
+
+        Returns:
+            tuple: Итоги за все время и итоги по периодам в формате StatsAggregator.
+        """
+        # NumPy загружается при первом использовании, а не при запуске приложения
+        from journal_analytics import RecordColumns, aggregate
+        return aggregate(RecordColumns.from_records(self._by_date))
+
+    def refresh_if_changed(self):
+        """
+        Применение изменений журнала, сделанных другими процессами.
+
+        Проверка без изменений стоит одного запроса сведений о файле, поэтому ее можно
+        выполнять периодически.
+
+        Returns:
+            bool: True, если данные в памяти изменились.
+        """
+        if not self.has_external_changes():
+            return False
+        with self._io_lock, self.storage.lock():
+            changed = self._catch_up()
+            signature = self.storage.signature()
+            with self._lock:
+                self._signature = signature
+        return changed
+
+    def has_external_changes(self):
+        """
+        Быстрая проверка (по сведениям о файле или номеру ревизии), что журнал изменен другим процессом.
+
+        Returns:
+            bool: True, если журнал изменился после последнего чтения или записи.
+        """
+        return self.storage.signature() != self._signature
+
+    def _catch_up(self):
+        """
+        Чтение чужих изменений журнала и их применение к данным в памяти
+        (выполняется под блокировкой записи и блокировкой журнала).
+
+        Returns:
+            bool: True, если данные в памяти изменились.
+        """
+        if self._rewrite:
+            # Ожидающая полная перезапись журнала заменяет и чужие изменения
+            return False
+        with span('repository.catch_up'):
+            changes = self.storage.read_changes()
+            if changes is None:
+                records = self.storage.load()
+                with self._lock:
+                    self._replay_pending(records, self.storage.next_id)
+                return True
+            if not changes:
+                return False
+            with self._lock:
+                self._merge_changes(changes, self.storage.next_id)
+        count('records.merged', len(changes))
+        return True
+
+    def _merge_changes(self, changes, storage_next_id):
+        """
+        Применение операций, дописанных в журнал другими процессами, к данным в памяти.
+
+        Собственные еще не записанные добавления, идентификаторы которых заняты чужими
+        добавлениями, получают новые идентификаторы. Если запись изменена или удалена и здесь,
+        и другим процессом, побеждает операция, записанная позже, то есть своя; исключение —
+        чужое удаление записи, которую здесь только изменили: при воспроизведении журнала
+        изменение удаленной записи не действует, поэтому запись удаляется и в памяти.
+
+        Args:
+            changes (list): Операции журнала, дописанные другими процессами.
+            storage_next_id (int): Следующий свободный идентификатор по данным журнала.
+        """
+        taken = {operation['id'] for operation in changes if operation['op'] == OP_ADD}
+        next_id = max(self._next_id, storage_next_id)
+        renumbered = {}
+        pending = []
+        for operation in self._pending:
+            entry_id = operation['id']
+            if operation['op'] == OP_ADD and entry_id in taken:
+                renumbered[entry_id] = next_id
+                next_id += 1
+                record = self._records.pop(entry_id, None)
+                if record is not None:
+                    self._unindex(record)
+                    record = record.replace(id=renumbered[entry_id])
+                    self._records[record.id] = record
+                    self._index(record)
+            pending.append(self._renumber(operation, renumbered))
+        self._pending = pending
+        self._next_id = next_id
+
+        # Записи, измененные или удаленные здесь, но еще не записанные
+        touched = {operation['id'] for operation in pending if operation['op'] != OP_ADD}
+        for operation in changes:
+            entry_id = operation['id']
+            current = self._records.get(entry_id)
+            if operation['op'] == OP_DELETE:
+                if current is not None:
+                    del self._records[entry_id]
+                    self._unindex(current)
+                continue
+            if entry_id in touched or (operation['op'] != OP_ADD and current is None):
+                continue
+            if current is not None:
+                self._unindex(current)
+            self._records[entry_id] = operation['record']
+            self._index(operation['record'])
+        self.version += 1
+        self.external_version += 1
+
+    def _replay_pending(self, records, storage_next_id):
+        """
+        Замена данных в памяти перечитанным журналом с повторным применением еще не записанных операций.
+
+        Args:
+            records (list): Записи TrainingRecord, прочитанные из журнала.
+            storage_next_id (int): Следующий свободный идентификатор по данным журнала.
+        """
+        current = {record.id: record for record in records}
+        next_id = max(self._next_id, storage_next_id)
+        renumbered = {}
+        pending = []
+        for operation in self._pending:
+            entry_id = operation['id']
+            if operation['op'] == OP_ADD and entry_id in current:
+                renumbered[entry_id] = next_id
+                next_id += 1
+            operation = self._renumber(operation, renumbered)
+            entry_id = operation['id']
+            if operation['op'] == OP_DELETE:
+                current.pop(entry_id, None)
+            elif operation['op'] == OP_ADD or entry_id in current:
+                current[entry_id] = operation['record']
+            pending.append(operation)
+        self._records = current
+        self._build_indexes()
+        self._stats.totals, self._stats.buckets = self._aggregate()
+        self._pending = pending
+        self._next_id = next_id
+        self.version += 1
+        self.external_version += 1
+
+    @staticmethod
+    def _renumber(operation, renumbered):
+        """
+        Операция с замененным идентификатором записи, если он был изменен.
+
+        Args:
+            operation (dict): Операция журнала.
+            renumbered (dict): Прежний идентификатор -> новый.
+
+        Returns:
+            dict: Исходная или новая операция.
+        """
+        entry_id = renumbered.get(operation['id'])
+        if entry_id is None:
+            return operation
+        previous = operation.get('previous')
+        if previous is not None:
+            previous = previous.replace(id=entry_id)
+        if operation['op'] == OP_DELETE:
+            return delete_operation(entry_id, previous)
+        record = operation['record'].replace(id=entry_id)
+        return add_operation(record) if operation['op'] == OP_ADD else update_operation(record, previous)
+
+    def saved_exercises(self):
+        """
+        Список упражнений, сохраненный при последнем закрытии, без чтения журнала.
+
+        Используется для заполнения выпадающего списка упражнений до окончания загрузки журнала.
+
+        Returns:
+            list: Отсортированные названия упражнений или None, если списка нет или журнал с тех пор изменялся.
+        """
+        try:
+            with open(self.storage.sidecar_path('exercises'), 'r', encoding='utf-8') as file:
+                data = json.load(file)
+            if data.get('signature') != list(self.storage.signature() or ()):
+                return None
+            return list(data['exercises'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _save_exercises(self):
+        """
+        Сохранение списка упражнений для быстрого заполнения интерфейса при следующем запуске.
+        """
+        with atomic_write(self.storage.sidecar_path('exercises'), 'w', encoding='utf-8') as file:
+            json.dump({'signature': list(self._signature), 'exercises': self.exercises()}, file,
+                      ensure_ascii=False, separators=(',', ':'))
+
+    def _build_indexes(self):
+        """
+        Построение индексов по дате и упражнению для всех записей.
+        """
+        ordered = sorted(self._records.values(), key=lambda record: (record.timestamp, record.id))
+        self._by_date = SortedRecordIndex(ordered)
+        groups = {}
+        for record in ordered:
+            groups.setdefault(record.exercise.lower(), []).append(record)
+        self._by_exercise = {key: SortedRecordIndex(group) for key, group in groups.items()}
+        self._exercises.rebuild(ordered)
+        self._progress.reset(self._exercises.names())
+
+    def _index(self, record):
+        """
+        Добавление записи в индексы и статистику.
+
+        Args:
+            record (TrainingRecord): Запись о тренировке.
+        """
+        self._stats.add(record)
+        self._by_date.insert(record)
+        key = record.exercise.lower()
+        index = self._by_exercise.get(key)
+        if index is None:
+            index = self._by_exercise[key] = SortedRecordIndex()
+        index.insert(record)
+        self._exercises.add(record)
+        self._progress.add(record)
+
+    def _unindex(self, record):
+        """
+        Удаление записи из индексов и статистики.
+
+        Args:
+            record (TrainingRecord): Запись о тренировке.
+        """
+        self._by_date.remove(record)
+        key = record.exercise.lower()
+        index = self._by_exercise.get(key)
+        if index is not None:
+            index.remove(record)
+            if not index:
+                del self._by_exercise[key]
+        self._stats.remove(record, self._exercise_records)
+        self._exercises.remove(record, self._exercise_records)
+        self._progress.invalidate(record.exercise)
+
+    def _exercise_records(self, exercise, start=None, end=None):
+        """
+        Записи упражнения (с точным совпадением названия) за период.
+
+        Args:
+            exercise (str): Название упражнения.
+            start (int): Начало периода или None.
+            end (int): Конец периода или None.
+
+        Returns:
+            list: Записи TrainingRecord.
+        """
+        index = self._by_exercise.get(exercise.lower())
+        if index is None:
+            return []
+        return [record for record in index.range(start, end) if record.exercise == exercise]
+
+    def exercise_stats(self):
+        """
+        Статистика по упражнениям за все время.
+
+        Returns:
+            dict: Упражнение -> ExerciseStats.
+        """
+        with self._lock:
+            return self._stats.exercise_stats()
+
+    def personal_records(self):
+        """
+        Личные рекорды и тренды по упражнениям.
+
+        Returns:
+            dict: Упражнение -> ExerciseProgress (копии, не изменяющиеся при добавлении записей).
+        """
+        with self._lock:
+            return self._progress.summary(self._exercise_records)
+
+    def exercise_progress(self, exercise):
+        """
+        Личные рекорды и тренд одного упражнения.
+
+        Args:
+            exercise (str): Название упражнения (с точным совпадением).
+
+        Returns:
+            ExerciseProgress: Копия состояния упражнения или None, если подходов нет.
+        """
+        with self._lock:
+            progress = self._progress.get(exercise, self._exercise_records)
+            return None if progress is None else progress.copy()
+
+    def check_personal_records(self, record):
+        """
+        Личные рекорды, которые установит новый подход, если его добавить.
+
+        Проверка выполняется за постоянное время по текущему состоянию рекордов упражнения.
+
+        Args:
+            record (TrainingRecord): Подход, еще не добавленный в репозиторий.
+
+        Returns:
+            list: Виды рекордов (journal_progression.RECORD_WEIGHT, RECORD_REPETITIONS, RECORD_ONE_REP_MAX,
+                RECORD_VOLUME).
+        """
+        with self._lock:
+            return self._progress.check(record, self._exercise_records)
+
+    def period_stats(self, period, start=None, end=None):
+        """
+        Статистика по упражнениям в разбивке по дням, неделям или месяцам.
+
+        Args:
+            period (str): Период группировки (PERIOD_DAY, PERIOD_WEEK или PERIOD_MONTH).
+            start (int): Начало диапазона (временная метка, включительно) или None.
+            end (int): Конец диапазона (временная метка, не включительно) или None.
+
+        Returns:
+            list: Кортежи (начало периода, упражнение, ExerciseStats) от последнего периода к первому.
+        """
+        with self._lock:
+            return self._stats.period_stats(period, start, end)
+
+    def query(self, start=None, end=None, exercise=None):
+        """
+        Выборка записей за период и по упражнению в порядке от последней к первой.
+
+        Args:
+            start (int): Начало периода (временная метка, включительно) или None.
+            end (int): Конец периода (временная метка, не включительно) или None.
+            exercise (str): Название упражнения (без учета регистра) или None для всех упражнений.
+
+        Returns:
+            list: Записи TrainingRecord, отсортированные по убыванию даты.
+        """
+        with self._lock, span('repository.query'):
+            if not exercise:
+                records = self._by_date.range(start, end)
+            else:
+                index = self._by_exercise.get(exercise.lower())
+                records = index.range(start, end) if index is not None else []
+        count('records.scanned', len(records))
+        return records
+
+    def filter_records(self, start=None, end=None, exercise=None):
+        """
+        Выборка записей для фильтров: индексированным запросом хранилища (база данных SQLite),
+        если оно его поддерживает, иначе из индексов в памяти.
+
+        Перед запросом к хранилищу на диск записываются накопленные изменения, чтобы выборка их учитывала.
+
+        Args:
+            start (int): Начало периода (временная метка, включительно) или None.
+            end (int): Конец периода (временная метка, не включительно) или None.
+            exercise (str): Название упражнения (без учета регистра) или None для всех упражнений.
+
+        Returns:
+            list: Записи TrainingRecord, отсортированные по убыванию даты.
+
+        Raises:
+            OSError: Если не удалось записать накопленные изменения.
+            ConcurrentModificationError: Если журнал изменен другим процессом во время записи.
+        """
+        if not self.storage.indexed_query:
+            return self.query(start, end, exercise)
+        self.flush()
+        with span('storage.query'):
+            records = self.storage.query(start, end, exercise)
+        count('records.scanned', len(records))
+        return records
+
+    def columns(self, start=None, end=None, exercise=None):
+        """
+        Выборка записей за период и по упражнению в виде столбцов NumPy для аналитики.
+
+        Args:
+            start (int): Начало периода (временная метка, включительно) или None.
+            end (int): Конец периода (временная метка, не включительно) или None.
+            exercise (str): Название упражнения (без учета регистра) или None для всех упражнений.
+
+        Returns:
+            RecordColumns: Столбцы записей в хронологическом порядке.
+        """
+        # NumPy загружается при первом использовании, а не при запуске приложения
+        from journal_analytics import RecordColumns
+
+        def build():
+            records = self.query(start, end, exercise)
+            records.reverse()
+            return RecordColumns.from_records(records)
+
+        return self.cached('columns', (start, end, exercise.lower() if exercise else None), build)
+
+    def cached(self, kind, params, compute, cost=len):
+        """
+        Результат запроса из кэша по виду запроса, параметрам и версии данных.
+
+        Кэшированные значения используются вызывающими только для чтения. Результат, рассчитанный,
+        пока данные изменялись, в кэш не попадает.
+
+        Args:
+            kind (str): Вид запроса (например, 'columns' или 'stats').
+            params (tuple): Нормализованные параметры запроса (период, упражнение в нижнем регистре).
+            compute (callable): Функция без аргументов, рассчитывающая результат.
+            cost (callable): Функция, возвращающая размер результата для ограничения памяти кэша.
+
+        Returns:
+            object: Результат запроса.
+        """
+        with self._lock:
+            version = self.version
+            if self._cache_version != version:
+                # Данные изменились: все сохраненные результаты устарели
+                self.cache.clear()
+                self._cache_version = version
+        key = (kind, version, *params)
+        value = self.cache.get(key)
+        if value is None:
+            value = compute()
+            with self._lock:
+                if self.version == version:
+                    self.cache.put(key, value, cost(value))
+        return value
+
+    def records(self):
+        """
+        Получение всех записей о тренировках.
+
+        Returns:
+            list: Список записей TrainingRecord в порядке добавления.
+        """
+        with self._lock:
+            return list(self._records.values())
+
+    def get(self, entry_id):
+        """
+        Получение записи о тренировке по идентификатору.
+
+        Args:
+            entry_id (int): Идентификатор записи.
+
+        Returns:
+            TrainingRecord: Запись о тренировке или None, если записи нет.
+        """
+        with self._lock:
+            return self._records.get(entry_id)
+
+    def exercises(self):
+        """
+        Получение отсортированного списка уникальных названий упражнений.
+
+        Returns:
+            list: Список названий упражнений в алфавитном порядке без учета регистра.
+        """
+        with self._lock:
+            # Словарь упражнений уже упорядочен, сортировка не нужна
+            return self._exercises.names()
+
+    @property
+    def exercises_version(self):
+        """
+        Номер версии набора упражнений: меняется, только когда появляется новое упражнение или
+        удаляется последний подход упражнения.
+
+        Returns:
+            int: Номер версии.
+        """
+        with self._lock:
+            return self._exercises.version
+
+    def suggest_exercises(self, prefix, limit=SUGGESTION_LIMIT):
+        """
+        Подсказки упражнений по началу названия для автодополнения.
+
+        Args:
+            prefix (str): Начало названия (без учета регистра).
+            limit (int): Максимальное количество подсказок.
+
+        Returns:
+            list: Названия упражнений от наиболее часто используемого к наименее.
+        """
+        with self._lock:
+            return self._exercises.suggest(prefix, limit)
+
+    @property
+    def dirty(self):
+        """
+        Признак наличия изменений, еще не записанных на диск.
+
+        Returns:
+            bool: True, если есть несохраненные изменения.
+        """
+        with self._lock:
+            return bool(self._pending) or self._rewrite
+
+    def add(self, record):
+        """
+        Добавление новой записи о тренировке.
+
+        Args:
+            record (TrainingRecord): Запись о тренировке без идентификатора.
+
+        Returns:
+            TrainingRecord: Добавленная запись с присвоенным идентификатором.
+        """
+        with self._lock:
+            record = record.replace(id=self._next_id)
+            self._next_id += 1
+            self._records[record.id] = record
+            self._index(record)
+            self._queue(add_operation(record))
+            return record
+
+    def add_many(self, records):
+        """
+        Добавление пачки записей о тренировках за одну блокировку и одну запись на диск.
+
+        Args:
+            records (iterable): Записи TrainingRecord без идентификаторов.
+
+        Returns:
+            list: Добавленные записи с присвоенными идентификаторами.
+        """
+        with self._lock:
+            added = []
+            for record in records:
+                record = record.replace(id=self._next_id)
+                self._next_id += 1
+                self._records[record.id] = record
+                self._index(record)
+                self._pending.append(add_operation(record))
+                added.append(record)
+            if added:
+                self.version += 1
+                self._flush_requested.notify()
+            return added
+
+    def record_keys(self):
+        """
+        Множество ключей (дата, упражнение, вес, повторения) всех записей для поиска дубликатов.
+
+        Returns:
+            set: Кортежи (timestamp, exercise, weight, repetitions).
+        """
+        with self._lock:
+            return {record_key(record) for record in self._records.values()}
+
+    def update(self, entry_id, changes):
+        """
+        Изменение записи о тренировке.
+
+        Args:
+            entry_id (int): Идентификатор записи.
+            changes (dict): Новые значения полей записи ('timestamp', 'exercise', 'weight', 'repetitions').
+
+        Returns:
+            TrainingRecord: Измененная запись или None, если записи нет.
+        """
+        with self._lock:
+            previous = self._records.get(entry_id)
+            if previous is None:
+                return None
+            record = previous.replace(**{**changes, 'id': entry_id})
+            self._records[entry_id] = record
+            self._unindex(previous)
+            self._index(record)
+            self._queue(update_operation(record, previous))
+            return record
+
+    def delete(self, entry_id):
+        """
+        Удаление записи о тренировке.
+
+        Args:
+            entry_id (int): Идентификатор записи.
+
+        Returns:
+            bool: True, если запись была удалена.
+        """
+        with self._lock:
+            record = self._records.pop(entry_id, None)
+            if record is None:
+                return False
+            self._unindex(record)
+            self._queue(delete_operation(entry_id, record))
+            return True
+
+    def replace_all(self, data):
+        """
+        Замена всех записей о тренировках новым набором (полная перезапись журнала).
+
+        Хранилище перезаписывается сразу, по мере чтения записей (во временный файл с атомарной
+        заменой или одной транзакцией), после чего журнал загружается заново. Поэтому записи
+        можно передавать потоком, не собирая их в список.
+
+        Args:
+            data (iterable): Записи TrainingRecord (идентификаторы назначаются заново).
+
+        Raises:
+            Exception: Исключение, прервавшее чтение записей или запись; журнал и данные в памяти
+                при этом не изменяются.
+        """
+        with self._io_lock, self.storage.lock():
+            with span('storage.write'):
+                self.storage.rewrite(record.replace(id=None) for record in data)
+            with self._lock:
+                # Перезапись журнала заменяет все ранее накопленные операции
+                self._pending = []
+                self._rewrite = False
+        self.load()
+
+    def _queue(self, operation):
+        """
+        Постановка операции в очередь на запись и пробуждение фонового потока записи.
+
+        Args:
+            operation (dict): Операция журнала.
+        """
+        self._pending.append(operation)
+        self.version += 1
+        self._flush_requested.notify()
+
+    def flush(self):
+        """
+        Запись всех накопленных изменений на диск (после закрытия репозитория ничего не делает).
+
+        Raises:
+            OSError: Если запись не удалась (изменения остаются в очереди).
+            ConcurrentModificationError: Если журнал изменен другим процессом во время записи
+                (изменения остаются в очереди).
+        """
+        if self._finished:
+            return
+        with self._io_lock, self.storage.lock():
+            # Чужие изменения применяются до записи, чтобы свои операции не конфликтовали с ними
+            if self.storage.signature() != self._signature:
+                self._catch_up()
+                signature = self.storage.signature()
+                with self._lock:
+                    self._signature = signature
+            with self._lock:
+                operations, self._pending = self._pending, []
+                snapshot = list(self._records.values()) if self._rewrite else None
+                self._rewrite = False
+            if not operations and snapshot is None:
+                return
+            try:
+                with span('storage.write'):
+                    if snapshot is not None:
+                        self.storage.rewrite(snapshot)
+                    else:
+                        self.storage.apply_operations(operations)
+            except Exception:
+                # Неудачная запись (ошибка диска или ConcurrentModificationError) возвращается в очередь
+                # и будет повторена при следующей записи
+                with self._lock:
+                    if snapshot is not None:
+                        self._rewrite = True
+                    else:
+                        self._pending[:0] = operations
+                raise
+            signature = self.storage.signature()
+            with self._lock:
+                self._signature = signature
+
+    def _writer_loop(self):
+        """
+        Цикл фонового потока, записывающего накопленные изменения на диск.
+        """
+        while True:
+            with self._lock:
+                while not (self._pending or self._rewrite or self._closed):
+                    self._flush_requested.wait()
+                # Изменения, поступившие в течение окна накопления, записываются вместе с первым;
+                # при закрытии ожидание прерывается, и оставшиеся изменения записывает close
+                deadline = time.monotonic() + self.flush_delay
+                while not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._flush_requested.wait(remaining)
+                if self._closed:
+                    return
+            try:
+                self.flush()
+                self.last_error = None
+            except Exception as error:
+                # Поток записи не завершается при ошибке: она сохраняется для интерфейса, а изменения
+                # остаются в очереди
+                self.last_error = error
+                # Повторная попытка будет выполнена при следующем изменении или закрытии
+                with self._lock:
+                    self._flush_requested.wait()
+
+    def close(self):
+        """
+        Остановка фонового потока записи и запись оставшихся изменений.
+
+        Повторный вызов ничего не делает. Хранилище закрывается и в случае ошибки записи,
+        поэтому после close репозиторий больше не обращается к хранилищу.
+        """
+        if self._finished:
+            return
+        with self._lock:
+            self._closed = True
+            self._flush_requested.notify()
+        self._writer.join()
+        try:
+            self.flush()
+            # Вспомогательные файлы записываются под блокировкой журнала, чтобы не столкнуться с другим процессом
+            with self.storage.lock(), self._lock:
+                # Итоги сохраняются, только если они соответствуют файлу журнала на диске
+                if self._signature is not None and self._signature == self.storage.signature():
+                    self._stats.save(self.storage.sidecar_path('stats'), self._signature)
+                    self._save_exercises()
+        finally:
+            self._finished = True
+            self.storage.close()
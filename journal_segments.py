@@ -0,0 +1,853 @@
+"""
+Модуль хранилища дневника тренировок, разбитого на файлы по периодам.
+
+Журнал за много лет хранится в каталоге с расширением .journal: записи каждого года
+(или месяца) — в отдельном журнале операций JSON Lines, а файл manifest.json содержит
+для каждого такого сегмента границы периода, количество записей и итоги по упражнениям.
+
+    training_log.journal/
+        manifest.json
+        2019.jsonl.gz    (архивный сегмент, только для чтения)
+        2024.jsonl
+        2025.jsonl
+
+Добавление подхода дописывает строку только в сегмент его периода, а уплотнение
+переписывает сегменты по отдельности. Выборка за период открывает только сегменты,
+пересекающиеся с ним (и содержащие нужное упражнение), поэтому разовые запросы командной
+строки не читают всю историю. Сегменты прошедших периодов можно сжать в архив (gzip):
+архивный сегмент читается с распаковкой, а при изменении его записи распаковывается снова.
+
+Все сегменты записываются под общей межпроцессной блокировкой, а каждая запись увеличивает
+номер ревизии в манифесте, по которому другие процессы узнают об изменениях.
+"""
+
+import os
+import re
+import shutil
+from datetime import datetime
+
+from journal_files import (GZIP_EXTENSION, LOCK_SUFFIX, TEMP_SUFFIX, FileLock, atomic_write, open_archive,
+                           remove_quietly, replace_file, sync_path)
+from journal_json import JSONDecodeError, dumps, loads
+from journal_model import datetime_to_timestamp, timestamp_to_datetime
+from journal_stats import PERIOD_MONTH, ExerciseStats, bucket_end, bucket_start
+from journal_storage import (OP_ADD, OP_DELETE, ConcurrentModificationError, JournalStorage, add_operation,
+                             delete_operation, update_operation)
+
+# Расширение каталога журнала, разбитого по периодам
+SEGMENTED_EXTENSION = '.journal'
+
+# Периоды сегментов: год или месяц
+PERIOD_YEAR = 'year'
+SEGMENT_PERIODS = (PERIOD_YEAR, PERIOD_MONTH)
+
+# Расширение файла сегмента (у архивного сегмента к нему добавляется GZIP_EXTENSION)
+SEGMENT_EXTENSION = '.jsonl'
+
+# Ключи сегментов по годам ('2024') и по месяцам ('2024-03')
+SEGMENT_KEY_PATTERNS = {
+    PERIOD_YEAR: re.compile(r'\d{4}'),
+    PERIOD_MONTH: re.compile(r'\d{4}-(0[1-9]|1[0-2])'),
+}
+
+# Файл манифеста в каталоге журнала
+MANIFEST_FILE = 'manifest.json'
+MANIFEST_FORMAT_VERSION = 1
+
+
+def is_segmented_path(path):
+    """
+    Проверка, что путь указывает на журнал, разбитый по периодам.
+
+    Args:
+        path (str): Путь к журналу.
+
+    Returns:
+        bool: True для каталога с расширением .journal.
+    """
+    return path.rstrip('/\\').lower().endswith(SEGMENTED_EXTENSION)
+
+
+def segment_key(timestamp, period):
+    """
+    Ключ сегмента, которому принадлежит временная метка.
+
+    Args:
+        timestamp (int): Временная метка.
+        period (str): Период сегментов (PERIOD_YEAR или PERIOD_MONTH).
+
+    Returns:
+        str: Год ('2024') или год и месяц ('2024-03').
+    """
+    value = timestamp_to_datetime(timestamp)
+    if period == PERIOD_YEAR:
+        return f"{value.year:04d}"
+    return f"{value.year:04d}-{value.month:02d}"
+
+
+def segment_bounds(key, period):
+    """
+    Границы периода сегмента.
+
+    Args:
+        key (str): Ключ сегмента.
+        period (str): Период сегментов.
+
+    Returns:
+        tuple: Начало периода (включительно) и начало следующего периода.
+
+    Raises:
+        ValueError: Если ключ не соответствует периоду.
+    """
+    if period == PERIOD_YEAR:
+        year = int(key)
+        return datetime_to_timestamp(datetime(year, 1, 1)), datetime_to_timestamp(datetime(year + 1, 1, 1))
+    year, month = key.split('-')
+    start = datetime_to_timestamp(datetime(int(year), int(month), 1))
+    return start, bucket_end(start, PERIOD_MONTH)
+
+
+def infer_period(keys):
+    """
+    Период сегментов по ключам файлов (для восстановления манифеста).
+
+    Args:
+        keys (iterable): Ключи сегментов, найденных в каталоге журнала.
+
+    Returns:
+        str: PERIOD_YEAR или PERIOD_MONTH либо None, если сегментов нет.
+
+    Raises:
+        ValueError: Если ключи относятся к разным периодам или не соответствуют ни одному из них.
+    """
+    periods = set()
+    for key in keys:
+        matched = [period for period, pattern in SEGMENT_KEY_PATTERNS.items() if pattern.fullmatch(key)]
+        if not matched:
+            raise ValueError(f"Файл сегмента с некорректным именем: {key}{SEGMENT_EXTENSION}")
+        periods.update(matched)
+    if len(periods) > 1:
+        raise ValueError("В каталоге журнала есть сегменты и по годам, и по месяцам; "
+                         "манифест не может быть восстановлен")
+    return periods.pop() if periods else None
+
+
+def summarize(records):
+    """
+    Итоги по упражнениям для манифеста.
+
+    Args:
+        records (iterable): Записи TrainingRecord сегмента.
+
+    Returns:
+        dict: Упражнение -> ExerciseStats.
+    """
+    summary = {}
+    for record in records:
+        stats = summary.get(record.exercise)
+        if stats is None:
+            stats = summary[record.exercise] = ExerciseStats()
+        stats.add(record)
+    return summary
+
+
+class SegmentedStorage:
+    """
+    Хранилище записей о тренировках в виде журналов операций по годам или месяцам.
+    """
+
+    # Выборка query читает файлы сегментов, поэтому загруженный репозиторий фильтрует записи в памяти
+    indexed_query = False
+
+    def __init__(self, path, period=PERIOD_YEAR):
+        """
+        Инициализация хранилища (каталог создается при первой записи).
+
+        Args:
+            path (str): Путь к каталогу журнала.
+            period (str): Период новых сегментов (PERIOD_YEAR или PERIOD_MONTH); для существующего
+                журнала используется период, записанный в манифесте.
+
+        Raises:
+            ValueError: Если период не поддерживается.
+        """
+        if period not in SEGMENT_PERIODS:
+            raise ValueError(f"Неизвестный период сегментов: {period}")
+        self.path = path.rstrip('/\\')
+        self.period = period
+        # Манифест и номер его ревизии по последнему чтению или записи
+        self._manifest = None
+        self._revision = None
+        self._next_id = 1
+        # Журналы сегментов по ключу
+        self._segments = {}
+        # Общая межпроцессная блокировка всех сегментов
+        self._file_lock = FileLock(self.path + LOCK_SUFFIX)
+
+    def lock(self):
+        """
+        Межпроцессная блокировка журнала (повторно входимая).
+
+        Returns:
+            FileLock: Контекстный менеджер блокировки.
+        """
+        return self._file_lock
+
+    def load(self):
+        """
+        Загрузка записей всех сегментов.
+
+        Сегменты, записанные без обновления манифеста (например, при сбое), находятся по файлам
+        каталога, а их итоги в манифесте пересчитываются.
+
+        Returns:
+            list: Список записей TrainingRecord в порядке идентификаторов.
+        """
+        with self._file_lock:
+            return self._load()
+
+    def _load(self):
+        """
+        Загрузка записей (выполняется под блокировкой журнала).
+
+        Returns:
+            list: Список записей TrainingRecord в порядке идентификаторов.
+        """
+        manifest = self._read_manifest()
+        entries = manifest['segments']
+        repaired = False
+        for key, archived in self._scan_files():
+            entry = entries.get(key)
+            if entry is None or entry['archived'] != archived:
+                entries[key] = self._new_entry(key, archived)
+                repaired = True
+
+        self._manifest = manifest
+        self._segments = {}
+        files = {}
+        for key, entry in entries.items():
+            try:
+                files[key] = os.stat(self._segment_path(key, entry['archived']))
+            except FileNotFoundError:
+                # Сегмент, файл которого удален, исключается из манифеста
+                repaired = True
+        for key in entries.keys() - files.keys():
+            del entries[key]
+
+        # При сбое между записью в новый сегмент и удалением из прежнего запись может оказаться
+        # в двух сегментах: актуальной считается запись из сегмента, измененного позже
+        records = {}
+        ordered = sorted(entries, key=lambda key: files[key].st_mtime_ns)
+        for key in ordered:
+            entry = entries[key]
+            loaded = self._segment(key).load()
+            for record in loaded:
+                records[record.id] = record
+            size = files[key].st_size
+            if entry['size'] != size:
+                entry['exercises'] = summarize(loaded)
+                entry['records'] = len(loaded)
+                entry['size'] = size
+                repaired = True
+
+        next_id = max(records) + 1 if records else 1
+        manifest['next_id'] = max(manifest['next_id'], next_id)
+        if repaired:
+            self._save_manifest(manifest)
+        self._revision = manifest['revision']
+        self._next_id = manifest['next_id']
+        return [records[entry_id] for entry_id in sorted(records)]
+
+    def read_changes(self):
+        """
+        Чтение операций, записанных другими процессами после последнего чтения или записи.
+
+        Читаются только новые строки сегментов. Если другой процесс уплотнил, архивировал или создал
+        сегмент либо перенес запись из одного сегмента в другой, журнал нужно прочитать заново.
+
+        Returns:
+            list: Новые операции (пустой список, если журнал не изменялся) или None, если журнал
+                нужно прочитать заново.
+        """
+        with self._file_lock:
+            manifest = self._read_manifest()
+            if manifest['revision'] == self._revision:
+                return []
+            if self._manifest is None or manifest['period'] != self.period:
+                return None
+            known = self._manifest['segments']
+            entries = manifest['segments']
+            if entries.keys() != known.keys() or any(entries[key]['archived'] != known[key]['archived']
+                                                     for key in entries):
+                return None
+            operations = []
+            owners = {}
+            for key, segment in self._segments.items():
+                changes = segment.read_changes()
+                if changes is None:
+                    return None
+                for operation in changes:
+                    if owners.setdefault(operation['id'], key) != key:
+                        return None
+                operations.extend(changes)
+            self._manifest = manifest
+            self._revision = manifest['revision']
+            self._next_id = max(self._next_id, manifest['next_id'])
+            return operations
+
+    def is_current(self):
+        """
+        Проверка, что журнал не изменялся после последнего чтения или записи этим хранилищем.
+
+        Returns:
+            bool: True, если ревизия манифеста совпадает с известной хранилищу.
+        """
+        return self._revision is not None and self._read_manifest()['revision'] == self._revision
+
+    @property
+    def next_id(self):
+        """
+        Идентификатор, который получит следующая добавленная запись.
+
+        Returns:
+            int: Следующий свободный идентификатор.
+        """
+        with self._file_lock:
+            self._sync_state()
+            return self._next_id
+
+    def append(self, record):
+        """
+        Добавление новой записи о тренировке в сегмент ее периода.
+
+        Args:
+            record (TrainingRecord): Запись о тренировке.
+
+        Returns:
+            TrainingRecord: Добавленная запись с присвоенным идентификатором.
+        """
+        with self._file_lock:
+            self._sync_state()
+            record = record.replace(id=self._next_id)
+            self.apply_operations([add_operation(record)])
+        return record
+
+    def update(self, record):
+        """
+        Изменение записи о тренировке (запись с тем же идентификатором заменяется целиком).
+
+        Args:
+            record (TrainingRecord): Новое состояние записи.
+        """
+        with self._file_lock:
+            self._sync_state()
+            self.apply_operations([update_operation(record)])
+
+    def delete(self, entry_id):
+        """
+        Удаление записи о тренировке по ее идентификатору.
+
+        Args:
+            entry_id (int): Идентификатор записи.
+        """
+        with self._file_lock:
+            self._sync_state()
+            self.apply_operations([delete_operation(entry_id)])
+
+    def apply_operations(self, operations):
+        """
+        Запись пачки операций в сегменты, которым принадлежат записи.
+
+        Изменение, переносящее запись в другой период, записывается как добавление в новый сегмент
+        и удаление из прежнего; добавления записываются раньше удалений, чтобы сбой между ними
+        не привел к потере записи.
+
+        Args:
+            operations (list): Список операций журнала (add_operation, update_operation, delete_operation).
+
+        Raises:
+            ConcurrentModificationError: Если журнал изменен другим процессом после последнего чтения.
+        """
+        if not operations:
+            return
+        with self._file_lock:
+            if self._revision is None:
+                self._load()
+            elif not self.is_current():
+                raise ConcurrentModificationError("Журнал изменен другим процессом после последнего чтения")
+            writes, deletes = self._plan(operations)
+            for groups in (writes, deletes):
+                for key, group in groups.items():
+                    self._write_segment(key, group)
+            for operation in operations:
+                if operation['op'] == OP_ADD:
+                    self._next_id = max(self._next_id, operation['id'] + 1)
+            self._commit()
+
+    def _plan(self, operations):
+        """
+        Распределение операций по сегментам.
+
+        Для каждой записи учитывается только ее итоговое состояние после всей пачки.
+
+        Args:
+            operations (list): Список операций журнала.
+
+        Returns:
+            tuple: Операции добавления и изменения по ключам сегментов и операции удаления по ключам сегментов.
+        """
+        final = {}
+        origins = {}
+        for operation in operations:
+            entry_id = operation['id']
+            if entry_id not in final:
+                if operation['op'] == OP_ADD:
+                    origins[entry_id] = None
+                else:
+                    origins[entry_id] = operation.get('previous') or self._locate(entry_id)
+                    if origins[entry_id] is None:
+                        # Изменение или удаление отсутствующей записи ничего не меняет
+                        final[entry_id] = None
+                        continue
+            elif entry_id not in origins:
+                continue
+            final[entry_id] = None if operation['op'] == OP_DELETE else operation['record']
+
+        writes = {}
+        deletes = {}
+        for entry_id, record in final.items():
+            origin = origins.get(entry_id)
+            source = None if origin is None else segment_key(origin.timestamp, self.period)
+            if record is not None:
+                target = segment_key(record.timestamp, self.period)
+                if source == target:
+                    writes.setdefault(target, []).append(update_operation(record, origin))
+                else:
+                    writes.setdefault(target, []).append(add_operation(record))
+            if source is not None and (record is None or source != target):
+                deletes.setdefault(source, []).append(delete_operation(entry_id, origin))
+        return writes, deletes
+
+    def _locate(self, entry_id):
+        """
+        Поиск записи по идентификатору во всех сегментах (для операций без прежнего состояния записи).
+
+        Args:
+            entry_id (int): Идентификатор записи.
+
+        Returns:
+            TrainingRecord: Запись или None, если ее нет.
+        """
+        for key in sorted(self._manifest['segments'], reverse=True):
+            for record in self._segment(key).load():
+                if record.id == entry_id:
+                    return record
+        return None
+
+    def _write_segment(self, key, operations):
+        """
+        Дозапись операций в сегмент с обновлением его итогов в манифесте.
+
+        Args:
+            key (str): Ключ сегмента.
+            operations (list): Операции записей этого сегмента.
+        """
+        entry = self._manifest['segments'].get(key)
+        if entry is None:
+            entry = self._manifest['segments'][key] = self._new_entry(key, False)
+        elif entry['archived']:
+            self._unarchive(key)
+        os.makedirs(self.path, exist_ok=True)
+        self._segment(key).apply_operations(operations)
+
+        summary = entry['exercises']
+        recompute = False
+        for operation in operations:
+            previous = operation.get('previous')
+            if previous is not None:
+                stats = summary.get(previous.exercise)
+                if stats is None or stats.remove(previous) or not stats.total_sets:
+                    recompute = True
+            elif operation['op'] != OP_ADD:
+                recompute = True
+            if operation['op'] == OP_ADD:
+                entry['records'] += 1
+            elif operation['op'] == OP_DELETE:
+                entry['records'] -= 1
+            if operation['op'] != OP_DELETE:
+                record = operation['record']
+                stats = summary.get(record.exercise)
+                if stats is None:
+                    stats = summary[record.exercise] = ExerciseStats()
+                stats.add(record)
+        if recompute:
+            # Максимумы (или итоги изменения без прежнего состояния) пересчитываются по сегменту
+            records = self._segment(key).load()
+            entry['exercises'] = summarize(records)
+            entry['records'] = len(records)
+        entry['size'] = os.path.getsize(self._segment_path(key, False))
+
+    def rewrite(self, data):
+        """
+        Полная перезапись журнала заданными записями с распределением по сегментам.
+
+        Записи без идентификатора (или с повторяющимся идентификатором) получают новые идентификаторы.
+        Архивные сегменты остаются архивными. Записи группируются по сегментам до начала записи,
+        поэтому, если чтение записей прервано исключением, журнал остается прежним.
+
+        Args:
+            data (iterable): Записи TrainingRecord.
+        """
+        with self._file_lock:
+            # Период существующего журнала берется из манифеста
+            previous = self._read_manifest()
+            groups = {}
+            next_id = 1
+            for record in data:
+                if record.id is None or record.id < next_id:
+                    record = record.replace(id=next_id)
+                next_id = record.id + 1
+                groups.setdefault(segment_key(record.timestamp, self.period), []).append(record)
+
+            os.makedirs(self.path, exist_ok=True)
+            self._segments = {}
+            entries = {}
+            for key in sorted(groups):
+                records = groups[key]
+                self._segment_for(key, False).rewrite(records)
+                entry = entries[key] = self._new_entry(key, False)
+                entry['exercises'] = summarize(records)
+                entry['records'] = len(records)
+                entry['size'] = os.path.getsize(self._segment_path(key, False))
+            for key in set(previous['segments']).union(key for key, _ in self._scan_files()):
+                if key not in entries:
+                    remove_quietly(self._segment_path(key, False))
+                    remove_quietly(self._segment_path(key, True))
+            self._manifest = {**previous, 'segments': entries, 'next_id': next_id}
+            self._next_id = next_id
+            self._commit()
+            for key in sorted(groups):
+                if previous['segments'].get(key, {}).get('archived'):
+                    self._archive(key)
+
+    def archive(self, before=None):
+        """
+        Сжатие сегментов прошедших периодов в архивные файлы (gzip), доступные только для чтения.
+
+        Args:
+            before (int): Архивируются сегменты, период которых закончился не позже этой временной
+                метки (по умолчанию — все сегменты до текущего периода).
+
+        Returns:
+            int: Количество заархивированных сегментов.
+        """
+        if before is None:
+            before = self._current_period_start()
+        with self._file_lock:
+            self._sync_state()
+            keys = [key for key, entry in self._manifest['segments'].items()
+                    if not entry['archived'] and entry['end'] <= before]
+            for key in keys:
+                self._archive(key)
+        return len(keys)
+
+    def _current_period_start(self):
+        """
+        Начало текущего периода сегментов.
+
+        Returns:
+            int: Временная метка начала текущего года или месяца.
+        """
+        now = datetime.now()
+        if self.period == PERIOD_YEAR:
+            return datetime_to_timestamp(datetime(now.year, 1, 1))
+        return bucket_start(datetime_to_timestamp(now), PERIOD_MONTH)
+
+    def _archive(self, key):
+        """
+        Сжатие одного сегмента (выполняется под блокировкой журнала).
+
+        Args:
+            key (str): Ключ сегмента.
+        """
+        plain_path = self._segment_path(key, False)
+        archive_path = self._segment_path(key, True)
+        # В архив попадают только актуальные записи
+        self._segment(key).compact()
+        temp_path = archive_path + TEMP_SUFFIX
+        try:
+            with open(plain_path, 'rb') as source, open_archive(temp_path, 'wb', GZIP_EXTENSION) as target:
+                shutil.copyfileobj(source, target)
+            sync_path(temp_path)
+            replace_file(temp_path, archive_path)
+        except BaseException:
+            remove_quietly(temp_path)
+            raise
+        entry = self._manifest['segments'][key]
+        entry['archived'] = True
+        entry['size'] = os.path.getsize(archive_path)
+        self._segments.pop(key, None)
+        self._commit()
+        # Несжатый сегмент удаляется только после того, как манифест ссылается на архив
+        remove_quietly(plain_path)
+
+    def _unarchive(self, key):
+        """
+        Распаковка архивного сегмента перед изменением его записей (выполняется под блокировкой журнала).
+
+        Args:
+            key (str): Ключ сегмента.
+        """
+        records = sorted(self._segment(key).load(), key=lambda record: record.id)
+        self._segments.pop(key, None)
+        self._segment_for(key, False).rewrite(records)
+        entry = self._manifest['segments'][key]
+        entry['archived'] = False
+        entry['size'] = os.path.getsize(self._segment_path(key, False))
+        self._commit()
+        remove_quietly(self._segment_path(key, True))
+
+    def query(self, start=None, end=None, exercise=None):
+        """
+        Выборка записей за период и по упражнению с чтением только подходящих сегментов.
+
+        Сегменты, период которых не пересекается с выборкой или в итогах которых нет упражнения,
+        не читаются. Если файлы сегментов не совпадают с манифестом (манифест удален или не обновлен
+        после сбоя), манифест сначала восстанавливается загрузкой журнала.
+
+        Args:
+            start (int): Начало периода (временная метка, включительно) или None.
+            end (int): Конец периода (временная метка, не включительно) или None.
+            exercise (str): Название упражнения (без учета регистра) или None для всех упражнений.
+
+        Returns:
+            list: Записи TrainingRecord, отсортированные по убыванию даты.
+        """
+        folded = exercise.lower() if exercise else None
+        records = []
+        with self._file_lock:
+            manifest = self._read_manifest()
+            entries = manifest['segments']
+            if dict(self._scan_files()) != {key: entry['archived'] for key, entry in entries.items()}:
+                self._load()
+                manifest = self._manifest
+            for key, entry in manifest['segments'].items():
+                if start is not None and entry['end'] <= start or end is not None and entry['start'] >= end:
+                    continue
+                if folded is not None and all(name.lower() != folded for name in entry['exercises']):
+                    continue
+                for record in self._segment_for(key, entry['archived']).load():
+                    if start is not None and record.timestamp < start or end is not None and record.timestamp >= end:
+                        continue
+                    if folded is not None and record.exercise.lower() != folded:
+                        continue
+                    records.append(record)
+        records.sort(key=lambda record: (record.timestamp, record.id), reverse=True)
+        return records
+
+    def sidecar_path(self, name):
+        """
+        Путь к вспомогательному файлу, хранящемуся в каталоге журнала.
+
+        Args:
+            name (str): Назначение файла (например, 'stats').
+
+        Returns:
+            str: Путь к файлу вида <каталог журнала>/<name>.json.
+        """
+        return os.path.join(self.path, name + '.json')
+
+    def signature(self):
+        """
+        Отпечаток манифеста для обнаружения изменений, сделанных другими программами.
+
+        Манифест перезаписывается при каждой записи в любой сегмент.
+
+        Returns:
+            tuple: Время изменения манифеста в наносекундах и его размер или None, если манифеста нет.
+        """
+        try:
+            stat = os.stat(os.path.join(self.path, MANIFEST_FILE))
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def compact(self):
+        """
+        Уплотнение всех несжатых сегментов (архивные сегменты уже содержат только актуальные записи).
+        """
+        with self._file_lock:
+            self._sync_state()
+            for key, entry in self._manifest['segments'].items():
+                if entry['archived']:
+                    continue
+                self._segment(key).compact()
+                entry['size'] = os.path.getsize(self._segment_path(key, False))
+            self._commit()
+
+    def aggregate_stats(self):
+        """
+        Итоги по упражнениям, вычисленные хранилищем.
+
+        Итоги манифеста не разбиты по дням и неделям, поэтому итоги рассчитываются репозиторием в памяти.
+
+        Returns:
+            None: Итоги недоступны.
+        """
+        return None
+
+    def close(self):
+        """
+        Закрытие хранилища (сегменты открываются только на время чтения и записи, закрывать нечего).
+        """
+
+    def _sync_state(self):
+        """
+        Учет изменений журнала, сделанных без ведома хранилища (выполняется под блокировкой журнала).
+        """
+        if self.read_changes() is None:
+            self._load()
+
+    def _segment(self, key):
+        """
+        Журнал сегмента, известного манифесту.
+
+        Args:
+            key (str): Ключ сегмента.
+
+        Returns:
+            JournalStorage: Журнал операций сегмента.
+        """
+        segment = self._segments.get(key)
+        if segment is None:
+            segment = self._segments[key] = self._segment_for(key, self._manifest['segments'][key]['archived'])
+        return segment
+
+    def _segment_for(self, key, archived):
+        """
+        Новый журнал операций файла сегмента под общей блокировкой.
+
+        Args:
+            key (str): Ключ сегмента.
+            archived (bool): Признак архивного (сжатого) файла.
+
+        Returns:
+            JournalStorage: Журнал операций сегмента.
+        """
+        return JournalStorage(self._segment_path(key, archived), lock=self._file_lock)
+
+    def _segment_path(self, key, archived):
+        """
+        Путь к файлу сегмента.
+
+        Args:
+            key (str): Ключ сегмента.
+            archived (bool): Признак архивного (сжатого) файла.
+
+        Returns:
+            str: Путь к файлу.
+        """
+        name = key + SEGMENT_EXTENSION + (GZIP_EXTENSION if archived else '')
+        return os.path.join(self.path, name)
+
+    def _segment_files(self):
+        """
+        Файлы сегментов в каталоге журнала (без проверки ключей).
+
+        Returns:
+            list: Пары (ключ сегмента, признак архивного файла).
+        """
+        try:
+            names = os.listdir(self.path)
+        except FileNotFoundError:
+            return []
+        found = []
+        for name in names:
+            archived = name.endswith(SEGMENT_EXTENSION + GZIP_EXTENSION)
+            if archived:
+                key = name[:-len(SEGMENT_EXTENSION + GZIP_EXTENSION)]
+            elif name.endswith(SEGMENT_EXTENSION):
+                key = name[:-len(SEGMENT_EXTENSION)]
+            else:
+                continue
+            found.append((key, archived))
+        return found
+
+    def _scan_files(self):
+        """
+        Сегменты периода журнала, найденные по файлам каталога.
+
+        Returns:
+            list: Пары (ключ сегмента, признак архивного файла).
+        """
+        pattern = SEGMENT_KEY_PATTERNS[self.period]
+        found = [(key, archived) for key, archived in self._segment_files() if pattern.fullmatch(key)]
+        # Если после сбоя остались оба файла сегмента, используется несжатый
+        plain = {key for key, archived in found if not archived}
+        return [(key, archived) for key, archived in found if not archived or key not in plain]
+
+    def _new_entry(self, key, archived):
+        """
+        Описание нового сегмента в манифесте.
+
+        Args:
+            key (str): Ключ сегмента.
+            archived (bool): Признак архивного файла.
+
+        Returns:
+            dict: Границы периода, количество записей, размер файла, признак архива и итоги по упражнениям.
+        """
+        start, end = segment_bounds(key, self.period)
+        return {'start': start, 'end': end, 'records': 0, 'size': None, 'archived': archived, 'exercises': {}}
+
+    def _read_manifest(self):
+        """
+        Чтение манифеста (отсутствующий или поврежденный манифест восстанавливается по файлам сегментов при загрузке).
+
+        Период восстанавливаемого манифеста определяется по именам файлов сегментов, а не по периоду,
+        переданному хранилищу, иначе сегменты другого периода были бы пропущены.
+
+        Returns:
+            dict: Манифест с итогами сегментов в виде ExerciseStats.
+
+        Raises:
+            ValueError: Если манифест нужно восстановить, а имена файлов сегментов относятся к разным периодам
+                или не соответствуют ни одному из них (журнал не читается и не изменяется).
+        """
+        try:
+            with open(os.path.join(self.path, MANIFEST_FILE), 'rb') as file:
+                data = loads(file.read())
+            segments = {key: {**entry, 'exercises': {name: ExerciseStats(*values)
+                                                     for name, values in entry['exercises'].items()}}
+                        for key, entry in data['segments'].items()}
+            manifest = {'period': data['period'], 'revision': data['revision'], 'next_id': data['next_id'],
+                        'segments': segments}
+        except (FileNotFoundError, JSONDecodeError, KeyError, TypeError, ValueError):
+            period = infer_period(key for key, _ in self._segment_files()) or self.period
+            manifest = {'period': period, 'revision': 0, 'next_id': 1, 'segments': {}}
+        self.period = manifest['period']
+        return manifest
+
+    def _save_manifest(self, manifest):
+        """
+        Запись манифеста через временный файл.
+
+        Args:
+            manifest (dict): Манифест.
+        """
+        segments = {key: {**entry, 'exercises': {name: stats.to_json() for name, stats in entry['exercises'].items()}}
+                    for key, entry in sorted(manifest['segments'].items())}
+        data = {'format': MANIFEST_FORMAT_VERSION, 'period': manifest['period'], 'revision': manifest['revision'],
+                'next_id': manifest['next_id'], 'segments': segments}
+        os.makedirs(self.path, exist_ok=True)
+        with atomic_write(os.path.join(self.path, MANIFEST_FILE), 'wb') as file:
+            file.write(dumps(data))
+
+    def _commit(self):
+        """
+        Запись манифеста с новым номером ревизии после изменения сегментов.
+        """
+        self._manifest['revision'] += 1
+        self._manifest['next_id'] = max(self._manifest['next_id'], self._next_id)
+        self._save_manifest(self._manifest)
+        self._revision = self._manifest['revision']
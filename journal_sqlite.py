@@ -0,0 +1,438 @@
+"""
+Модуль хранилища дневника тренировок в базе данных SQLite.
+
+Записи хранятся в таблице с индексами по дате и по названию упражнения, база работает
+в режиме WAL, а пачки изменений (например, при импорте) записываются одной транзакцией.
+Выборки за период и итоги по упражнениям вычисляются запросами с GROUP BY на стороне
+SQLite, без загрузки и перебора всех записей в Python. Хранилище реализует тот же набор
+методов, что и JournalStorage, поэтому репозиторий и интерфейс работают с любым из них.
+Изменения другими процессами обнаруживаются по номеру ревизии базы данных, который
+увеличивается каждой транзакцией записи.
+"""
+
+import os
+import sqlite3
+import threading
+
+from journal_files import LOCK_SUFFIX, FileLock
+from journal_model import TrainingRecord
+from journal_profiling import count
+from journal_stats import PERIOD_DAY, PERIOD_MONTH, PERIOD_WEEK, PERIODS, ExerciseStats
+from journal_storage import (OP_ADD, OP_DELETE, OP_UPDATE, ConcurrentModificationError, add_operation,
+                             delete_operation, update_operation)
+
+# Расширения файлов, которые открываются как база данных SQLite
+SQLITE_EXTENSIONS = ('.db', '.sqlite', '.sqlite3')
+
+# Модификаторы даты SQLite, дающие начало дня, недели (с понедельника) и месяца
+PERIOD_MODIFIERS = {
+    PERIOD_DAY: "'start of day'",
+    PERIOD_WEEK: "'start of day', '-6 days', 'weekday 1'",
+    PERIOD_MONTH: "'start of month'",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    id INTEGER PRIMARY KEY,
+    timestamp INTEGER NOT NULL,
+    exercise TEXT NOT NULL,
+    exercise_key TEXT NOT NULL,
+    weight REAL NOT NULL,
+    repetitions INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS records_timestamp ON records (timestamp);
+CREATE INDEX IF NOT EXISTS records_exercise ON records (exercise_key, timestamp);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('revision', 0);
+"""
+
+# Итоги по упражнению в порядке полей ExerciseStats
+_STATS_COLUMNS = ("SUM(weight * repetitions), SUM(repetitions), COUNT(*), MAX(weight), MAX(repetitions), "
+                  "MAX(CASE WHEN repetitions = 1 THEN weight WHEN repetitions > 0 "
+                  "THEN weight * (1 + repetitions / 30.0) ELSE 0 END)")
+
+_INSERT = ("INSERT OR REPLACE INTO records (id, timestamp, exercise, exercise_key, weight, repetitions) "
+           "VALUES (?, ?, ?, ?, ?, ?)")
+_UPDATE = "UPDATE records SET timestamp = ?, exercise = ?, exercise_key = ?, weight = ?, repetitions = ? WHERE id = ?"
+_DELETE = "DELETE FROM records WHERE id = ?"
+_BUMP_REVISION = "UPDATE meta SET value = value + 1 WHERE key = 'revision'"
+
+
+def is_sqlite_path(path):
+    """
+    Проверка, что файл журнала является базой данных SQLite (по расширению).
+
+    Args:
+        path (str): Путь к файлу журнала.
+
+    Returns:
+        bool: True для файлов с расширением из SQLITE_EXTENSIONS.
+    """
+    return os.path.splitext(path)[1].lower() in SQLITE_EXTENSIONS
+
+
+def _record_row(record):
+    """
+    Значения столбцов таблицы для записи.
+
+    Args:
+        record (TrainingRecord): Запись о тренировке.
+
+    Returns:
+        tuple: Идентификатор, временная метка, упражнение, ключ упражнения, вес, повторения.
+    """
+    return record.id, record.timestamp, record.exercise, record.exercise.lower(), record.weight, record.repetitions
+
+
+def _stats_from_row(row):
+    """
+    Итоги по упражнению из строки результата запроса.
+
+    Args:
+        row (tuple): Значения в порядке _STATS_COLUMNS.
+
+    Returns:
+        ExerciseStats: Итоги.
+    """
+    total_weight, total_repetitions, total_sets, max_weight, max_repetitions, best_one_rep_max = row
+    return ExerciseStats(float(total_weight), total_repetitions, total_sets, float(max_weight), max_repetitions,
+                         float(best_one_rep_max))
+
+
+class SqliteStorage:
+    """
+    Хранилище записей о тренировках в базе данных SQLite.
+    """
+
+    # Выборка выполняется запросом по индексам на дату и упражнение
+    indexed_query = True
+
+    def __init__(self, path):
+        """
+        Инициализация хранилища и создание таблиц, если их нет.
+
+        Args:
+            path (str): Путь к файлу базы данных.
+        """
+        self.path = path
+        # Соединение используется из нескольких потоков (интерфейс, фоновые операции, запись) под блокировкой
+        self._lock = threading.RLock()
+        # Межпроцессная блокировка проверки ревизии и записи и номер ревизии, известный хранилищу
+        self._file_lock = FileLock(path + LOCK_SUFFIX)
+        self._revision = None
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            self._connection.executescript(_SCHEMA)
+
+    def load(self):
+        """
+        Загрузка всех записей о тренировках.
+
+        Returns:
+            list: Список записей TrainingRecord в порядке добавления.
+        """
+        with self._file_lock, self._lock:
+            rows = self._connection.execute(
+                "SELECT id, timestamp, exercise, weight, repetitions FROM records ORDER BY id").fetchall()
+            self._revision = self._current_revision()
+        count('records.loaded', len(rows))
+        return [TrainingRecord(entry_id, timestamp, exercise, float(weight), repetitions)
+                for entry_id, timestamp, exercise, weight, repetitions in rows]
+
+    def lock(self):
+        """
+        Межпроцессная блокировка базы данных для согласованной проверки ревизии и записи (повторно входимая).
+
+        Returns:
+            FileLock: Контекстный менеджер блокировки.
+        """
+        return self._file_lock
+
+    def read_changes(self):
+        """
+        Проверка изменений, сделанных другими процессами после последнего чтения или записи.
+
+        База данных не хранит журнал отдельных операций, поэтому любое чужое изменение требует
+        повторного чтения записей.
+
+        Returns:
+            list: Пустой список, если база не изменялась, или None, если ее нужно прочитать заново.
+        """
+        with self._lock:
+            return [] if self._current_revision() == self._revision else None
+
+    def is_current(self):
+        """
+        Проверка, что база данных не изменялась после последнего чтения или записи этим хранилищем.
+
+        Returns:
+            bool: True, если ревизия базы совпадает с известной хранилищу.
+        """
+        with self._lock:
+            return self._current_revision() == self._revision
+
+    def _current_revision(self):
+        """
+        Текущий номер ревизии базы данных.
+
+        Returns:
+            int: Номер ревизии.
+        """
+        (revision,) = self._connection.execute("SELECT value FROM meta WHERE key = 'revision'").fetchone()
+        return revision
+
+    @property
+    def next_id(self):
+        """
+        Идентификатор, который получит следующая добавленная запись.
+
+        Returns:
+            int: Следующий свободный идентификатор.
+        """
+        with self._lock:
+            (last_id,) = self._connection.execute("SELECT COALESCE(MAX(id), 0) FROM records").fetchone()
+        return last_id + 1
+
+    def append(self, record):
+        """
+        Добавление новой записи о тренировке.
+
+        Args:
+            record (TrainingRecord): Запись о тренировке.
+
+        Returns:
+            TrainingRecord: Добавленная запись с присвоенным идентификатором.
+        """
+        with self._file_lock, self._lock:
+            self._revision = self._current_revision()
+            record = record.replace(id=self.next_id)
+            self.apply_operations([add_operation(record)])
+        return record
+
+    def update(self, record):
+        """
+        Изменение записи о тренировке (запись с тем же идентификатором заменяется целиком).
+
+        Args:
+            record (TrainingRecord): Новое состояние записи.
+        """
+        with self._file_lock, self._lock:
+            self._revision = self._current_revision()
+            self.apply_operations([update_operation(record)])
+
+    def delete(self, entry_id):
+        """
+        Удаление записи о тренировке по ее идентификатору.
+
+        Args:
+            entry_id (int): Идентификатор записи.
+        """
+        with self._file_lock, self._lock:
+            self._revision = self._current_revision()
+            self.apply_operations([delete_operation(entry_id)])
+
+    def apply_operations(self, operations):
+        """
+        Применение пачки операций журнала одной транзакцией.
+
+        Args:
+            operations (list): Список операций журнала (add_operation, update_operation, delete_operation).
+
+        Raises:
+            ConcurrentModificationError: Если база изменена другим процессом после последнего чтения.
+        """
+        if not operations:
+            return
+        with self._file_lock, self._lock, self._connection:
+            if self._revision is not None and self._current_revision() != self._revision:
+                raise ConcurrentModificationError("База данных изменена другим процессом после последнего чтения")
+            cursor = self._connection.cursor()
+            for operation in operations:
+                op = operation['op']
+                if op == OP_DELETE:
+                    cursor.execute(_DELETE, (operation['id'],))
+                    continue
+                record = operation['record']
+                if op == OP_ADD:
+                    cursor.execute(_INSERT, _record_row(record))
+                elif op == OP_UPDATE:
+                    cursor.execute(_UPDATE, _record_row(record)[1:] + (record.id,))
+            cursor.execute(_BUMP_REVISION)
+            self._revision = self._current_revision()
+        count('records.written', len(operations))
+
+    def rewrite(self, data):
+        """
+        Полная замена записей заданными записями одной транзакцией.
+
+        Записи без идентификатора (или с повторяющимся идентификатором) получают новые идентификаторы.
+        Записи вставляются по мере чтения, не накапливаясь в памяти; если чтение записей прервано
+        исключением, транзакция откатывается.
+
+        Args:
+            data (iterable): Записи TrainingRecord.
+        """
+        next_id = 1
+        written = 0
+
+        def rows():
+            nonlocal next_id, written
+            for record in data:
+                if record.id is None or record.id < next_id:
+                    record = record.replace(id=next_id)
+                next_id = record.id + 1
+                written += 1
+                yield _record_row(record)
+
+        with self._file_lock, self._lock, self._connection:
+            self._connection.execute("DELETE FROM records")
+            self._connection.executemany(_INSERT, rows())
+            self._connection.execute(_BUMP_REVISION)
+            self._revision = self._current_revision()
+        count('records.written', written)
+
+    def sidecar_path(self, name):
+        """
+        Путь к вспомогательному файлу, хранящемуся рядом с базой данных.
+
+        Args:
+            name (str): Назначение файла (например, 'stats').
+
+        Returns:
+            str: Путь к файлу вида <имя базы>.<name>.json.
+        """
+        return os.path.splitext(self.path)[0] + '.' + name + '.json'
+
+    def signature(self):
+        """
+        Отпечаток базы данных для обнаружения изменений, сделанных другими программами.
+
+        Номер ревизии увеличивается каждой транзакцией записи, в том числе из других процессов.
+
+        Returns:
+            tuple: Номер ревизии базы данных.
+        """
+        with self._lock:
+            return (self._current_revision(),)
+
+    def compact(self):
+        """
+        Уплотнение базы данных: освобождение места и перенос журнала WAL в основной файл.
+        """
+        with self._lock:
+            self._connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._connection.execute("VACUUM")
+
+    def close(self):
+        """
+        Закрытие соединения с базой данных.
+        """
+        with self._lock:
+            self._connection.close()
+
+    def query(self, start=None, end=None, exercise=None):
+        """
+        Выборка записей за период и по упражнению в порядке от последней к первой.
+
+        Args:
+            start (int): Начало периода (временная метка, включительно) или None.
+            end (int): Конец периода (временная метка, не включительно) или None.
+            exercise (str): Название упражнения (без учета регистра) или None для всех упражнений.
+
+        Returns:
+            list: Записи TrainingRecord, отсортированные по убыванию даты.
+        """
+        conditions, parameters = self._conditions(start, end, exercise)
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT id, timestamp, exercise, weight, repetitions FROM records" + conditions +
+                " ORDER BY timestamp DESC, id DESC", parameters).fetchall()
+        return [TrainingRecord(entry_id, timestamp, exercise, float(weight), repetitions)
+                for entry_id, timestamp, exercise, weight, repetitions in rows]
+
+    def exercise_stats(self, start=None, end=None):
+        """
+        Итоги по упражнениям за период, вычисленные запросом с GROUP BY.
+
+        Args:
+            start (int): Начало периода (временная метка, включительно) или None.
+            end (int): Конец периода (временная метка, не включительно) или None.
+
+        Returns:
+            dict: Упражнение -> ExerciseStats.
+        """
+        conditions, parameters = self._conditions(start, end)
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT exercise, " + _STATS_COLUMNS + " FROM records" + conditions + " GROUP BY exercise",
+                parameters).fetchall()
+        return {row[0]: _stats_from_row(row[1:]) for row in rows}
+
+    def period_stats(self, period, start=None, end=None):
+        """
+        Итоги по упражнениям в разбивке по дням, неделям или месяцам, вычисленные запросом с GROUP BY.
+
+        Args:
+            period (str): Период группировки (PERIOD_DAY, PERIOD_WEEK или PERIOD_MONTH).
+            start (int): Начало диапазона (временная метка, включительно) или None.
+            end (int): Конец диапазона (временная метка, не включительно) или None.
+
+        Returns:
+            list: Кортежи (начало периода, упражнение, ExerciseStats) от последнего периода к первому.
+        """
+        modifiers = PERIOD_MODIFIERS.get(period)
+        if modifiers is None:
+            raise ValueError(f"Неизвестный период: {period}")
+        conditions, parameters = self._conditions(start, end)
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT CAST(strftime('%s', timestamp, 'unixepoch', {modifiers}) AS INTEGER) AS bucket, exercise, "
+                + _STATS_COLUMNS + " FROM records" + conditions +
+                " GROUP BY bucket, exercise ORDER BY bucket DESC, exercise", parameters).fetchall()
+        return [(row[0], row[1], _stats_from_row(row[2:])) for row in rows]
+
+    def aggregate_stats(self):
+        """
+        Итоги по упражнениям за все время и по всем периодам для заполнения StatsAggregator.
+
+        Returns:
+            tuple: Итоги за все время (упражнение -> ExerciseStats) и итоги по периодам
+                (период -> начало периода -> упражнение -> ExerciseStats).
+        """
+        buckets = {}
+        for period in PERIODS:
+            groups = buckets[period] = {}
+            for start, exercise, stats in self.period_stats(period):
+                groups.setdefault(start, {})[exercise] = stats
+        return self.exercise_stats(), buckets
+
+    @staticmethod
+    def _conditions(start=None, end=None, exercise=None):
+        """
+        Условие WHERE для выборки за период и по упражнению.
+
+        Args:
+            start (int): Начало периода или None.
+            end (int): Конец периода или None.
+            exercise (str): Название упражнения или None.
+
+        Returns:
+            tuple: Текст условия (пустая строка, если условий нет) и список параметров.
+        """
+        clauses = []
+        parameters = []
+        if exercise:
+            clauses.append("exercise_key = ?")
+            parameters.append(exercise.lower())
+        if start is not None:
+            clauses.append("timestamp >= ?")
+            parameters.append(start)
+        if end is not None:
+            clauses.append("timestamp < ?")
+            parameters.append(end)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), parameters
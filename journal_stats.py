@@ -0,0 +1,329 @@
+"""
+Модуль статистики по упражнениям.
+
+Итоги по каждому упражнению (общий вес, повторения, подходы, максимумы и лучшая оценка
+одноповторного максимума) и итоги по дням,
+неделям и месяцам обновляются при каждом добавлении, изменении и удалении записи, поэтому
+окно статистики не просматривает всю историю. Итоги сохраняются в отдельный файл рядом
+с журналом и используются при следующем запуске, если журнал с тех пор не изменялся.
+"""
+
+import json
+
+from journal_files import atomic_write
+from journal_model import SECONDS_PER_DAY, datetime_to_timestamp, timestamp_to_datetime
+from journal_progression import estimate_one_rep_max
+
+# Периоды группировки статистики
+PERIOD_DAY = 'day'
+PERIOD_WEEK = 'week'
+PERIOD_MONTH = 'month'
+PERIODS = (PERIOD_DAY, PERIOD_WEEK, PERIOD_MONTH)
+
+# Версия формата файла статистики
+STATS_FORMAT_VERSION = 2
+
+
+def bucket_start(timestamp, period):
+    """
+    Начало периода (дня, недели с понедельника или месяца), которому принадлежит временная метка.
+
+    Args:
+        timestamp (int): Временная метка.
+        period (str): Период группировки.
+
+    Returns:
+        int: Временная метка начала периода.
+    """
+    day = timestamp // SECONDS_PER_DAY
+    if period == PERIOD_DAY:
+        return day * SECONDS_PER_DAY
+    if period == PERIOD_WEEK:
+        # 1 января 1970 года — четверг, поэтому сдвиг на 3 дня дает начало недели с понедельника
+        return (day - (day + 3) % 7) * SECONDS_PER_DAY
+    if period == PERIOD_MONTH:
+        return datetime_to_timestamp(timestamp_to_datetime(day * SECONDS_PER_DAY).replace(day=1))
+    raise ValueError(f"Неизвестный период: {period}")
+
+
+def bucket_end(start, period):
+    """
+    Конец периода (начало следующего периода).
+
+    Args:
+        start (int): Временная метка начала периода.
+        period (str): Период группировки.
+
+    Returns:
+        int: Временная метка начала следующего периода.
+    """
+    if period == PERIOD_DAY:
+        return start + SECONDS_PER_DAY
+    if period == PERIOD_WEEK:
+        return start + 7 * SECONDS_PER_DAY
+    if period == PERIOD_MONTH:
+        value = timestamp_to_datetime(start)
+        if value.month == 12:
+            value = value.replace(year=value.year + 1, month=1)
+        else:
+            value = value.replace(month=value.month + 1)
+        return datetime_to_timestamp(value)
+    raise ValueError(f"Неизвестный период: {period}")
+
+
+class ExerciseStats:
+    """
+    Итоги по одному упражнению.
+    """
+
+    __slots__ = ('total_weight', 'total_repetitions', 'total_sets', 'max_weight', 'max_repetitions', 'best_one_rep_max')
+
+    def __init__(self, total_weight=0.0, total_repetitions=0, total_sets=0, max_weight=0.0, max_repetitions=0,
+                 best_one_rep_max=0.0):
+        """
+        Инициализация итогов.
+
+        Args:
+            total_weight (float): Общий поднятый вес (вес, умноженный на повторения).
+            total_repetitions (int): Общее количество повторений.
+            total_sets (int): Общее количество подходов.
+            max_weight (float): Максимальный вес.
+            max_repetitions (int): Максимальное количество повторений.
+            best_one_rep_max (float): Лучшая оценка одноповторного максимума (по формуле Эпли).
+        """
+        self.total_weight = total_weight
+        self.total_repetitions = total_repetitions
+        self.total_sets = total_sets
+        self.max_weight = max_weight
+        self.max_repetitions = max_repetitions
+        self.best_one_rep_max = best_one_rep_max
+
+    def add(self, record):
+        """
+        Учет подхода в итогах.
+
+        Args:
+            record (TrainingRecord): Запись о тренировке.
+        """
+        self.total_weight += record.weight * record.repetitions
+        self.total_repetitions += record.repetitions
+        self.total_sets += 1
+        if record.weight > self.max_weight:
+            self.max_weight = record.weight
+        if record.repetitions > self.max_repetitions:
+            self.max_repetitions = record.repetitions
+        estimate = estimate_one_rep_max(record.weight, record.repetitions)
+        if estimate > self.best_one_rep_max:
+            self.best_one_rep_max = estimate
+
+    def remove(self, record):
+        """
+        Исключение подхода из итогов.
+
+        Args:
+            record (TrainingRecord): Запись о тренировке.
+
+        Returns:
+            bool: True, если подход был максимальным и максимумы нужно пересчитать по оставшимся записям.
+        """
+        self.total_weight -= record.weight * record.repetitions
+        self.total_repetitions -= record.repetitions
+        self.total_sets -= 1
+        return (record.weight >= self.max_weight or record.repetitions >= self.max_repetitions
+                or estimate_one_rep_max(record.weight, record.repetitions) >= self.best_one_rep_max)
+
+    def recompute_max(self, records):
+        """
+        Пересчет максимумов по оставшимся записям.
+
+        Args:
+            records (iterable): Записи TrainingRecord этого упражнения.
+        """
+        self.max_weight = 0.0
+        self.max_repetitions = 0
+        self.best_one_rep_max = 0.0
+        for record in records:
+            if record.weight > self.max_weight:
+                self.max_weight = record.weight
+            if record.repetitions > self.max_repetitions:
+                self.max_repetitions = record.repetitions
+            estimate = estimate_one_rep_max(record.weight, record.repetitions)
+            if estimate > self.best_one_rep_max:
+                self.best_one_rep_max = estimate
+
+    def copy(self):
+        """
+        Копия итогов.
+
+        Returns:
+            ExerciseStats: Новый объект с теми же значениями.
+        """
+        return ExerciseStats(*self.to_json())
+
+    def to_json(self):
+        """
+        Итоги в виде списка для сохранения в файл.
+
+        Returns:
+            list: Значения полей в порядке __slots__.
+        """
+        return [getattr(self, name) for name in self.__slots__]
+
+
+class StatsAggregator:
+    """
+    Итоги по упражнениям за все время и по периодам, обновляемые при изменении записей.
+    """
+
+    def __init__(self):
+        """
+        Инициализация пустых итогов.
+        """
+        # Итоги за все время: упражнение -> ExerciseStats
+        self.totals = {}
+        # Итоги по периодам: период -> начало периода -> упражнение -> ExerciseStats
+        self.buckets = {period: {} for period in PERIODS}
+
+    def rebuild(self, records):
+        """
+        Полный пересчет итогов по всем записям.
+
+        Args:
+            records (iterable): Записи TrainingRecord.
+        """
+        self.totals = {}
+        self.buckets = {period: {} for period in PERIODS}
+        for record in records:
+            self.add(record)
+
+    def add(self, record):
+        """
+        Учет новой записи во всех итогах.
+
+        Args:
+            record (TrainingRecord): Запись о тренировке.
+        """
+        exercise = record.exercise
+        stats = self.totals.get(exercise)
+        if stats is None:
+            stats = self.totals[exercise] = ExerciseStats()
+        stats.add(record)
+        for period, buckets in self.buckets.items():
+            bucket = buckets.setdefault(bucket_start(record.timestamp, period), {})
+            stats = bucket.get(exercise)
+            if stats is None:
+                stats = bucket[exercise] = ExerciseStats()
+            stats.add(record)
+
+    def remove(self, record, source):
+        """
+        Исключение записи из всех итогов.
+
+        Args:
+            record (TrainingRecord): Удаляемая запись (уже удаленная из индексов).
+            source (callable): Функция source(exercise, start, end), возвращающая оставшиеся записи упражнения
+                за период (start и end могут быть None) для пересчета максимумов.
+        """
+        exercise = record.exercise
+        self._remove_from(self.totals, record, lambda: source(exercise, None, None))
+        for period, buckets in self.buckets.items():
+            start = bucket_start(record.timestamp, period)
+            bucket = buckets.get(start)
+            if bucket is None:
+                continue
+            self._remove_from(bucket, record, lambda: source(exercise, start, bucket_end(start, period)))
+            if not bucket:
+                del buckets[start]
+
+    @staticmethod
+    def _remove_from(group, record, remaining):
+        """
+        Исключение записи из итогов группы с пересчетом максимумов при необходимости.
+
+        Args:
+            group (dict): Итоги группы: упражнение -> ExerciseStats.
+            record (TrainingRecord): Удаляемая запись.
+            remaining (callable): Функция, возвращающая оставшиеся записи упражнения в группе.
+        """
+        stats = group.get(record.exercise)
+        if stats is None:
+            return
+        if stats.remove(record):
+            if stats.total_sets <= 0:
+                del group[record.exercise]
+            else:
+                stats.recompute_max(remaining())
+
+    def exercise_stats(self):
+        """
+        Итоги по упражнениям за все время.
+
+        Returns:
+            dict: Упражнение -> копия ExerciseStats.
+        """
+        return {exercise: stats.copy() for exercise, stats in self.totals.items()}
+
+    def period_stats(self, period, start=None, end=None):
+        """
+        Итоги по упражнениям в разбивке по периодам, от последнего периода к первому.
+
+        Args:
+            period (str): Период группировки (PERIOD_DAY, PERIOD_WEEK или PERIOD_MONTH).
+            start (int): Начало диапазона (временная метка, включительно) или None.
+            end (int): Конец диапазона (временная метка, не включительно) или None.
+
+        Returns:
+            list: Кортежи (начало периода, упражнение, копия ExerciseStats).
+        """
+        result = []
+        for bucket in sorted(self.buckets[period], reverse=True):
+            if (start is not None and bucket_end(bucket, period) <= start) or (end is not None and bucket >= end):
+                continue
+            for exercise, stats in self.buckets[period][bucket].items():
+                result.append((bucket, exercise, stats.copy()))
+        return result
+
+    def save(self, path, signature):
+        """
+        Сохранение итогов в файл.
+
+        Args:
+            path (str): Путь к файлу статистики.
+            signature (tuple): Отпечаток журнала, которому соответствуют итоги.
+        """
+        data = {
+            'version': STATS_FORMAT_VERSION,
+            'signature': list(signature) if signature else None,
+            'totals': {exercise: stats.to_json() for exercise, stats in self.totals.items()},
+            'buckets': {period: [[start, {exercise: stats.to_json() for exercise, stats in bucket.items()}]
+                                 for start, bucket in buckets.items()]
+                        for period, buckets in self.buckets.items()},
+        }
+        with atomic_write(path, 'w', encoding='utf-8') as file:
+            json.dump(data, file, ensure_ascii=False, separators=(',', ':'))
+
+    def load(self, path, signature):
+        """
+        Загрузка итогов из файла, если они соответствуют текущему состоянию журнала.
+
+        Args:
+            path (str): Путь к файлу статистики.
+            signature (tuple): Отпечаток журнала.
+
+        Returns:
+            bool: True, если итоги загружены; False, если файла нет или он устарел.
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+            if data.get('version') != STATS_FORMAT_VERSION or data.get('signature') != list(signature or ()):
+                return False
+            totals = {exercise: ExerciseStats(*values) for exercise, values in data['totals'].items()}
+            buckets = {period: {start: {exercise: ExerciseStats(*values) for exercise, values in bucket.items()}
+                                for start, bucket in data['buckets'][period]}
+                       for period in PERIODS}
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+        self.totals = totals
+        self.buckets = buckets
+        return True
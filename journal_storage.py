@@ -0,0 +1,713 @@
+"""
+Модуль хранилища дневника тренировок в формате JSON Lines.
+
+Журнал хранится как последовательность операций (добавление, изменение, удаление),
+каждая из которых записывается отдельной строкой в конец файла. Добавление подхода
+стоит одну дозапись строки вместо полной перезаписи файла, а периодическое уплотнение
+переписывает журнал, оставляя в нем только актуальные записи.
+
+По умолчанию операции записываются компактными строками-массивами с временной меткой
+вместо даты (["a", 1, 1704103200, "Жим лежа", 80, 8]), а первая строка файла содержит
+заголовок с названиями столбцов. Строки прежнего формата (объекты с датой) читаются
+наравне с новыми, а файл старого формата (JSON массив с отступами) распознается при
+чтении и переводится в журнал с сохранением резервной копии.
+
+Чтение и запись выполняются под межпроцессной блокировкой журнала. Хранилище помнит,
+до какого места оно прочитало файл, поэтому операции, дописанные другими процессами,
+читаются с этого места без повторного чтения всего журнала; дозапись в журнал,
+измененный после последнего чтения, отклоняется (оптимистическая проверка версии).
+"""
+
+import os
+
+from journal_files import LOCK_SUFFIX, FileLock, atomic_write, open_archive, sync_directory, sync_file
+from journal_json import JSONDecodeError, dumps, loads
+from journal_model import TrainingRecord
+from journal_profiling import count
+
+# Типы операций в журнале
+OP_ADD = 'add'
+OP_UPDATE = 'update'
+OP_DELETE = 'delete'
+
+# Кодирование строк журнала: компактные массивы или объекты с датой (формат прежних версий)
+ENCODING_ROWS = 'rows'
+ENCODING_OBJECTS = 'objects'
+
+# Коды операций в компактных строках
+ROW_CODES = {OP_ADD: 'a', OP_UPDATE: 'u', OP_DELETE: 'd'}
+ROW_OPERATIONS = {code: op for op, code in ROW_CODES.items()}
+
+# Заголовок журнала с компактными строками
+JOURNAL_FORMAT_VERSION = 2
+JOURNAL_HEADER = {'format': JOURNAL_FORMAT_VERSION, 'columns': ['op', 'id', 'timestamp', 'exercise', 'weight',
+                                                                 'repetitions']}
+
+# Минимальное количество строк журнала, начиная с которого выполняется уплотнение
+COMPACT_MIN_LINES = 1000
+
+# Уплотнение выполняется, когда устаревших строк больше, чем актуальных записей
+COMPACT_RATIO = 1.0
+
+# Количество пропущенных при переносе записей, о которых сообщается подробно
+MAX_REPORTED_SKIPPED = 20
+
+
+class ConcurrentModificationError(RuntimeError):
+    """
+    Журнал изменен другим процессом после последнего чтения: изменения нужно сначала прочитать.
+    """
+
+
+def add_operation(record):
+    """
+    Операция добавления записи.
+
+    Args:
+        record (TrainingRecord): Запись с присвоенным идентификатором.
+
+    Returns:
+        dict: Операция журнала.
+    """
+    return {'op': OP_ADD, 'id': record.id, 'record': record}
+
+
+def update_operation(record, previous=None):
+    """
+    Операция изменения записи (запись с тем же идентификатором заменяется целиком).
+
+    Args:
+        record (TrainingRecord): Новое состояние записи.
+        previous (TrainingRecord): Прежнее состояние записи, если оно известно (в файл не записывается,
+            но позволяет журналу по периодам найти файл, в котором хранится запись).
+
+    Returns:
+        dict: Операция журнала.
+    """
+    operation = {'op': OP_UPDATE, 'id': record.id, 'record': record}
+    if previous is not None:
+        operation['previous'] = previous
+    return operation
+
+
+def delete_operation(entry_id, previous=None):
+    """
+    Операция удаления записи.
+
+    Args:
+        entry_id (int): Идентификатор записи.
+        previous (TrainingRecord): Удаляемая запись, если она известна (в файл не записывается).
+
+    Returns:
+        dict: Операция журнала.
+    """
+    operation = {'op': OP_DELETE, 'id': entry_id}
+    if previous is not None:
+        operation['previous'] = previous
+    return operation
+
+
+def is_legacy_array(head):
+    """
+    Проверка, что файл содержит JSON массив старого формата, а не журнал операций.
+
+    Массив старого формата начинается с "[" и объекта (или пустого массива), а строки
+    компактного журнала — с "[" и кода операции в кавычках.
+
+    Args:
+        head (bytes): Начало файла.
+
+    Returns:
+        bool: True для файла старого формата.
+    """
+    head = head.lstrip()
+    if not head.startswith(b'['):
+        return False
+    rest = head[1:].lstrip()
+    return not rest.startswith(b'"')
+
+
+def read_legacy_array(path):
+    """
+    Чтение записей из файла старого формата (JSON массив объектов с датой, весом и повторениями в виде строк).
+
+    Args:
+        path (str): Путь к файлу.
+
+    Returns:
+        tuple: Записи TrainingRecord без идентификаторов (None, если файл некорректен) и сообщения
+            о пропущенных записях.
+    """
+    try:
+        with open(path, 'rb') as file:
+            data = loads(file.read())
+    except (JSONDecodeError, UnicodeDecodeError):
+        return None, []
+    if not isinstance(data, list):
+        return None, []
+    records = []
+    skipped = []
+    for number, entry in enumerate(data, 1):
+        try:
+            records.append(TrainingRecord.parse(entry['date'], entry['exercise'], entry['weight'],
+                                                entry['repetitions']))
+        except KeyError as error:
+            skipped.append(f"Запись {number}: нет поля {error}: {entry!r}")
+        except (TypeError, ValueError):
+            # Записи с нечисловым весом или повторениями не переносятся (они остаются в резервной копии)
+            skipped.append(f"Запись {number}: некорректные значения: {entry!r}")
+    return records, skipped
+
+
+def _identity(stat):
+    """
+    Устройство и номер файла по результату stat.
+
+    Args:
+        stat (os.stat_result): Сведения о файле.
+
+    Returns:
+        tuple: Номер устройства и номер файла.
+    """
+    return stat.st_dev, stat.st_ino
+
+
+class JournalStorage:
+    """
+    Хранилище записей о тренировках в виде журнала операций (только добавление).
+    """
+
+    # Выборка по индексам хранилища недоступна: фильтры выполняются по индексам репозитория в памяти
+    indexed_query = False
+
+    def __init__(self, path, legacy_path=None, encoding=ENCODING_ROWS, lock=None):
+        """
+        Инициализация хранилища.
+
+        Args:
+            path (str): Путь к файлу журнала в формате JSON Lines.
+            legacy_path (str): Путь к файлу в старом формате JSON, который переносится в журнал при первом открытии.
+            encoding (str): Кодирование новых строк: ENCODING_ROWS (компактное) или ENCODING_OBJECTS
+                (объекты с датой, читаемые прежними версиями приложения).
+            lock (FileLock): Общая блокировка нескольких журналов (по умолчанию — собственный файл .lock).
+        """
+        self.path = path
+        self.legacy_path = legacy_path
+        self.encoding = encoding
+        # Состояние журнала, известное по последнему чтению или записи
+        self._next_id = 1
+        self._lines = 0
+        self._live = 0
+        self._size = None
+        # Устройство и номер файла журнала: меняются, когда файл заменяется целиком
+        self._identity = None
+        self._tail_ok = True
+        # Сообщения о записях файла старого формата, не перенесенных в журнал (остаются в файле .bak)
+        self.migration_skipped = []
+        # Межпроцессная блокировка чтения и записи журнала
+        self._file_lock = lock if lock is not None else FileLock(path + LOCK_SUFFIX)
+
+    def lock(self):
+        """
+        Межпроцессная блокировка журнала (повторно входимая).
+
+        Returns:
+            FileLock: Контекстный менеджер блокировки.
+        """
+        return self._file_lock
+
+    def load(self):
+        """
+        Загрузка записей о тренировках с воспроизведением журнала операций.
+
+        Returns:
+            list: Список записей TrainingRecord в порядке добавления.
+        """
+        with self._file_lock:
+            return self._load()
+
+    def _load(self):
+        """
+        Загрузка записей (выполняется под блокировкой журнала).
+
+        Returns:
+            list: Список записей TrainingRecord в порядке добавления.
+        """
+        self._migrate_legacy()
+        self._convert_legacy_array()
+        records = {}
+        self._lines = 0
+        self._next_id = 1
+        self._tail_ok = True
+
+        try:
+            # Сжатый журнал (архивный файл журнала по периодам) читается с распаковкой
+            with open_archive(self.path, 'rb') as file:
+                for raw_line in file:
+                    self._tail_ok = raw_line.endswith(b'\n')
+                    line = raw_line.strip()
+                    if not line:
+                        continue
+                    try:
+                        operation = loads(line)
+                        if type(operation) is list:
+                            self._apply_row(records, operation)
+                        elif 'columns' in operation:
+                            # Заголовок журнала не является операцией
+                            continue
+                        else:
+                            self._apply(records, operation)
+                    except (JSONDecodeError, IndexError, KeyError, TypeError, ValueError):
+                        # Недописанная (например, после сбоя) или некорректная строка пропускается
+                        continue
+                    self._lines += 1
+                self._size = file.tell()
+                self._identity = _identity(os.fstat(file.fileno()))
+        except FileNotFoundError:
+            self._size = 0
+            self._identity = None
+
+        self._live = len(records)
+        count('bytes.read', self._size)
+        count('records.loaded', len(records))
+        return list(records.values())
+
+    def _apply(self, records, operation):
+        """
+        Применение одной операции журнала к словарю записей.
+
+        Args:
+            records (dict): Словарь записей по идентификатору.
+            operation (dict): Операция из журнала.
+        """
+        entry_id = operation.get('id')
+        if entry_id is None:
+            return
+        if entry_id >= self._next_id:
+            self._next_id = entry_id + 1
+
+        op = operation.get('op', OP_ADD)
+        if op == OP_ADD:
+            records[entry_id] = TrainingRecord.from_json(operation)
+        elif op == OP_UPDATE:
+            # Строка изменения содержит запись целиком
+            if entry_id in records:
+                records[entry_id] = TrainingRecord.from_json(operation)
+        elif op == OP_DELETE:
+            records.pop(entry_id, None)
+
+    def _apply_row(self, records, row):
+        """
+        Применение одной операции журнала в компактном формате к словарю записей.
+
+        Args:
+            records (dict): Словарь записей по идентификатору.
+            row (list): Код операции, идентификатор и (для добавления и изменения) поля записи.
+        """
+        op = ROW_OPERATIONS[row[0]]
+        entry_id = row[1]
+        if type(entry_id) is not int:
+            raise TypeError(f"Некорректный идентификатор: {entry_id!r}")
+        if op == OP_DELETE:
+            records.pop(entry_id, None)
+        elif op == OP_ADD or entry_id in records:
+            records[entry_id] = TrainingRecord.from_row(row[1:])
+        if entry_id >= self._next_id:
+            self._next_id = entry_id + 1
+
+    def _decode(self, value):
+        """
+        Преобразование разобранной строки журнала в операцию.
+
+        Args:
+            value (list | dict): Строка журнала в компактном формате или в виде объекта.
+
+        Returns:
+            dict: Операция журнала или None для заголовка и строк без идентификатора.
+        """
+        if type(value) is list:
+            op = ROW_OPERATIONS[value[0]]
+            entry_id = value[1]
+            if type(entry_id) is not int:
+                raise TypeError(f"Некорректный идентификатор: {entry_id!r}")
+            if op == OP_DELETE:
+                return delete_operation(entry_id)
+            record = TrainingRecord.from_row(value[1:])
+            return add_operation(record) if op == OP_ADD else update_operation(record)
+        if 'columns' in value or value.get('id') is None:
+            return None
+        op = value.get('op', OP_ADD)
+        if op == OP_DELETE:
+            return delete_operation(value['id'])
+        record = TrainingRecord.from_json(value)
+        return update_operation(record) if op == OP_UPDATE else add_operation(record)
+
+    def read_changes(self):
+        """
+        Чтение операций, дописанных в журнал другими процессами после последнего чтения или записи.
+
+        Читается только новая часть файла, поэтому проверка чужих изменений не зависит от размера журнала.
+
+        Returns:
+            list: Новые операции журнала (пустой список, если журнал не изменялся) или None, если журнал
+                был заменен целиком (уплотнен или перезаписан) и его нужно прочитать заново.
+        """
+        with self._file_lock:
+            identity, size = self._file_state()
+            if identity == self._identity and size == self._size:
+                return []
+            # Журнал, созданный после чтения отсутствующего файла, читается с начала
+            replaced = self._identity is not None and identity != self._identity
+            if self._size is None or replaced or size < self._size:
+                return None
+            operations = []
+            with open(self.path, 'rb') as file:
+                file.seek(self._size)
+                for raw_line in file:
+                    self._tail_ok = raw_line.endswith(b'\n')
+                    line = raw_line.strip()
+                    if not line:
+                        continue
+                    try:
+                        operation = self._decode(loads(line))
+                    except (JSONDecodeError, IndexError, KeyError, TypeError, ValueError):
+                        continue
+                    if operation is None:
+                        continue
+                    operations.append(operation)
+                    self._count_operation(operation)
+                count('bytes.read', file.tell() - self._size)
+                self._size = file.tell()
+                self._identity = _identity(os.fstat(file.fileno()))
+            return operations
+
+    def is_current(self):
+        """
+        Проверка, что журнал не изменялся после последнего чтения или записи этим хранилищем.
+
+        Returns:
+            bool: True, если файл журнала совпадает с известным хранилищу.
+        """
+        return self._file_state() == (self._identity, self._size)
+
+    def _file_state(self):
+        """
+        Устройство, номер и размер файла журнала.
+
+        Returns:
+            tuple: Устройство и номер файла (None, если файла нет) и размер файла.
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None, 0
+        return _identity(stat), stat.st_size
+
+    def _count_operation(self, operation):
+        """
+        Учет записанной или прочитанной операции в количестве строк, записей и следующем идентификаторе.
+
+        Args:
+            operation (dict): Операция журнала.
+        """
+        op = operation['op']
+        self._lines += 1
+        if op == OP_ADD:
+            self._live += 1
+            self._next_id = max(self._next_id, operation['id'] + 1)
+        elif op == OP_DELETE:
+            self._live = max(self._live - 1, 0)
+
+    @property
+    def next_id(self):
+        """
+        Идентификатор, который получит следующая добавленная запись.
+
+        Returns:
+            int: Следующий свободный идентификатор.
+        """
+        with self._file_lock:
+            self._sync_state()
+            return self._next_id
+
+    def append(self, record):
+        """
+        Добавление новой записи о тренировке в конец журнала.
+
+        Args:
+            record (TrainingRecord): Запись о тренировке.
+
+        Returns:
+            TrainingRecord: Добавленная запись с присвоенным идентификатором.
+        """
+        with self._file_lock:
+            self._sync_state()
+            record = record.replace(id=self._next_id)
+            self.apply_operations([add_operation(record)])
+        return record
+
+    def update(self, record):
+        """
+        Изменение записи о тренировке (запись с тем же идентификатором заменяется целиком).
+
+        Args:
+            record (TrainingRecord): Новое состояние записи.
+        """
+        with self._file_lock:
+            self._sync_state()
+            self.apply_operations([update_operation(record)])
+
+    def delete(self, entry_id):
+        """
+        Удаление записи о тренировке по ее идентификатору (запись отметки об удалении).
+
+        Args:
+            entry_id (int): Идентификатор записи.
+        """
+        with self._file_lock:
+            self._sync_state()
+            self.apply_operations([delete_operation(entry_id)])
+
+    def apply_operations(self, operations):
+        """
+        Дозапись пачки операций в конец журнала одной операцией записи.
+
+        Операции основаны на состоянии журнала, прочитанном этим хранилищем, поэтому, если другой
+        процесс изменил журнал после последнего чтения, дозапись отклоняется: сначала нужно прочитать
+        чужие изменения (read_changes) и согласовать с ними свои операции.
+
+        Args:
+            operations (list): Список операций журнала (add_operation, update_operation, delete_operation).
+
+        Raises:
+            ConcurrentModificationError: Если журнал изменен другим процессом после последнего чтения.
+        """
+        if not operations:
+            return
+        with self._file_lock:
+            if self._size is None:
+                self._load()
+            elif not self.is_current():
+                raise ConcurrentModificationError("Журнал изменен другим процессом после последнего чтения")
+            self._write_operations(operations)
+            self._maybe_compact()
+
+    def rewrite(self, data):
+        """
+        Полная перезапись журнала заданными записями.
+
+        Записи без идентификатора (или с повторяющимся идентификатором) получают новые идентификаторы.
+        Записи пишутся по мере чтения, не накапливаясь в памяти; если чтение записей прервано
+        исключением, журнал остается прежним.
+
+        Args:
+            data (iterable): Записи TrainingRecord.
+        """
+        next_id = 1
+        written = 0
+        # Запись во временный файл, сброс на диск и атомарная замена, чтобы не потерять журнал при сбое
+        with self._file_lock:
+            with atomic_write(self.path, 'wb') as file:
+                file.write(self._header())
+                for record in data:
+                    if record.id is None or record.id < next_id:
+                        record = record.replace(id=next_id)
+                    next_id = record.id + 1
+                    file.write(self._encode(add_operation(record)))
+                    written += 1
+            self._identity, self._size = self._file_state()
+
+        self._next_id = next_id
+        self._lines = written
+        self._live = written
+        self._tail_ok = True
+        count('bytes.written', self._size)
+
+    def sidecar_path(self, name):
+        """
+        Путь к вспомогательному файлу, хранящемуся рядом с журналом.
+
+        Args:
+            name (str): Назначение файла (например, 'stats').
+
+        Returns:
+            str: Путь к файлу вида <имя журнала>.<name>.json.
+        """
+        return os.path.splitext(self.path)[0] + '.' + name + '.json'
+
+    def signature(self):
+        """
+        Отпечаток файла журнала для обнаружения изменений, сделанных другими программами.
+
+        Returns:
+            tuple: Время изменения файла в наносекундах и его размер или None, если файла нет.
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def compact(self):
+        """
+        Уплотнение журнала: удаление устаревших строк изменений и удалений.
+        """
+        with self._file_lock:
+            # Записи могут идти в файле не по порядку идентификаторов (запись, перенесенная в файл
+            # другого периода журнала по периодам), а rewrite сохраняет только возрастающие идентификаторы
+            self.rewrite(sorted(self._load(), key=lambda record: record.id))
+
+    def query(self, start=None, end=None, exercise=None):
+        """
+        Выборка записей за период без загрузки всего журнала в память.
+
+        Журнал операций хранит записи в порядке изменений, поэтому выборку выполняет репозиторий
+        после полной загрузки журнала.
+
+        Args:
+            start (int): Начало периода или None.
+            end (int): Конец периода или None.
+            exercise (str): Название упражнения или None.
+
+        Returns:
+            None: Выборка недоступна.
+        """
+        return None
+
+    def aggregate_stats(self):
+        """
+        Итоги по упражнениям, вычисленные хранилищем.
+
+        Журнал операций не умеет вычислять итоги сам, они рассчитываются репозиторием в памяти.
+
+        Returns:
+            None: Итоги недоступны.
+        """
+        return None
+
+    def close(self):
+        """
+        Закрытие хранилища (журнал открывается только на время чтения и записи, закрывать нечего).
+        """
+
+    def _maybe_compact(self):
+        """
+        Уплотнение журнала, если доля устаревших строк стала слишком большой.
+        """
+        if self._lines >= COMPACT_MIN_LINES and self._lines - self._live > self._live * COMPACT_RATIO:
+            self.compact()
+
+    def _sync_state(self):
+        """
+        Учет изменений журнала, сделанных без ведома хранилища (выполняется под блокировкой журнала).
+        """
+        if self.read_changes() is None:
+            self._load()
+
+    def _write_operations(self, operations):
+        """
+        Дозапись операций в конец журнала.
+
+        Args:
+            operations (list): Список операций для записи.
+        """
+        data = b''.join(self._encode(operation) for operation in operations)
+        if not self._tail_ok:
+            # Предыдущая запись оборвалась на середине строки
+            data = b'\n' + data
+        created = not os.path.exists(self.path)
+        if not self._size:
+            # Новый журнал начинается с заголовка
+            data = self._header() + data
+        with open(self.path, 'ab') as file:
+            file.write(data)
+            # Дописанные операции сбрасываются на диск до того, как запись считается сохраненной
+            sync_file(file)
+            self._size = file.tell()
+            self._identity = _identity(os.fstat(file.fileno()))
+        if created:
+            sync_directory(os.path.dirname(self.path))
+        count('bytes.written', len(data))
+        for operation in operations:
+            self._count_operation(operation)
+        self._tail_ok = True
+
+    def _encode(self, operation):
+        """
+        Сериализация операции в строку журнала.
+
+        Args:
+            operation (dict): Операция журнала.
+
+        Returns:
+            bytes: Строка в формате JSON в кодировке UTF-8 с переводом строки в конце.
+        """
+        op = operation['op']
+        if self.encoding == ENCODING_ROWS:
+            if op == OP_DELETE:
+                value = [ROW_CODES[op], operation['id']]
+            else:
+                value = [ROW_CODES[op], *operation['record'].to_row()]
+        elif op == OP_DELETE:
+            value = {'op': op, 'id': operation['id']}
+        else:
+            value = {'op': op, **operation['record'].to_json()}
+        return dumps(value) + b'\n'
+
+    def _header(self):
+        """
+        Заголовок журнала (только для компактного кодирования).
+
+        Returns:
+            bytes: Строка заголовка или пустая строка.
+        """
+        return dumps(JOURNAL_HEADER) + b'\n' if self.encoding == ENCODING_ROWS else b''
+
+    def _migrate_legacy(self):
+        """
+        Перенос данных из файла старого формата JSON в журнал при первом открытии.
+        """
+        if not self.legacy_path or os.path.exists(self.path) or not os.path.exists(self.legacy_path):
+            return
+        records, skipped = read_legacy_array(self.legacy_path)
+        if records is None:
+            # Некорректный старый файл не переносится, как и раньше он читался как пустой
+            return
+        self.rewrite(records)
+        # Старый файл сохраняется как резервная копия
+        os.replace(self.legacy_path, self.legacy_path + '.bak')
+        self._report_skipped(self.legacy_path + '.bak', skipped)
+
+    def _convert_legacy_array(self):
+        """
+        Перевод в журнал файла старого формата (JSON массив с отступами), открытого как журнал.
+
+        Прежнее содержимое файла сохраняется рядом с расширением .bak.
+        """
+        try:
+            with open(self.path, 'rb') as file:
+                head = file.read(64)
+        except FileNotFoundError:
+            return
+        if not is_legacy_array(head):
+            return
+        records, skipped = read_legacy_array(self.path)
+        if records is None:
+            return
+        backup_path = self.path + '.bak'
+        with open(self.path, 'rb') as source, atomic_write(backup_path, 'wb') as backup:
+            backup.write(source.read())
+        self.rewrite(records)
+        self._report_skipped(backup_path, skipped)
+
+    def _report_skipped(self, backup_path, skipped):
+        """
+        Сохранение сообщений о записях, не перенесенных из файла старого формата.
+
+        Args:
+            backup_path (str): Резервная копия, в которой остались пропущенные записи.
+            skipped (list): Сообщения о пропущенных записях.
+        """
+        if skipped:
+            self.migration_skipped = [f"Не перенесено записей: {len(skipped)} (они сохранены в {backup_path})",
+                                      *skipped[:MAX_REPORTED_SKIPPED]]
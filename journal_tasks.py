@@ -0,0 +1,185 @@
+"""
+Модуль фонового выполнения операций приложения.
+
+Чтение и запись файлов, выборки, статистика и построение графиков выполняются в пуле
+потоков, а результаты передаются обратно в главный поток Tkinter через root.after,
+поэтому интерфейс не замирает на больших журналах. Повторный запрос того же вида
+(например, повторное нажатие кнопки фильтра) отменяет предыдущий, еще не завершенный.
+Каждая операция и обработка ее результата учитываются в замерах производительности
+и при включенном профилировании выполняются под cProfile.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from journal_profiling import instrumentation
+
+# Количество потоков пула
+MAX_WORKERS = 2
+
+# Интервал проверки завершения фоновых операций, мс
+POLL_INTERVAL_MS = 100
+
+
+class BackgroundTask:
+    """
+    Операция, выполняемая в пуле потоков.
+    """
+
+    def __init__(self, name, key, future, on_done, progress_window, cancel_event):
+        """
+        Инициализация операции.
+
+        Args:
+            name (str): Название операции для замеров производительности.
+            key (object): Ключ вида операции или None.
+            future (concurrent.futures.Future): Результат выполнения в пуле.
+            on_done (callable): Функция on_done(result, error), вызываемая в главном потоке по завершении.
+            progress_window (ProgressWindow): Окно прогресса или None.
+            cancel_event (threading.Event): Событие отмены, которое может проверять операция.
+        """
+        self.name = name
+        self.key = key
+        self.future = future
+        self.on_done = on_done
+        self.progress_window = progress_window
+        self.cancel_event = cancel_event
+        # Признак отмены: результат отмененной операции не передается в главный поток
+        self.cancelled = False
+
+    def cancel(self):
+        """
+        Отмена операции: еще не начатая операция не запускается, начатая получает событие отмены.
+        """
+        self.cancelled = True
+        self.cancel_event.set()
+        self.future.cancel()
+
+
+class TaskScheduler:
+    """
+    Планировщик фоновых операций с передачей результатов в главный поток Tkinter.
+    """
+
+    def __init__(self, root, on_busy_changed=None, max_workers=MAX_WORKERS, poll_interval=POLL_INTERVAL_MS):
+        """
+        Инициализация планировщика.
+
+        Args:
+            root (tk.Tk): Основное окно приложения.
+            on_busy_changed (callable): Функция on_busy_changed(count), вызываемая в главном потоке
+                при изменении количества выполняемых операций.
+            max_workers (int): Количество потоков пула.
+            poll_interval (int): Интервал проверки завершения операций, мс.
+        """
+        self.root = root
+        self.on_busy_changed = on_busy_changed
+        self.poll_interval = poll_interval
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='journal-task')
+        self._tasks = []
+        self._polling = False
+
+    @property
+    def busy(self):
+        """
+        Количество выполняемых операций.
+
+        Returns:
+            int: Количество неотмененных операций, результаты которых еще не переданы.
+        """
+        return sum(1 for task in self._tasks if not task.cancelled)
+
+    def submit(self, work, on_done, key=None, progress_window=None, name='task'):
+        """
+        Запуск операции в пуле потоков (вызывается в главном потоке).
+
+        Args:
+            work (callable): Функция work(cancel_event), выполняемая в фоновом потоке.
+            on_done (callable): Функция on_done(result, error), вызываемая в главном потоке по завершении.
+            key (object): Ключ вида операции: незавершенная операция с тем же ключом отменяется.
+            progress_window (ProgressWindow): Окно прогресса, которое обновляется и закрывается по завершении;
+                его событие отмены передается операции.
+            name (str): Название операции для замеров производительности и файлов профилей.
+
+        Returns:
+            BackgroundTask: Запущенная операция.
+        """
+        if key is not None:
+            self.cancel(key)
+        cancel_event = progress_window.cancel_event if progress_window is not None else threading.Event()
+        future = self._executor.submit(self._run, name, work, cancel_event)
+        task = BackgroundTask(name, key, future, on_done, progress_window, cancel_event)
+        self._tasks.append(task)
+        self._notify_busy()
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_interval, self._poll)
+        return task
+
+    def cancel(self, key):
+        """
+        Отмена незавершенных операций с указанным ключом.
+
+        Args:
+            key (object): Ключ вида операции.
+        """
+        for task in self._tasks:
+            if task.key == key and not task.cancelled:
+                task.cancel()
+        self._notify_busy()
+
+    def _poll(self):
+        """
+        Проверка завершения операций и передача результатов в главный поток.
+        """
+        for task in list(self._tasks):
+            if task.progress_window is not None and not task.cancelled:
+                task.progress_window.refresh()
+            if not task.future.done():
+                continue
+            self._tasks.remove(task)
+            if task.progress_window is not None:
+                task.progress_window.close()
+            if task.cancelled:
+                continue
+            error = task.future.exception()
+            with instrumentation.span('ui.' + task.name):
+                instrumentation.profile(task.name + '.done', task.on_done,
+                                        None if error is not None else task.future.result(), error)
+        self._notify_busy()
+        if self._tasks:
+            self.root.after(self.poll_interval, self._poll)
+        else:
+            self._polling = False
+
+    @staticmethod
+    def _run(name, work, cancel_event):
+        """
+        Выполнение операции в фоновом потоке с замером времени (и под cProfile, если оно включено).
+
+        Args:
+            name (str): Название операции.
+            work (callable): Функция work(cancel_event).
+            cancel_event (threading.Event): Событие отмены.
+
+        Returns:
+            object: Результат операции.
+        """
+        with instrumentation.span('task.' + name):
+            return instrumentation.profile(name, work, cancel_event)
+
+    def _notify_busy(self):
+        """
+        Сообщение о количестве выполняемых операций.
+        """
+        if self.on_busy_changed is not None:
+            self.on_busy_changed(self.busy)
+
+    def shutdown(self):
+        """
+        Отмена всех операций и ожидание завершения уже начатых (при закрытии приложения).
+        """
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        self._executor.shutdown(wait=True, cancel_futures=True)